@@ -0,0 +1,88 @@
+"""
+Benchmark inference throughput with and without dynamic micro-batching
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_batching --requests 256 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import torch
+
+from models.example_models import SimpleCNN
+from src.inference_batcher import InferenceBatcher
+
+def make_forward(model: torch.nn.Module):
+    """Build a forward callable matching InferenceBatcher's run_batch signature."""
+    def forward(model_id: str, input_data: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return model(input_data)
+    return forward
+
+async def run_unbatched(forward, inputs, concurrency: int) -> float:
+    """Serve every request with its own forward pass."""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def serve(x):
+        async with semaphore:
+            return await loop.run_in_executor(None, forward, "cnn", x)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[serve(x) for x in inputs])
+    return time.perf_counter() - start
+
+async def run_batched(forward, inputs, concurrency: int, max_batch_size: int, max_wait_ms: float):
+    """Serve requests through the InferenceBatcher."""
+    batcher = InferenceBatcher(forward, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def serve(x):
+        async with semaphore:
+            return await batcher.submit("cnn", x)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[serve(x) for x in inputs])
+    elapsed = time.perf_counter() - start
+    metrics = batcher.get_metrics("cnn")["cnn"]
+    await batcher.close()
+    return elapsed, metrics
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+    torch.set_num_threads(args.threads)
+
+    model = SimpleCNN()
+    model.eval()
+    forward = make_forward(model)
+    inputs = [torch.randn(1, 3, 224, 224) for _ in range(args.requests)]
+
+    # Warm up allocator and kernels
+    forward("cnn", inputs[0])
+
+    unbatched_s = asyncio.run(run_unbatched(forward, inputs, args.concurrency))
+    batched_s, metrics = asyncio.run(run_batched(
+        forward, inputs, args.concurrency, args.max_batch_size, args.max_wait_ms
+    ))
+
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "unbatched_rps": args.requests / unbatched_s,
+        "batched_rps": args.requests / batched_s,
+        "speedup": unbatched_s / batched_s,
+        "batching": metrics
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
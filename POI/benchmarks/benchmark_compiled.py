@@ -0,0 +1,78 @@
+"""
+Benchmark eager versus compiled CPU inference latency
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_compiled --iterations 50 --batch-sizes 1 8
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+import torch
+
+from models.example_models import SimpleCNN
+from src.model_compiler import CompiledModelCache
+
+def measure(forward, input_data: torch.Tensor, iterations: int) -> dict:
+    """Time repeated forward passes after a short warm-up."""
+    with torch.no_grad():
+        for _ in range(3):
+            forward(input_data)
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            forward(input_data)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p95_ms": timings[int(len(timings) * 0.95) - 1]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--backend", default="torchscript")
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+    model = SimpleCNN()
+    model.eval()
+
+    results = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CompiledModelCache(cache_dir=cache_dir, backend=args.backend, background=False)
+        for batch_size in args.batch_sizes:
+            input_data = torch.randn(batch_size, 3, 224, 224)
+
+            start = time.perf_counter()
+            compiled = cache.get("cnn", model, input_data)
+            compile_s = time.perf_counter() - start
+
+            # A fresh cache over the same directory models a node restart
+            restarted = CompiledModelCache(cache_dir=cache_dir, backend=args.backend, background=False)
+            start = time.perf_counter()
+            restarted.get("cnn", model, input_data)
+            reload_s = time.perf_counter() - start
+
+            eager = measure(model, input_data, args.iterations)
+            optimized = measure(compiled, input_data, args.iterations)
+            results.append({
+                "batch_size": batch_size,
+                "compile_s": compile_s,
+                "restart_load_s": reload_s,
+                "eager": eager,
+                "compiled": optimized,
+                "speedup": eager["mean_ms"] / optimized["mean_ms"]
+            })
+
+        print(json.dumps({"backend": args.backend, "results": results, "cache": cache.get_metrics()}, indent=2))
+
+if __name__ == "__main__":
+    main()
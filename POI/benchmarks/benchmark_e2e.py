@@ -0,0 +1,263 @@
+"""
+End-to-end inference benchmark against an in-process chain
+
+Deploys benchmarks/contracts/InferenceLedger.sol to eth-tester (py-evm),
+serves the example models from a temporary models directory and drives
+InferenceNode the way EdgeNode does: fetch the input from IPFS, run
+inference, store the output back and submit the proof on chain. Results
+are written as JSON for comparison between releases.
+
+Each model and concurrency level runs in a fresh subprocess, so its
+peak_rss_mb (ru_maxrss, a process-lifetime peak) belongs to that level
+alone; setup_peak_rss_mb is the same peak taken before the measured run.
+
+Requires eth-tester[py-evm] and py-solc-x. Run from the POI directory:
+    python -m benchmarks.benchmark_e2e --requests 64 --concurrency 1 4 16 --output results.json
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import torch
+from eth_account import Account
+from web3 import Web3, EthereumTesterProvider
+
+from models.example_models import SimpleCNN
+from src.inference_node import InferenceNode
+from src.utils.weight_format import WEIGHTS_FILENAME, save_weights
+
+CONTRACT_PATH = Path(__file__).parent / "contracts" / "InferenceLedger.sol"
+SOLC_VERSION = "0.8.17"
+
+# Example models with their constructor kwargs and per-request input shape
+MODELS = {
+    "simple-cnn-10": ({"num_classes": 10}, (1, 3, 224, 224)),
+    "simple-cnn-1000": ({"num_classes": 1000}, (1, 3, 224, 224))
+}
+
+class InMemoryIPFS:
+    """Content-addressed byte store standing in for an IPFS node."""
+
+    def __init__(self):
+        self.blocks: Dict[str, bytes] = {}
+
+    async def add_bytes(self, data: bytes) -> str:
+        cid = "Qm" + hashlib.sha256(data).hexdigest()
+        self.blocks[cid] = data
+        return cid
+
+    async def cat(self, cid: str) -> bytes:
+        return self.blocks[cid]
+
+def compile_ledger() -> Dict[str, Any]:
+    """Compile the ledger stand-in, installing solc if needed."""
+    import solcx
+    if SOLC_VERSION not in {str(v) for v in solcx.get_installed_solc_versions()}:
+        solcx.install_solc(SOLC_VERSION)
+    compiled = solcx.compile_files(
+        [str(CONTRACT_PATH)],
+        output_values=["abi", "bin"],
+        solc_version=SOLC_VERSION
+    )
+    return next(iter(compiled.values()))
+
+def deploy_chain(ledger: Dict[str, Any]):
+    """Start eth-tester, fund a node account and deploy the ledger."""
+    web3 = Web3(EthereumTesterProvider())
+    funder = web3.eth.accounts[0]
+    account = Account.create()
+    web3.eth.wait_for_transaction_receipt(web3.eth.send_transaction({
+        "from": funder,
+        "to": account.address,
+        "value": Web3.to_wei(100, "ether")
+    }))
+
+    factory = web3.eth.contract(abi=ledger["abi"], bytecode=ledger["bin"])
+    receipt = web3.eth.wait_for_transaction_receipt(factory.constructor().transact({"from": funder}))
+    return web3, account, receipt.contractAddress
+
+def write_models(models_dir: Path):
+    """Save every example model in the memory-mapped weight format."""
+    torch.manual_seed(42)
+    for model_id, (kwargs, _) in MODELS.items():
+        model = SimpleCNN(**kwargs)
+        (models_dir / model_id).mkdir(parents=True)
+        save_weights(model, models_dir / model_id / WEIGHTS_FILENAME, {
+            "module": "models.example_models",
+            "class": "SimpleCNN",
+            "kwargs": kwargs
+        })
+
+def make_node(ledger_abi, web3, account, address, models_dir: Path, args) -> InferenceNode:
+    class BenchmarkInferenceNode(InferenceNode):
+        def _load_contract(self, contract_address):
+            self.contract = self.web3.eth.contract(address=contract_address, abi=ledger_abi)
+
+    return BenchmarkInferenceNode(
+        address,
+        account,
+        web3,
+        models_dir=str(models_dir),
+        enable_batching=args.batching,
+        proof_batch_interval=args.proof_batch_interval
+    )
+
+def tensor_bytes(tensor: torch.Tensor) -> bytes:
+    buffer = io.BytesIO()
+    torch.save(tensor, buffer)
+    return buffer.getvalue()
+
+async def serve_task(node: InferenceNode, ipfs: InMemoryIPFS, model_id: str, input_cid: str) -> float:
+    """One EdgeNode-style task: fetch input, infer, store output and proof."""
+    start = time.perf_counter()
+    input_data = torch.load(io.BytesIO(await ipfs.cat(input_cid)))
+    result = await node.execute_inference_async(model_id, input_data)
+    await ipfs.add_bytes(result["output"].tobytes() + bytes.fromhex(result["proof"]))
+    return (time.perf_counter() - start) * 1000
+
+async def run_level(node, ipfs, model_id: str, input_cids: List[str], concurrency: int) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(cid):
+        async with semaphore:
+            return await serve_task(node, ipfs, model_id, cid)
+
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*[limited(cid) for cid in input_cids]))
+    elapsed = time.perf_counter() - start
+
+    def percentile(q):
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)]
+
+    return {
+        "model_id": model_id,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "latency_ms": {
+            "mean": statistics.mean(latencies),
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99)
+        },
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "cpu_count": os.cpu_count(),
+        "cuda": torch.cuda.is_available()
+    }
+
+async def run_single(args) -> Dict[str, Any]:
+    """Measure one model at one concurrency level in this process."""
+    model_id, concurrency = args.level[0], int(args.level[1])
+    shape = MODELS[model_id][1]
+    ledger = compile_ledger()
+    web3, account, address = deploy_chain(ledger)
+    ipfs = InMemoryIPFS()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = Path(tmp)
+        write_models(models_dir)
+        node = make_node(ledger["abi"], web3, account, address, models_dir, args)
+        if node.proof_pipeline:
+            node.proof_pipeline.start()
+
+        input_cids = [
+            await ipfs.add_bytes(tensor_bytes(torch.randn(*shape)))
+            for _ in range(args.requests)
+        ]
+        # Warm up model loading and kernels outside the measured run
+        await serve_task(node, ipfs, model_id, input_cids[0])
+        setup_peak = peak_rss_mb()
+
+        result = await run_level(node, ipfs, model_id, input_cids, concurrency)
+
+        if node.proof_pipeline:
+            await node.proof_pipeline.stop()
+
+    result["setup_peak_rss_mb"] = setup_peak
+    result["stages"] = node.get_latency_metrics(model_id)
+    result["transactions"] = node.tx_sender.get_metrics()
+    return result
+
+def run_level_subprocess(args, model_id: str, concurrency: int) -> Dict[str, Any]:
+    """Run one level in a fresh interpreter so its memory peak is its own."""
+    command = [
+        sys.executable, "-m", "benchmarks.benchmark_e2e",
+        "--level", model_id, str(concurrency),
+        "--requests", str(args.requests)
+    ]
+    if args.batching:
+        command.append("--batching")
+    if args.proof_batch_interval is not None:
+        command += ["--proof-batch-interval", str(args.proof_batch_interval)]
+    output = subprocess.check_output(command, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(args) -> Dict[str, Any]:
+    results = [
+        run_level_subprocess(args, model_id, concurrency)
+        for model_id in MODELS
+        for concurrency in args.concurrency
+    ]
+
+    return {
+        "benchmark": "e2e",
+        "timestamp": int(time.time()),
+        "environment": environment(),
+        "config": {
+            "requests": args.requests,
+            "batching": args.batching,
+            "proof_batch_interval": args.proof_batch_interval
+        },
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--batching", action="store_true")
+    parser.add_argument("--proof-batch-interval", type=float, default=None)
+    parser.add_argument("--output", default="benchmark_e2e.json")
+    parser.add_argument("--level", nargs=2, metavar=("MODEL_ID", "CONCURRENCY"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.level:
+        # Child mode: print this level's result as the last line of output
+        print(json.dumps(asyncio.run(run_single(args))))
+        return
+
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark LocationManager's spatial index with many registered nodes
+
+Registers nodes clustered around population centres plus a sparse uniform
+background, then compares indexed nearest-node queries against an exact
+full scan and measures load updates and join/leave churn.
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_location --nodes 100000 --queries 2000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.location_manager import LocationManager, haversine_km
+
+def generate_nodes(count: int, rng: np.random.Generator):
+    """Mostly clustered nodes with a uniform remainder, in degrees."""
+    clustered = int(count * 0.9)
+    centres = np.column_stack([rng.uniform(-60, 70, 200), rng.uniform(-180, 180, 200)])
+    picks = centres[rng.integers(0, len(centres), clustered)]
+    lats = np.concatenate([picks[:, 0] + rng.normal(0, 1.5, clustered), rng.uniform(-90, 90, count - clustered)])
+    lons = np.concatenate([picks[:, 1] + rng.normal(0, 1.5, clustered), rng.uniform(-180, 180, count - clustered)])
+    lons = (lons + 180) % 360 - 180
+    return np.clip(lats, -90, 90), lons
+
+def brute_force(manager: LocationManager, lat: float, lon: float, k: int):
+    """Exact answer by scoring every registered node."""
+    slots = np.fromiter(manager.slots.values(), dtype=np.int64)
+    distance = haversine_km(lat, lon, manager.latitudes[slots], manager.longitudes[slots])
+    scores = distance * (1 + manager.loads[slots] / manager.capacities[slots])
+    order = np.argsort(scores, kind="stable")[:k]
+    return [manager.slot_ids[s] for s in slots[order]], scores[order]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--cell-km", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    lats, lons = generate_nodes(args.nodes, rng)
+    manager = LocationManager(shard_size_km=args.cell_km)
+
+    start = time.perf_counter()
+    for i in range(args.nodes):
+        manager.add_node(f"node-{i}", float(lats[i]), float(lons[i]), gpu_capacity=int(rng.integers(1, 9)))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in rng.integers(0, args.nodes, args.nodes):
+        manager.update_node_load(f"node-{i}", int(rng.integers(0, 8)))
+    update_s = time.perf_counter() - start
+
+    query_lats, query_lons = generate_nodes(args.queries, rng)
+
+    start = time.perf_counter()
+    indexed = [manager.find_nearest_nodes(float(a), float(b), args.k) for a, b in zip(query_lats, query_lons)]
+    indexed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact = [brute_force(manager, float(a), float(b), args.k) for a, b in zip(query_lats, query_lons)]
+    scan_s = time.perf_counter() - start
+
+    # Ties may be ordered differently, so compare the scores achieved
+    mismatches = 0
+    for (lat, lon), got, (_, want_scores) in zip(zip(query_lats, query_lons), indexed, exact):
+        slots = np.array([manager.slots[n] for n in got])
+        got_scores = haversine_km(lat, lon, manager.latitudes[slots], manager.longitudes[slots]) \
+            * (1 + manager.loads[slots] / manager.capacities[slots])
+        mismatches += not np.allclose(np.sort(got_scores), want_scores)
+
+    churn = min(10000, args.nodes)
+    start = time.perf_counter()
+    for i in range(churn):
+        manager.remove_node(f"node-{i}")
+        manager.add_node(f"node-{i}", float(lats[i]), float(lons[i]))
+    churn_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "nodes": args.nodes,
+        "queries": args.queries,
+        "build_us_per_node": build_s / args.nodes * 1e6,
+        "load_update_us": update_s / args.nodes * 1e6,
+        "indexed_query_us": indexed_s / args.queries * 1e6,
+        "full_scan_query_us": scan_s / args.queries * 1e6,
+        "speedup": scan_s / indexed_s,
+        "mismatches": mismatches,
+        "churn_us_per_leave_join": churn_s / churn * 1e6
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
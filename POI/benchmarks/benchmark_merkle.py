@@ -0,0 +1,107 @@
+"""
+Benchmark model weight Merkle roots: full, parallel and incremental
+
+Builds a model with thousands of parameter tensors and compares the
+previous recursive, copy-per-tensor root computation with ModelMerkleTree
+hashing serially and on the thread pool, an unchanged recheck, and an
+incremental update after a fine-tune step touches a few layers. The model
+is then saved, and hashing a pickled checkpoint after torch.load is compared
+with streaming the root from the weight file, where memory is bounded by
+the block size. Every root is checked against the previous implementation.
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_merkle --layers 2000 --width 256 --updated 20
+"""
+import argparse
+import hashlib
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import torch
+
+from src.utils.merkle_utils import FILE_BLOCK_SIZE, ModelMerkleTree, compute_file_merkle_root
+from src.utils.weight_format import save_weights
+
+def legacy_root(model: torch.nn.Module) -> str:
+    """Root computed the way merkle_utils did before leaf caching."""
+    def merkle(hashes):
+        if len(hashes) == 0:
+            return hashlib.sha256(b"").hexdigest()
+        if len(hashes) == 1:
+            return hashes[0]
+        if len(hashes) % 2 == 1:
+            hashes.append(hashes[-1])
+        return merkle([
+            hashlib.sha256((hashes[i] + hashes[i + 1]).encode()).hexdigest()
+            for i in range(0, len(hashes), 2)
+        ])
+
+    return merkle([
+        hashlib.sha256(param.data.cpu().numpy().tobytes()).hexdigest()
+        for _, param in model.named_parameters() if param.requires_grad
+    ])
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--layers", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=256)
+    parser.add_argument("--updated", type=int, default=20, help="Layers changed by the simulated update")
+    parser.add_argument("--block-size", type=int, default=FILE_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    layers = torch.nn.ModuleList([torch.nn.Linear(args.width, args.width) for _ in range(args.layers)])
+    model_bytes = sum(p.numel() * p.element_size() for _, p in layers.named_parameters())
+
+    expected, legacy = timed(lambda: legacy_root(layers))
+    serial_root, serial = timed(lambda: ModelMerkleTree(layers, parallel=False).root())
+    tree = ModelMerkleTree(layers, parallel=True)
+    parallel_root, parallel = timed(tree.root)
+    unchanged_root, unchanged = timed(tree.root)
+
+    with torch.no_grad():
+        for i in range(0, args.layers, max(1, args.layers // args.updated))[:args.updated]:
+            layers[i].weight.add_(0.01)
+    updated_root, incremental = timed(tree.root)
+    expected_updated, _ = timed(lambda: legacy_root(layers))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = Path(tmp) / "model.pt"
+        weights = Path(tmp) / "model.joyw"
+        torch.save(layers, checkpoint)
+        save_weights(layers, weights)
+
+        checkpoint_root, from_checkpoint = timed(
+            lambda: legacy_root(torch.load(checkpoint, map_location="cpu", weights_only=False))
+        )
+        tracemalloc.start()
+        file_root, from_file = timed(lambda: compute_file_merkle_root(weights, block_size=args.block_size))
+        _, file_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(json.dumps({
+        "tensors": tree.get_metrics()["leaves"],
+        "model_mb": model_bytes / 1e6,
+        "legacy_s": legacy,
+        "serial_s": serial,
+        "parallel_s": parallel,
+        "unchanged_s": unchanged,
+        "incremental_s": incremental,
+        "updated_layers": args.updated,
+        "checkpoint_load_and_hash_s": from_checkpoint,
+        "file_stream_s": from_file,
+        "file_stream_peak_mb": file_peak / 1e6,
+        "roots_match": serial_root == parallel_root == unchanged_root == expected
+        and updated_root == expected_updated == checkpoint_root == file_root,
+        "metrics": tree.get_metrics()
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
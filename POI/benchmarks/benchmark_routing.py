@@ -0,0 +1,85 @@
+"""
+Benchmark bulk request routing against per-request node lookups
+
+Routes the same request batch twice on identical node sets: once with
+find_nearest_nodes plus a load update per request, the way a gateway does
+today, and once with route_batch. Reports throughput and assignment
+quality (distance travelled and how unevenly load lands on nodes).
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_routing --nodes 100000 --requests 20000
+"""
+import argparse
+import json
+import time
+from collections import Counter
+
+import numpy as np
+
+from benchmarks.benchmark_location import generate_nodes
+from src.location_manager import LocationManager, haversine_km
+
+def build(lats, lons, capacities, cell_km: float) -> LocationManager:
+    manager = LocationManager(shard_size_km=cell_km)
+    for i, (lat, lon, capacity) in enumerate(zip(lats, lons, capacities)):
+        manager.add_node(f"node-{i}", float(lat), float(lon), gpu_capacity=int(capacity))
+    return manager
+
+def route_individually(manager: LocationManager, lats, lons):
+    assigned = []
+    for lat, lon in zip(lats, lons):
+        node_id = manager.find_nearest_nodes(float(lat), float(lon), k=1)[0]
+        manager.update_node_load(node_id, manager.nodes[node_id].current_load + 1)
+        assigned.append(node_id)
+    return assigned
+
+def quality(manager: LocationManager, lats, lons, assigned, capacities) -> dict:
+    slots = np.array([manager.slots[n] for n in assigned])
+    distance = haversine_km(lats, lons, manager.latitudes[slots], manager.longitudes[slots])
+    per_node = Counter(assigned)
+    utilization = [count / capacities[int(node_id.split("-")[1])] for node_id, count in per_node.items()]
+    return {
+        "mean_distance_km": float(distance.mean()),
+        "p95_distance_km": float(np.percentile(distance, 95)),
+        "nodes_used": len(per_node),
+        "max_requests_per_node": max(per_node.values()),
+        "max_utilization": max(utilization)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--cell-km", type=float, default=100.0)
+    parser.add_argument("--pool-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    node_lats, node_lons = generate_nodes(args.nodes, rng)
+    capacities = rng.integers(1, 9, args.nodes)
+    request_lats, request_lons = generate_nodes(args.requests, rng)
+
+    results = {}
+    manager = build(node_lats, node_lons, capacities, args.cell_km)
+    start = time.perf_counter()
+    assigned = route_individually(manager, request_lats, request_lons)
+    elapsed = time.perf_counter() - start
+    results["per_request"] = {
+        "requests_per_s": args.requests / elapsed,
+        **quality(manager, request_lats, request_lons, assigned, capacities)
+    }
+
+    manager = build(node_lats, node_lons, capacities, args.cell_km)
+    start = time.perf_counter()
+    assigned = manager.route_batch(request_lats, request_lons, pool_size=args.pool_size)
+    elapsed = time.perf_counter() - start
+    results["batch"] = {
+        "requests_per_s": args.requests / elapsed,
+        **quality(manager, request_lats, request_lons, assigned, capacities)
+    }
+
+    print(json.dumps({"nodes": args.nodes, "requests": args.requests, **results}, indent=2))
+
+if __name__ == "__main__":
+    main()
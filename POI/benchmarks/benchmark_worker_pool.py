@@ -0,0 +1,83 @@
+"""
+Benchmark CPU inference throughput of one process versus the worker pool
+
+Run from the POI directory:
+    python -m benchmarks.benchmark_worker_pool --requests 256 --workers 1 2 4 --threads-per-worker 1
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from models.example_models import SimpleCNN
+from src.worker_pool import InferenceWorkerPool
+
+def run_single_process(model: torch.nn.Module, inputs, concurrency: int) -> float:
+    """Serve requests from threads sharing one in-process model."""
+    def forward(x):
+        with torch.no_grad():
+            return model(x)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(forward, inputs))
+    return time.perf_counter() - start
+
+def run_worker_pool(model: torch.nn.Module, inputs, concurrency: int, workers: int, threads: int) -> float:
+    """Serve requests through an InferenceWorkerPool with pinned workers."""
+    pool = InferenceWorkerPool(workers_per_model=workers, threads_per_worker=threads)
+    pool.start_model("cnn", model)
+    try:
+        # Warm up every worker
+        for _ in range(workers):
+            pool.run("cnn", inputs[0])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda x: pool.run("cnn", x), inputs))
+        return time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    args = parser.parse_args()
+
+    torch.manual_seed(42)
+
+    model = SimpleCNN()
+    model.eval()
+    inputs = [torch.randn(1, 3, 224, 224) for _ in range(args.requests)]
+
+    # Baseline uses every core from a single interpreter
+    torch.set_num_threads(os.cpu_count() or 1)
+    run_single_process(model, inputs[:2], 1)
+    single_s = run_single_process(model, inputs, args.concurrency)
+
+    results = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "cores": os.cpu_count(),
+        "single_process_rps": args.requests / single_s,
+        "worker_pool": []
+    }
+    for workers in args.workers:
+        pool_s = run_worker_pool(model, inputs, args.concurrency, workers, args.threads_per_worker)
+        results["worker_pool"].append({
+            "workers": workers,
+            "threads_per_worker": args.threads_per_worker,
+            "rps": args.requests / pool_s,
+            "speedup": single_s / pool_s
+        })
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/**
+ * @title InferenceLedger
+ * @dev Minimal stand-in for the proof entry points InferenceNode calls,
+ * deployed to an in-process chain by benchmarks/benchmark_e2e.py
+ */
+contract InferenceLedger {
+    uint256 public executionCount;
+    mapping(bytes32 => bytes32) public proofHashes;
+    mapping(bytes32 => uint256) public batchSizes;
+
+    event ProofSubmitted(bytes32 indexed executionId, string modelId, address indexed node);
+    event ProofBatchSubmitted(bytes32 indexed merkleRoot, uint256 executionCount, address indexed node);
+
+    function submitProof(
+        string calldata modelId,
+        bytes32 inputHash,
+        bytes32 outputHash,
+        bytes calldata proof
+    ) external returns (bytes32 executionId) {
+        executionId = keccak256(abi.encodePacked(modelId, inputHash, outputHash, msg.sender, executionCount));
+        executionCount++;
+        proofHashes[executionId] = keccak256(proof);
+        emit ProofSubmitted(executionId, modelId, msg.sender);
+    }
+
+    function submitProofBatch(bytes32 merkleRoot, uint256 count) external {
+        batchSizes[merkleRoot] = count;
+        executionCount += count;
+        emit ProofBatchSubmitted(merkleRoot, count, msg.sender);
+    }
+}
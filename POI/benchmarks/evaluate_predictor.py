@@ -0,0 +1,72 @@
+"""
+Offline evaluation of ModelPredictor prefetch hit rate
+
+Replays a usage log of (timestamp, user_id, model_id) rows, given as CSV
+or JSON lines, and reports how often the model a user requested had been
+predicted just before. Without a log a synthetic workload is generated in
+which every user cycles through a short personal pipeline of models.
+
+Run from the POI directory:
+    python -m benchmarks.evaluate_predictor --log usage.csv --k 3
+    python -m benchmarks.evaluate_predictor --users 2000 --events 200000
+"""
+import argparse
+import csv
+import json
+import random
+from typing import Iterator, Tuple
+
+from src.model_predictor import ModelPredictor, evaluate_predictor
+
+def read_log(path: str) -> Iterator[Tuple[float, str, str]]:
+    """Read (timestamp, user_id, model_id) rows from CSV or JSON lines."""
+    with open(path) as f:
+        if path.endswith((".jsonl", ".json")):
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield float(row["timestamp"]), str(row["user_id"]), str(row["model_id"])
+        else:
+            for row in csv.DictReader(f):
+                yield float(row["timestamp"]), row["user_id"], row["model_id"]
+
+def synthetic_log(users: int, models: int, events: int, noise: float, seed: int) -> Iterator[Tuple[float, str, str]]:
+    """Users repeat their own model pipeline, with some random requests mixed in."""
+    rng = random.Random(seed)
+    catalog = [f"model-{i}" for i in range(models)]
+    pipelines = [rng.sample(catalog, rng.randint(2, 5)) for _ in range(users)]
+    positions = [0] * users
+    timestamp = 0.0
+
+    for _ in range(events):
+        user = rng.randrange(users)
+        timestamp += rng.expovariate(10.0)
+        if rng.random() < noise:
+            model_id = rng.choice(catalog)
+        else:
+            pipeline = pipelines[user]
+            model_id = pipeline[positions[user] % len(pipeline)]
+            positions[user] += 1
+        yield timestamp, f"user-{user}", model_id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="CSV or JSONL usage log; synthetic when omitted")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--half-life", type=float, default=24 * 3600)
+    parser.add_argument("--user-weight", type=float, default=2.0)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--models", type=int, default=200)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--noise", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    events = read_log(args.log) if args.log else synthetic_log(
+        args.users, args.models, args.events, args.noise, args.seed
+    )
+    predictor = ModelPredictor(half_life=args.half_life, user_weight=args.user_weight)
+    print(json.dumps(evaluate_predictor(events, k=args.k, predictor=predictor), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -42,11 +42,15 @@ contract ModelMarketplaceV2 {
     // Mapping of model IDs to their info
     mapping(bytes32 => Model) public models;
     
+    // Execution counts of Merkle roots committed by inference nodes
+    mapping(bytes32 => uint256) public proofBatches;
+    
     // Events
     event ModelRegistered(bytes32 indexed modelId, address indexed owner, string iotaStreamId);
     event ModelUsed(bytes32 indexed modelId, bytes32 indexed executionId, string iotaMessageId);
     event ModelDeactivated(bytes32 indexed modelId);
     event EthicsStatusUpdated(bytes32 indexed modelId, bool approved);
+    event ProofBatchSubmitted(bytes32 indexed merkleRoot, uint256 executionCount, address indexed node);
     
     modifier onlyDAO() {
         require(msg.sender == daoGovernor, "Only DAO can perform this action");
@@ -150,6 +154,14 @@ contract ModelMarketplaceV2 {
         );
     }
     
+    // Inference nodes commit one Merkle root over a batch of execution records
+    function submitProofBatch(bytes32 merkleRoot, uint256 executionCount) external {
+        require(executionCount > 0, "Empty proof batch");
+        require(proofBatches[merkleRoot] == 0, "Proof batch already submitted");
+        proofBatches[merkleRoot] = executionCount;
+        emit ProofBatchSubmitted(merkleRoot, executionCount, msg.sender);
+    }
+    
     // Model owners can deactivate their own models
     function deactivateModel(bytes32 modelId) external {
         Model storage model = models[modelId];
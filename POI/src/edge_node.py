@@ -4,7 +4,7 @@ Edge Computing Node Implementation
 import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 import torch
 from web3 import Web3
 from eth_account import Account
@@ -12,6 +12,8 @@ from eth_typing import Address
 
 from .inference_node import InferenceNode
 from .zk_prover import ZKProver
+from .task_feed import TaskFeed
+from .task_scheduler import TaskScheduler
 
 class EdgeNode(InferenceNode):
     def __init__(
@@ -21,14 +23,34 @@ class EdgeNode(InferenceNode):
         poi_address: Address,
         web3_provider: str = "http://localhost:8545",
         host: str = "0.0.0.0",
-        port: int = 8080
+        port: int = 8080,
+        task_cursor_path: str = "./task_cursor.json",
+        task_poll_interval: Optional[float] = 5.0,
+        task_subscription: Optional[Callable[[], AsyncIterator[Any]]] = None,
+        max_concurrent_tasks: int = 4,
+        max_free_concurrent_tasks: Optional[int] = None,
+        max_paid_queue: int = 100,
+        max_free_queue: int = 50
     ):
         """Initialize an edge computing node."""
         super().__init__(private_key, poi_address, web3_provider)
         self.coordinator_contract = self._load_coordinator(coordinator_address)
         self.host = host
         self.port = port
-        self.active_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Bounded, deadline-ordered execution of assigned tasks
+        self.scheduler = TaskScheduler(
+            self._execute_task,
+            max_concurrency=max_concurrent_tasks,
+            free_concurrency=max_free_concurrent_tasks,
+            max_paid_queue=max_paid_queue,
+            max_free_queue=max_free_queue
+        )
+        self.active_tasks: Dict[str, asyncio.Task] = self.scheduler.running
+        self.task_cursor_path = task_cursor_path
+        self.task_poll_interval = task_poll_interval
+        self.task_subscription = task_subscription
+        self.task_feed: Optional[TaskFeed] = None
         
     def _load_coordinator(self, address: Address):
         """Load the NodeCoordinator contract."""
@@ -41,20 +63,19 @@ class EdgeNode(InferenceNode):
         compute_capacity = self._get_compute_capacity()
         stake_amount = Web3.to_wei(1000, 'ether')  # 1000 JOY tokens
         
-        tx = self.coordinator_contract.functions.registerNode(
-            f"{self.host}:{self.port}",
-            compute_capacity,
-            stake_amount
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        await self.tx_sender.send_async(
+            self.coordinator_contract.functions.registerNode(
+                f"{self.host}:{self.port}",
+                compute_capacity,
+                stake_amount
+            ),
+            {'gas': 2000000}
+        )
         
+        # Start background proof commits
+        if self.proof_pipeline:
+            self.proof_pipeline.start()
+            
         # Start heartbeat
         asyncio.create_task(self._heartbeat_loop())
         
@@ -65,15 +86,10 @@ class EdgeNode(InferenceNode):
         """Send regular heartbeats to coordinator."""
         while True:
             try:
-                tx = self.coordinator_contract.functions.sendHeartbeat().build_transaction({
-                    'from': self.account.address,
-                    'gas': 100000,
-                    'gasPrice': self.web3.eth.gas_price,
-                    'nonce': self.web3.eth.get_transaction_count(self.account.address)
-                })
-                
-                signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-                await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                await self.tx_sender.send_async(
+                    self.coordinator_contract.functions.sendHeartbeat(),
+                    {'gas': 100000}
+                )
                 
             except Exception as e:
                 logging.error(f"Heartbeat failed: {e}")
@@ -81,34 +97,69 @@ class EdgeNode(InferenceNode):
             await asyncio.sleep(60)  # Send heartbeat every minute
             
     async def _process_tasks(self):
-        """Process assigned computation tasks."""
+        """Process assigned computation tasks as the task feed discovers them."""
+        self.task_feed = TaskFeed(
+            self.web3,
+            self.coordinator_contract.events.TaskAssigned,
+            self.account.address,
+            cursor_path=self.task_cursor_path,
+            poll_interval=self.task_poll_interval,
+            subscription=self.task_subscription
+        )
         while True:
             try:
-                # Check for new tasks
-                events = self.coordinator_contract.events.TaskAssigned.get_logs(
-                    fromBlock=self.web3.eth.block_number - 100
-                )
+                await self.task_feed.start()
+                break
+            except Exception as e:
+                logging.error(f"Task feed failed to start: {e}")
+                await asyncio.sleep(5)
+                
+        loop = asyncio.get_running_loop()
+        while True:
+            assignment = await self.task_feed.get()
+            task_id = assignment['task_id']
+            if self.scheduler.is_known(task_id):
+                continue
                 
-                for event in events:
-                    task_id = event['args']['taskId']
-                    nodes = event['args']['nodes']
-                    
-                    # Check if we're assigned to this task
-                    if self.account.address in nodes and task_id not in self.active_tasks:
-                        self.active_tasks[task_id] = asyncio.create_task(
-                            self._execute_task(task_id)
-                        )
-                        
+            try:
+                task = await loop.run_in_executor(
+                    None, lambda: self.coordinator_contract.functions.tasks(task_id).call()
+                )
             except Exception as e:
-                logging.error(f"Task processing failed: {e}")
+                logging.error(f"Failed to fetch task {task_id}: {e}")
+                continue
                 
-            await asyncio.sleep(5)
+            # Refuse work we cannot finish in time rather than slowing every task down
+            self.scheduler.submit(
+                task_id,
+                task,
+                free=bool(task.get('isFree')),
+                deadline=task.get('deadline') or None
+            )
             
-    async def _execute_task(self, task_id: str):
+    def register_prometheus(self, registry: Any = None):
+        """Expose latency and scheduler metrics through a Prometheus registry."""
+        super().register_prometheus(registry)
+        self.scheduler.register_prometheus(registry)
+        
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get scheduler, task feed and transaction metrics."""
+        metrics = {
+            'scheduler': self.scheduler.get_metrics(),
+            'transactions': self.tx_sender.get_metrics()
+        }
+        if self.task_feed:
+            metrics['task_feed'] = self.task_feed.get_metrics()
+        if self.batcher:
+            metrics['batching'] = self.batcher.get_metrics()
+        return metrics
+        
+    async def _execute_task(self, task_id: str, task: Optional[Dict[str, Any]] = None):
         """Execute an assigned computation task."""
         try:
             # Get task details
-            task = self.coordinator_contract.functions.tasks(task_id).call()
+            if task is None:
+                task = self.coordinator_contract.functions.tasks(task_id).call()
             
             # Load model if not already loaded
             if task['modelId'] not in self.models:
@@ -130,32 +181,25 @@ class EdgeNode(InferenceNode):
                 )
             else:
                 # Standard paid inference
-                result = await self.execute_inference(
+                result = await self.execute_inference_async(
                     task['modelId'],
-                    input_data,
-                    task.get('userId')  # Pass user ID for predictive loading
+                    input_data['data'],
+                    task.get('userId'),  # Pass user ID for predictive loading
+                    task.get('qualityTier', 'exact')
                 )
             
             # Complete task
-            tx = self.coordinator_contract.functions.completeTask(
-                task_id,
-                result['executionId']
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 200000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            await self.tx_sender.send_async(
+                self.coordinator_contract.functions.completeTask(
+                    task_id,
+                    result['executionId']
+                ),
+                {'gas': 200000}
+            )
             
         except Exception as e:
             logging.error(f"Task execution failed: {e}")
             
-        finally:
-            del self.active_tasks[task_id]
-            
     def _get_compute_capacity(self) -> int:
         """Get the node's compute capacity in FLOPS."""
         if torch.cuda.is_available():
@@ -0,0 +1,177 @@
+"""Dynamic micro-batching for concurrent inference requests."""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import torch
+
+@dataclass
+class _PendingRequest:
+    input_data: torch.Tensor
+    future: asyncio.Future
+    enqueued_at: float
+
+    @property
+    def rows(self) -> int:
+        return self.input_data.shape[0] if self.input_data.dim() > 0 else 1
+
+@dataclass
+class BatchMetrics:
+    """Batch-size and queue-wait statistics for a single model."""
+    batches: int = 0
+    requests: int = 0
+    rows: int = 0
+    total_queue_wait_ms: float = 0.0
+    max_queue_wait_ms: float = 0.0
+    batch_size_histogram: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    def record(self, batch_rows: int, queue_waits_ms: List[float]):
+        """Record one executed batch."""
+        self.batches += 1
+        self.requests += len(queue_waits_ms)
+        self.rows += batch_rows
+        self.batch_size_histogram[batch_rows] += 1
+        self.total_queue_wait_ms += sum(queue_waits_ms)
+        self.max_queue_wait_ms = max(self.max_queue_wait_ms, max(queue_waits_ms, default=0.0))
+
+    @property
+    def avg_batch_size(self) -> float:
+        return self.rows / self.batches if self.batches else 0.0
+
+    @property
+    def avg_queue_wait_ms(self) -> float:
+        return self.total_queue_wait_ms / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'avg_batch_size': self.avg_batch_size,
+            'avg_queue_wait_ms': self.avg_queue_wait_ms,
+            'max_queue_wait_ms': self.max_queue_wait_ms,
+            'batch_size_histogram': dict(self.batch_size_histogram)
+        }
+
+class InferenceBatcher:
+    def __init__(
+        self,
+        run_batch: Callable[[str, torch.Tensor], torch.Tensor],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """Initialize the batcher.
+
+        Args:
+            run_batch: Callable running one forward pass for (model_id, batched_input).
+                It is executed in the default thread pool so the event loop stays responsive.
+            max_batch_size: Maximum number of rows stacked into a single forward pass
+            max_wait_ms: Maximum time the oldest queued request waits for a batch to fill
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self.metrics: Dict[str, BatchMetrics] = defaultdict(BatchMetrics)
+
+    async def submit(self, model_id: str, input_data: torch.Tensor) -> torch.Tensor:
+        """Queue an input for batched execution and wait for its slice of the output.
+
+        Inputs are expected to carry a leading batch dimension, as model inputs
+        already do elsewhere in the node (e.g. ``(1, 3, 224, 224)``).
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._get_queue(model_id).put(
+            _PendingRequest(input_data, future, time.monotonic())
+        )
+        return await future
+
+    def get_metrics(self, model_id: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Get batching metrics for one model or for all models."""
+        if model_id is not None:
+            return {model_id: self.metrics[model_id].to_dict()}
+        return {m: stats.to_dict() for m, stats in self.metrics.items()}
+
+    async def close(self):
+        """Stop all batch workers."""
+        for task in self.workers.values():
+            task.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
+        self.queues.clear()
+
+    def _get_queue(self, model_id: str) -> asyncio.Queue:
+        """Get the request queue for a model, starting its worker if needed."""
+        if model_id not in self.queues:
+            self.queues[model_id] = asyncio.Queue()
+            self.workers[model_id] = asyncio.create_task(self._worker(model_id))
+        return self.queues[model_id]
+
+    async def _worker(self, model_id: str):
+        """Collect queued requests into batches and execute them."""
+        queue = self.queues[model_id]
+        carry: Optional[_PendingRequest] = None
+
+        while True:
+            first = carry if carry is not None else await queue.get()
+            carry = None
+            batch = [first]
+            rows = first.rows
+            deadline = first.enqueued_at + self.max_wait
+
+            # Fill the batch until it is full or the oldest request has waited long enough
+            while rows < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    if timeout > 0:
+                        request = await asyncio.wait_for(queue.get(), timeout)
+                    else:
+                        request = queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+
+                if rows + request.rows > self.max_batch_size:
+                    carry = request
+                    break
+                batch.append(request)
+                rows += request.rows
+
+            try:
+                await self._execute_batch(model_id, batch)
+            except Exception as e:
+                logging.error(f"Batch execution failed for {model_id}: {e}")
+
+    async def _execute_batch(self, model_id: str, batch: List[_PendingRequest]):
+        """Run compatible requests together and route output slices back to callers."""
+        groups: Dict[Tuple, List[_PendingRequest]] = defaultdict(list)
+        for request in batch:
+            key = (tuple(request.input_data.shape[1:]), request.input_data.dtype, request.input_data.device)
+            groups[key].append(request)
+
+        loop = asyncio.get_running_loop()
+        for requests in groups.values():
+            started_at = time.monotonic()
+            waits_ms = [(started_at - r.enqueued_at) * 1000 for r in requests]
+            sizes = [r.rows for r in requests]
+
+            try:
+                stacked = torch.cat([r.input_data for r in requests], dim=0)
+                output = await loop.run_in_executor(None, self.run_batch, model_id, stacked)
+                outputs = torch.split(output, sizes, dim=0)
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self.metrics[model_id].record(sum(sizes), waits_ms)
+            for request, result in zip(requests, outputs):
+                if not request.future.done():
+                    request.future.set_result(result)
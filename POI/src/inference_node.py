@@ -1,17 +1,38 @@
 """Core inference node implementation."""
 
+import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
+import numpy as np
 import torch
 import time
 from web3 import Web3
 from web3.types import Address
+from eth_account import Account
+from hexbytes import HexBytes
 
-from .gpu_memory_manager import GPUMemoryManager
 from .model_predictor import ModelPredictor
+from .prefetcher import ModelPrefetcher
 from .location_manager import LocationManager
+from .inference_batcher import InferenceBatcher
+from .proof_pipeline import ProofSubmissionPipeline
+from .worker_pool import InferenceWorkerPool
+from .model_compiler import CompiledModelCache
+from .tiered_model_cache import TieredModelCache, default_tiers
+from .quantization import INT8_SUFFIX, QuantizationManager
+from .result_cache import ResultCache, tensor_digest
+from .utils.merkle_utils import (
+    LayerVerifier,
+    WeightVerificationError,
+    compute_file_merkle_root,
+    compute_model_merkle_root
+)
+from .utils.latency import get_latency_recorder
+from .utils.tensor_hash import hash_tensor
+from .utils.transaction import get_transaction_sender
+from .utils.weight_format import MappedWeights, find_weights, load_model, read_header
 
 class InferenceNode:
     def __init__(
@@ -21,17 +42,103 @@ class InferenceNode:
         web3: Web3,
         models_dir: str = "./models",
         gpu_buffer: float = 0.4,
-        cache_size: int = 5
+        cache_size: int = 5,
+        enable_batching: bool = False,
+        max_batch_size: int = 32,
+        max_batch_wait_ms: float = 5.0,
+        proof_batch_interval: Optional[float] = None,
+        cpu_workers_per_model: int = 0,
+        threads_per_worker: int = 1,
+        compile_backend: Optional[str] = None,
+        compiled_cache_dir: str = "./compiled_models",
+        enable_quantization: bool = False,
+        quantization_tolerance: float = 0.05,
+        calibration_samples: int = 16,
+        result_cache_size: int = 0,
+        result_cache_bytes: int = 256 * 1024 * 1024,
+        result_cache_ttl: float = 300.0,
+        device_cache_bytes: Optional[int] = None,
+        ram_cache_bytes: int = 8 * 1024**3,
+        disk_cache_bytes: int = 64 * 1024**3,
+        model_cache_dir: str = "./model_cache",
+        prefetch_queue_size: int = 8,
+        prefetch_memory_bytes: int = 2 * 1024**3,
+        verify_weights: bool = True,
+        trusted_roots: Optional[Dict[str, str]] = None
     ):
         self.models_dir = models_dir
         self.account = account
         self.web3 = web3
+        self.tx_sender = get_transaction_sender(web3, account)
         
         # Initialize optimized components
-        self.gpu_manager = GPUMemoryManager(buffer_ratio=gpu_buffer)
+        self.model_cache = TieredModelCache(
+            self._load_model_by_id,
+            default_tiers(
+                device_budget=device_cache_bytes,
+                ram_budget=ram_cache_bytes,
+                disk_budget=disk_cache_bytes,
+                buffer_ratio=gpu_buffer
+            ),
+            cache_dir=model_cache_dir
+        )
         self.model_predictor = ModelPredictor(cache_size=cache_size)
+        
+        # Predicted models are loaded in the background, off the request path
+        self.prefetcher = ModelPrefetcher(
+            self.model_cache,
+            self._model_size_hint,
+            max_queue=prefetch_queue_size,
+            memory_budget=prefetch_memory_bytes
+        )
         self.location_manager = LocationManager()
         
+        # Optional micro-batching of concurrent requests per model
+        self.batcher = InferenceBatcher(
+            self._forward,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_batch_wait_ms
+        ) if enable_batching else None
+        
+        # Optional background submission of Merkle-batched proofs
+        self.proof_pipeline = ProofSubmissionPipeline(
+            self.submit_proof_root,
+            interval=proof_batch_interval
+        ) if proof_batch_interval else None
+        
+        # Optional pool of pinned CPU worker processes for GPU-less hosts
+        self.worker_pool = InferenceWorkerPool(
+            workers_per_model=cpu_workers_per_model,
+            threads_per_worker=threads_per_worker
+        ) if cpu_workers_per_model and not torch.cuda.is_available() else None
+        
+        # Optional compiled artifacts per model and input signature
+        self.compiled_cache = CompiledModelCache(
+            cache_dir=compiled_cache_dir,
+            backend=compile_backend
+        ) if compile_backend else None
+        
+        # Optional int8 tier for CPU-only nodes, calibrated on live requests
+        self.quantizer = QuantizationManager(
+            tolerance=quantization_tolerance,
+            calibration_samples=calibration_samples
+        ) if enable_quantization and not torch.cuda.is_available() else None
+        
+        # Optional cache of results for repeated identical requests
+        self.result_cache = ResultCache(
+            max_entries=result_cache_size,
+            max_bytes=result_cache_bytes,
+            ttl=result_cache_ttl
+        ) if result_cache_size else None
+        self.model_roots: Dict[str, str] = {}
+        
+        # Weight files carrying Merkle proofs are verified tensor by tensor as they load
+        self.verify_weights = verify_weights
+        self.trusted_roots: Dict[str, str] = dict(trusted_roots or {})
+        
+        # Per-stage latency histograms, shared with any metrics server in the process
+        self.latency = get_latency_recorder()
+        
         # Register node location (should be configured)
         self.latitude = 0.0  # Default values
         self.longitude = 0.0
@@ -56,116 +163,357 @@ class InferenceNode:
                 abi=contract_json["abi"]
             )
             
-    def _preload_model(self, model_id: str) -> None:
-        """Preemptively load a model into GPU memory."""
-        try:
-            # Check if model should be cached based on usage patterns
-            if not self.model_predictor.should_cache_model(model_id):
-                return
-                
-            # Get model path and load model file
+    def register_prometheus(self, registry: Any = None):
+        """Expose per-stage latency percentiles through a Prometheus registry.
+        
+        The node serves no endpoint of its own; hand it to the process's
+        metrics server (SovereignRPCNode.add_metrics_source) instead.
+        """
+        self.latency.register_prometheus(registry)
+        
+    def _model_size_hint(self, model_id: str) -> Optional[int]:
+        """Estimate a model's memory from the cache or its files on disk."""
+        size = self.model_cache.size_of(model_id)
+        if size is None:
             model_path = Path(self.models_dir) / model_id
             if not model_path.exists():
-                logging.warning(f"Model {model_id} not found locally")
-                return
+                return None
+            size = sum(f.stat().st_size for f in model_path.iterdir() if f.is_file())
+        return size
+        
+    def _load_model_file(self, model_path: Path) -> torch.nn.Module:
+        """Load a model from its directory, preferring memory-mapped weights over pickles."""
+        weights_path = find_weights(model_path)
+        if weights_path:
+            return self._load_weights(model_path.name, weights_path)
+        return torch.load(model_path / "model.pt", map_location="cpu")
+        
+    def _load_weights(self, model_id: str, weights_path: Path) -> torch.nn.Module:
+        """Map a weight file, checking each parameter against its Merkle proof as it is paged in."""
+        return self._verified(model_id, weights_path, lambda check: load_model(weights_path, check=check))
+        
+    def _verify_weights(self, model_id: str, weights_path: Path):
+        """Check every tensor of a weight file against its Merkle proof without building the model."""
+        def read_all(check):
+            for _ in MappedWeights(weights_path).items(check):
+                pass
                 
-            # Load model into CPU memory first
-            model = torch.load(model_path / "model.pt", map_location="cpu")
+        self._verified(model_id, weights_path, read_all)
+        
+    def _verified(self, model_id: str, weights_path: Path, read: Callable[[Optional[LayerVerifier]], Any]) -> Any:
+        """Call read with a Merkle proof check when the file carries proofs and verification is on."""
+        header, _ = read_header(weights_path)
+        proofs = header.get("metadata", {}).get("merkle") if self.verify_weights else None
+        if proofs is None:
+            return read(None)
             
-            # Try to move to GPU if we have enough memory
-            if torch.cuda.is_available():
-                # Estimate model size (rough estimation)
-                model_size = sum(p.numel() * p.element_size() for p in model.parameters())
-                
-                if self.gpu_manager.can_load_model(model_id, model_size):
-                    self.gpu_manager.cache_model(model_id, model)
-                    logging.info(f"Preloaded model {model_id} to GPU cache")
-                    
-        except Exception as e:
-            logging.error(f"Failed to preload model {model_id}: {e}")
+        try:
+            verifier = LayerVerifier(proofs, self.trusted_roots.get(model_id))
+            result = read(verifier)
+            verifier.finish()
+        except WeightVerificationError as e:
+            logging.error(f"Rejected weights for model {model_id}: {e}")
+            raise
             
-    def _load_model_to_gpu(self, model_id: str) -> torch.nn.Module:
-        """Load a model and move it to GPU."""
+        # Every parameter was just hashed against this root
+        self.model_roots.setdefault(model_id, verifier.merkle_root)
+        return result
+        
+    def _load_model_by_id(self, model_id: str) -> torch.nn.Module:
+        """Load a model onto the CPU for the tiered cache."""
         model_path = Path(self.models_dir) / model_id
         if not model_path.exists():
             raise ValueError(f"Model {model_id} not found")
-            
-        # Load model to CPU first
-        model = torch.load(model_path / "model.pt", map_location="cpu")
+        return self._load_model_file(model_path)
         
-        # Move to GPU if available
-        if torch.cuda.is_available():
-            # Ensure we have enough memory
-            self.gpu_manager.optimize_memory(1024*1024*1024)  # Request 1GB buffer
-            self.gpu_manager.cache_model(model_id, model)
+    def execute_inference(
+        self,
+        model_id: str,
+        input_data: Any,
+        user_id: Optional[str] = None,
+        quality_tier: str = "exact",
+        include_timings: bool = False
+    ) -> Dict[str, Any]:
+        """Execute model inference with optimized GPU usage and generate proof.
+        
+        With include_timings, the result's latency also lists each stage in ms.
+        """
+        start_time = time.time()
+        trace: Dict[str, float] = {}
+        with self.latency.span(model_id, 'prepare', trace):
+            self._prepare_request(model_id, user_id)
+            serving_id = self._route(model_id, quality_tier)
+        with self.latency.span(model_id, 'transfer', trace):
+            input_data = self._to_device(input_data)
+        
+        def run() -> Dict[str, Any]:
+            with torch.no_grad():
+                output_data = self._forward(serving_id, input_data, trace)
+                result = self._finalize_inference(model_id, input_data, output_data, start_time, trace)
+                result['precision'] = 'int8' if serving_id != model_id else 'fp32'
+                return result
+                
+        if not self.result_cache:
+            return self._attach_timings(run(), trace, include_timings)
+            
+        with self.latency.span(model_id, 'cache_key', trace):
+            key = self._result_key(model_id, serving_id, input_data)
+        result, cached = self.result_cache.get_or_compute(key, run)
+        return self._attach_timings(self._mark_cached(result, cached, start_time), trace, include_timings)
             
-        return model
+    async def execute_inference_async(
+        self,
+        model_id: str,
+        input_data: Any,
+        user_id: Optional[str] = None,
+        quality_tier: str = "exact",
+        include_timings: bool = False
+    ) -> Dict[str, Any]:
+        """Execute inference without blocking the event loop.
         
-    def execute_inference(self, model_id: str, input_data: Any, user_id: Optional[str] = None) -> Dict[str, Any]:
-        """Execute model inference with optimized GPU usage and generate proof."""
+        When batching is enabled, concurrent requests for the same model are
+        stacked into a single forward pass by the node's InferenceBatcher;
+        the "batch" stage then covers queueing plus the shared forward pass.
+        """
         start_time = time.time()
+        loop = asyncio.get_running_loop()
+        trace: Dict[str, float] = {}
+        with self.latency.span(model_id, 'prepare', trace):
+            self._prepare_request(model_id, user_id)
+            serving_id = self._route(model_id, quality_tier)
+        with self.latency.span(model_id, 'transfer', trace):
+            input_data = self._to_device(input_data)
+        
+        async def run() -> Dict[str, Any]:
+            # Batches are formed per serving ID, so int8 and fp32 requests never mix
+            if self.batcher:
+                with self.latency.span(serving_id, 'batch', trace):
+                    output_data = await self.batcher.submit(serving_id, input_data)
+            else:
+                output_data = await loop.run_in_executor(
+                    None, self._forward, serving_id, input_data, trace
+                )
+                
+            result = await loop.run_in_executor(
+                None, self._finalize_inference, model_id, input_data, output_data, start_time, trace
+            )
+            result['precision'] = 'int8' if serving_id != model_id else 'fp32'
+            return result
+            
+        if not self.result_cache:
+            return self._attach_timings(await run(), trace, include_timings)
+            
+        with self.latency.span(model_id, 'cache_key', trace):
+            key = await loop.run_in_executor(None, self._result_key, model_id, serving_id, input_data)
+        result, cached = await self.result_cache.get_or_compute_async(key, run)
+        return self._attach_timings(self._mark_cached(result, cached, start_time), trace, include_timings)
+        
+    def _result_key(self, model_id: str, serving_id: str, input_data: torch.Tensor):
+        """Key results by serving variant, weight Merkle root and input content."""
+        return (serving_id, self._model_root(model_id), tensor_digest(input_data))
+        
+    def _model_root(self, model_id: str) -> str:
+        """Get the Merkle root of a model's weights, computing it once per model."""
+        root = self.model_roots.get(model_id)
+        if root is None:
+            model = self.model_cache.peek(model_id)
+            weights_path = find_weights(Path(self.models_dir) / model_id) if model is None else None
+            try:
+                # Weight files are hashed as they stream off disk, without building the model
+                root = compute_file_merkle_root(weights_path) if weights_path else None
+            except ValueError:
+                root = None
+            if root is None:
+                # Load through the cache so the request that follows reuses the model
+                root = compute_model_merkle_root(model or self.model_cache.get(model_id))
+            self.model_roots[model_id] = root
+        return root
+        
+    def invalidate_model(self, model_id: str):
+        """Forget derived state for a model whose weights changed."""
+        self.model_roots.pop(model_id, None)
+        self.model_cache.invalidate(model_id)
+        if self.compiled_cache:
+            self.compiled_cache.invalidate(model_id)
+        if self.result_cache:
+            self.result_cache.invalidate(lambda key: key[0] in (model_id, model_id + INT8_SUFFIX))
+        if self.quantizer:
+            self.quantizer.drop_variant(model_id)
+            
+    def _mark_cached(self, result: Dict[str, Any], cached: bool, start_time: float) -> Dict[str, Any]:
+        """Flag results served from the cache with the latency the caller saw."""
+        # The cached dict is shared with every waiter on the same key
+        result = dict(result)
+        result['cached'] = cached
+        if cached:
+            result['latency'] = {'inference_ms': int((time.time() - start_time) * 1000)}
+        return result
+        
+    def _attach_timings(
+        self,
+        result: Dict[str, Any],
+        trace: Dict[str, float],
+        include_timings: bool
+    ) -> Dict[str, Any]:
+        """Add this request's stage timings to its result when asked for."""
+        if include_timings:
+            result['latency'] = {**result['latency'], 'stages_ms': dict(trace)}
+        return result
+        
+    def get_latency_metrics(self, model_id: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Get p50/p95/p99 latency per model and stage."""
+        return self.latency.snapshot(model_id)
+        
+    def _route(self, model_id: str, quality_tier: str) -> str:
+        """Pick the serving variant of a model allowed by the request's quality tier."""
+        if self.quantizer:
+            return self.quantizer.route(model_id, quality_tier)
+        return model_id
+        
+    def _prepare_request(self, model_id: str, user_id: Optional[str]):
+        """Record usage and queue predicted models for background prefetch."""
+        self.prefetcher.note_use(model_id)
         
         # Update usage patterns if user_id provided
         if user_id:
             self.model_predictor.record_usage(user_id, model_id)
             next_models = self.model_predictor.predict_next_models(user_id)
-            # Pre-emptively load predicted models
-            for next_model in next_models:
-                if next_model not in self.gpu_manager.cached_models:
-                    self._preload_model(next_model)
-        
-        # Get model from GPU cache or load it
-        model = self.gpu_manager.get_cached_model(model_id)
-        if not model:
-            model = self._load_model_to_gpu(model_id)
-        
-        with torch.no_grad():
-            # Convert input to tensor efficiently
-            if not isinstance(input_data, torch.Tensor):
-                input_data = torch.tensor(input_data, device='cuda' if torch.cuda.is_available() else 'cpu')
-            elif torch.cuda.is_available() and not input_data.is_cuda:
-                input_data = input_data.cuda()
+            self.prefetcher.request(
+                m for m in next_models
+                if m != model_id and self.model_predictor.should_cache_model(m)
+            )
+                    
+    def _to_device(self, input_data: Any) -> torch.Tensor:
+        """Convert input to a tensor on the inference device."""
+        if not isinstance(input_data, torch.Tensor):
+            return torch.tensor(input_data, device='cuda' if torch.cuda.is_available() else 'cpu')
+        if torch.cuda.is_available() and not input_data.is_cuda:
+            return input_data.cuda()
+        return input_data
+        
+    def _forward(
+        self,
+        model_id: str,
+        input_data: torch.Tensor,
+        trace: Optional[Dict[str, float]] = None
+    ) -> torch.Tensor:
+        """Run a single forward pass, loading the model if needed."""
+        if self.quantizer and self.quantizer.is_variant(model_id):
+            variant = self.quantizer.get_variant(model_id)
+            if variant is not None:
+                with self.latency.span(model_id, 'forward', trace), torch.no_grad():
+                    return variant(input_data)
+            # Dropped since routing, e.g. by invalidate_model; serve full precision
+            model_id = self.quantizer.base_id(model_id)
+                
+        if self.worker_pool:
+            output_data = self._forward_on_workers(model_id, input_data, trace)
+            if self.quantizer:
+                # The variant is built from the cached fp32 model on the quantizer's thread
+                self.quantizer.observe(model_id, input_data, lambda: self.model_cache.get(model_id))
+            return output_data
+            
+        with self.latency.span(model_id, 'load', trace):
+            # Get model from the fastest tier, promoting or loading it as needed
+            model = self.model_cache.get(model_id)
             
+            # Models may live on any accelerator, so follow the weights
+            param = next(model.parameters(), None)
+            if param is not None and input_data.device != param.device:
+                input_data = input_data.to(param.device)
+                
+            if self.quantizer:
+                self.quantizer.observe(model_id, input_data, lambda: model)
+                
+            if self.compiled_cache:
+                model = self.compiled_cache.get(model_id, model, input_data)
+            
+        with self.latency.span(model_id, 'forward', trace), torch.no_grad():
             # Run inference with error handling
             try:
                 output_data = model(input_data)
             except RuntimeError as e:
                 # Handle OOM errors by freeing memory and retrying
-                if "out of memory" in str(e):
-                    self.gpu_manager.optimize_memory(required_memory=1024*1024*1024)  # Request 1GB
-                    output_data = model(input_data)
-                else:
+                if "out of memory" not in str(e):
                     raise
-            
-            # Generate proof asynchronously if possible
+                self.model_cache.make_room(1024*1024*1024)  # Demote models to free 1GB
+                output_data = model(input_data)
+                
+            # Kernels run asynchronously; wait so the time lands in this stage
+            if output_data.is_cuda:
+                torch.cuda.synchronize()
+            return output_data
+                
+    def _forward_on_workers(
+        self,
+        model_id: str,
+        input_data: torch.Tensor,
+        trace: Optional[Dict[str, float]] = None
+    ) -> torch.Tensor:
+        """Run a forward pass in the CPU worker pool, starting workers on first use."""
+        if not self.worker_pool.has_model(model_id):
+            with self.latency.span(model_id, 'load', trace):
+                model_path = Path(self.models_dir) / model_id
+                if not model_path.exists():
+                    raise ValueError(f"Model {model_id} not found")
+                    
+                # Workers map weight files themselves, so check the file before they see it;
+                # pickled models are shared via shared memory
+                source = find_weights(model_path)
+                if source is not None:
+                    self._verify_weights(model_id, source)
+                else:
+                    source = self._load_model_file(model_path)
+                self.worker_pool.start_model(model_id, source)
+                
+        with self.latency.span(model_id, 'forward', trace):
+            return self.worker_pool.run(model_id, input_data)
+        
+    def _finalize_inference(
+        self,
+        model_id: str,
+        input_data: torch.Tensor,
+        output_data: torch.Tensor,
+        start_time: float,
+        trace: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """Generate and submit the proof for a completed forward pass."""
+        # Generate proof asynchronously if possible
+        with self.latency.span(model_id, 'proof', trace):
             proof = self.generate_proof(model_id, input_data, output_data)
-            
-            # Get hashes efficiently
+        
+        # Get hashes efficiently
+        with self.latency.span(model_id, 'hash', trace):
             input_hash = self._hash_data(input_data)
             output_hash = self._hash_data(output_data)
-            
-            # Submit proof with potential batching
-            execution_id = self.submit_proof(
-                model_id,
-                input_hash,
-                output_hash,
-                proof
-            )
-            
-            # Update node load for location manager
-            if torch.cuda.is_available():
-                current_load = torch.cuda.memory_allocated(0) / torch.cuda.get_device_properties(0).total_memory
-                self.location_manager.update_node_load(str(self.account.address), int(current_load * 100))
-            
-            end_time = time.time()
-            inference_time = int((end_time - start_time) * 1000)  # Convert to milliseconds
-            
-            return {
-                'output': output_data.cpu().numpy(),
-                'executionId': execution_id,
-                'proof': proof.hex(),
-                'latency': {'inference_ms': inference_time}
-            }
+        
+        # Queue proof for the next batch commit, or submit it directly
+        with self.latency.span(model_id, 'submit', trace):
+            if self.proof_pipeline:
+                execution_id = self.proof_pipeline.enqueue(model_id, input_hash, output_hash, proof)
+            else:
+                execution_id = self.submit_proof(
+                    model_id,
+                    input_hash,
+                    output_hash,
+                    proof
+                )
+        
+        # Update node load for location manager
+        if torch.cuda.is_available():
+            current_load = torch.cuda.memory_allocated(0) / torch.cuda.get_device_properties(0).total_memory
+            self.location_manager.update_node_load(str(self.account.address), int(current_load * 100))
+        
+        end_time = time.time()
+        inference_time = int((end_time - start_time) * 1000)  # Convert to milliseconds
+        
+        return {
+            'output': output_data.cpu().numpy(),
+            'executionId': execution_id,
+            'proof': proof.hex(),
+            'provisional': self.proof_pipeline is not None,
+            'latency': {'inference_ms': inference_time}
+        }
             
     def generate_proof(self, model_id: str, input_data: Any, output_data: Any) -> bytes:
         """Generate zero-knowledge proof of correct model execution."""
@@ -185,34 +533,53 @@ class InferenceNode:
         proof: bytes
     ) -> str:
         """Submit proof to blockchain."""
-        tx = self.contract.functions.submitProof(
-            model_id,
-            input_hash,
-            output_hash,
-            proof
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 200000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = self.tx_sender.send(
+            self.contract.functions.submitProof(
+                model_id,
+                input_hash,
+                output_hash,
+                proof
+            ),
+            {'gas': 200000}
+        )
         
         # Wait for transaction receipt
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.tx_sender.wait_for_receipt(tx_hash)
         
         # Get execution ID from event logs
         event = self.contract.events.ProofSubmitted().process_receipt(receipt)[0]
         return event['args']['executionId']
         
+    def submit_proof_root(self, merkle_root: bytes, execution_count: int) -> str:
+        """Commit a Merkle root over a batch of execution records."""
+        tx_hash = self.tx_sender.send(
+            self.contract.functions.submitProofBatch(
+                merkle_root,
+                execution_count
+            ),
+            {'gas': 200000}
+        )
+        
+        receipt = self.tx_sender.wait_for_receipt(tx_hash)
+        if receipt['status'] != 1:
+            raise RuntimeError(f"Proof batch commit failed: {tx_hash.hex()}")
+        return Web3.to_hex(tx_hash)
+        
+    def get_execution_status(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """Get commitment status and Merkle inclusion proof for a provisional execution."""
+        if not self.proof_pipeline:
+            return None
+        return self.proof_pipeline.get_status(execution_id)
+        
     def _hash_data(self, data: Any) -> bytes:
         """Generate cryptographic hash of data."""
         if isinstance(data, bytes):
             return Web3.keccak(data)
         elif isinstance(data, str):
             return Web3.keccak(text=data)
+        elif isinstance(data, (torch.Tensor, np.ndarray)):
+            # Hash raw tensor memory in parallel chunks instead of its string rendering
+            return HexBytes(hash_tensor(data, algorithm="keccak256"))
         else:
             return Web3.keccak(text=str(data))
             
@@ -1,11 +1,17 @@
 """Geospatial node selection and routing manager."""
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional
+import bisect
 import math
 import numpy as np
 from dataclasses import dataclass
 from collections import defaultdict
 
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+# Farthest any two points on Earth can be apart
+MAX_DISTANCE_KM = EARTH_RADIUS_KM * math.pi
+
 @dataclass
 class NodeLocation:
     node_id: str
@@ -14,73 +20,284 @@ class NodeLocation:
     gpu_capacity: int
     current_load: int
 
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Vectorized great-circle distance in km between points given in degrees."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
 class LocationManager:
-    def __init__(self, shard_size_km: float = 100.0):
+    def __init__(self, shard_size_km: float = 100.0, initial_capacity: int = 1024):
+        """Initialize the manager.
+
+        Nodes are indexed in an equal-area style grid: latitude bands are
+        shard_size_km tall and each band is split into as many longitude
+        cells as fit at its widest edge, so cells are at most shard_size_km
+        across everywhere. Coordinates and loads are kept in numpy arrays
+        indexed by slot for vectorized scoring.
+
+        Args:
+            shard_size_km: Cell edge length in km
+            initial_capacity: Node slots allocated up front
+        """
         self.shard_size = shard_size_km
         self.nodes: Dict[str, NodeLocation] = {}
-        self.shards: Dict[Tuple[int, int], List[str]] = defaultdict(list)
-        
-    def add_node(self, node_id: str, latitude: float, longitude: float, 
+        self.shards: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+
+        self.num_bands = max(1, math.ceil(180 * KM_PER_DEGREE / shard_size_km))
+        self.band_height = 180 / self.num_bands
+        self.band_cells = [self._cells_in_band(band) for band in range(self.num_bands)]
+        # Sorted non-empty cells per band, so searches skip empty regions
+        self.occupied: List[List[int]] = [[] for _ in range(self.num_bands)]
+
+        self.slots: Dict[str, int] = {}
+        self.slot_ids: List[Optional[str]] = [None] * initial_capacity
+        self.free_slots: List[int] = list(range(initial_capacity - 1, -1, -1))
+        self.latitudes = np.zeros(initial_capacity)
+        self.longitudes = np.zeros(initial_capacity)
+        self.capacities = np.ones(initial_capacity)
+        self.loads = np.zeros(initial_capacity)
+
+    def add_node(self, node_id: str, latitude: float, longitude: float,
                 gpu_capacity: int = 1):
-        """Register a new node with its location."""
-        node = NodeLocation(node_id, latitude, longitude, gpu_capacity, 0)
+        """Register a new node with its location, or move an existing one."""
+        current_load = 0
+        if node_id in self.nodes:
+            current_load = self.nodes[node_id].current_load
+            self.remove_node(node_id)
+
+        node = NodeLocation(node_id, latitude, longitude, gpu_capacity, current_load)
         self.nodes[node_id] = node
-        
+
+        if not self.free_slots:
+            self._grow()
+        slot = self.free_slots.pop()
+        self.slots[node_id] = slot
+        self.slot_ids[slot] = node_id
+        self.latitudes[slot] = latitude
+        self.longitudes[slot] = longitude
+        self.capacities[slot] = max(1, gpu_capacity)
+        self.loads[slot] = current_load
+
         # Add to appropriate shard
         shard = self._get_shard(latitude, longitude)
-        self.shards[shard].append(node_id)
-        
-    def find_nearest_nodes(self, latitude: float, longitude: float, 
+        if shard not in self.shards:
+            bisect.insort(self.occupied[shard[0]], shard[1])
+        self.shards[shard].add(slot)
+
+    def remove_node(self, node_id: str):
+        """Unregister a node that left the network."""
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return
+        slot = self.slots.pop(node_id)
+        shard = self._get_shard(node.latitude, node.longitude)
+        self.shards[shard].discard(slot)
+        if not self.shards[shard]:
+            del self.shards[shard]
+            occupied = self.occupied[shard[0]]
+            del occupied[bisect.bisect_left(occupied, shard[1])]
+        self.slot_ids[slot] = None
+        self.free_slots.append(slot)
+
+    def find_nearest_nodes(self, latitude: float, longitude: float,
                           k: int = 3) -> List[str]:
-        """Find k nearest nodes to given coordinates."""
-        target_shard = self._get_shard(latitude, longitude)
-        candidates = []
-        
-        # Get nodes from target shard and adjacent shards
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                shard = (target_shard[0] + dx, target_shard[1] + dy)
-                candidates.extend(self.shards.get(shard, []))
-                
-        # Sort by distance and load
-        def score_node(node_id: str) -> float:
-            node = self.nodes[node_id]
-            distance = self._haversine_distance(
-                latitude, longitude, 
-                node.latitude, node.longitude
+        """Find the k best nodes by distance scaled by load.
+
+        Cells are searched in growing rings around the target. Scores are
+        never below a node's distance, so the search stops once k nodes
+        score within the radius already covered.
+        """
+        if not self.nodes or k <= 0:
+            return []
+        k = min(k, len(self.nodes))
+
+        visited: Optional[Set[Tuple[int, int]]] = set()
+        candidates: List[int] = []
+        radius = self.shard_size
+        while True:
+            # Visiting a cell costs about as much as scoring several nodes, so switch to a full scan early
+            if 8 * math.pi * (radius / self.shard_size) ** 2 > len(self.nodes):
+                radius = MAX_DISTANCE_KM
+                candidates = list(self.slots.values())
+                visited = None
+
+            for shard in self._shards_within(latitude, longitude, radius) if visited is not None else ():
+                if shard not in visited:
+                    visited.add(shard)
+                    candidates.extend(self.shards.get(shard, ()))
+
+            if len(candidates) >= k:
+                slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                scores = self._score(latitude, longitude, slots)
+                best = np.argpartition(scores, k - 1)[:k]
+                if scores[best].max() <= radius or radius >= MAX_DISTANCE_KM:
+                    order = best[np.argsort(scores[best])]
+                    return [self.slot_ids[s] for s in slots[order]]
+
+            # Doubling keeps the total cells enumerated proportional to the last ring
+            radius = min(MAX_DISTANCE_KM, radius * 2)
+
+    def route_batch(
+        self,
+        latitudes,
+        longitudes,
+        request_load: float = 1.0,
+        pool_size: int = 32,
+        group_km: Optional[float] = None,
+        commit: bool = True
+    ) -> List[Optional[str]]:
+        """Assign a node to every request in a batch.
+
+        Requests are grouped into coarse cells; each group shares one
+        candidate pool of nearby nodes and one vectorized distance matrix. Requests are then assigned in
+        order to the candidate with the best load-scaled distance, and each
+        assignment adds request_load to that node, so a burst from one
+        area spreads over its neighbourhood instead of piling onto the
+        single nearest node.
+
+        Args:
+            latitudes: Request latitudes in degrees
+            longitudes: Request longitudes in degrees
+            request_load: Load one request adds to its node
+            pool_size: Minimum nearby nodes considered per group
+            group_km: Edge of the cells requests are grouped by; defaults to 4 index cells
+            commit: Keep the added load on the nodes after the batch
+
+        Returns:
+            Node ID per request, or None when no nodes are registered
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if not self.nodes:
+            return [None] * len(latitudes)
+
+        group_km = group_km or 4 * self.shard_size
+        band_height = group_km / KM_PER_DEGREE
+        bands = np.floor((latitudes + 90) / band_height)
+        band_centres = np.radians(np.minimum(90.0, (bands + 0.5) * band_height - 90))
+        cells = np.maximum(1, np.ceil(360 * KM_PER_DEGREE * np.cos(band_centres) / group_km))
+        cell_idx = np.floor(((longitudes + 180) % 360) / 360 * cells)
+        _, inverse = np.unique(bands * 1e6 + cell_idx, return_inverse=True)
+        inverse = inverse.ravel()
+
+        loads = self.loads if commit else self.loads.copy()
+        assigned = np.empty(len(latitudes), dtype=np.int64)
+        order = np.argsort(inverse, kind="stable")
+        centre_lats = np.minimum(90.0, (bands + 0.5) * band_height - 90)
+        centre_lons = (cell_idx + 0.5) / cells * 360 - 180
+        for members in np.split(order, np.cumsum(np.bincount(inverse))[:-1]):
+            # Every member is within a half-diagonal of its group cell's centre
+            first = members[0]
+            pool = self._nodes_near(float(centre_lats[first]), float(centre_lons[first]), pool_size, group_km)
+            distances = haversine_km(
+                latitudes[members, None], longitudes[members, None],
+                self.latitudes[pool], self.longitudes[pool]
             )
-            load_factor = node.current_load / max(1, node.gpu_capacity)
-            # Combine distance and load for scoring
-            return distance * (1 + load_factor)
-            
-        candidates.sort(key=score_node)
-        return candidates[:k]
-        
+            capacities = self.capacities[pool]
+            for row, request in enumerate(members):
+                best = int(np.argmin(distances[row] * (1 + loads[pool] / capacities)))
+                assigned[request] = pool[best]
+                loads[pool[best]] += request_load
+
+        if commit:
+            for slot in np.unique(assigned):
+                self.nodes[self.slot_ids[slot]].current_load = int(loads[slot])
+        return [self.slot_ids[slot] for slot in assigned]
+
+    def _nodes_near(self, latitude: float, longitude: float, count: int, min_radius: float) -> np.ndarray:
+        """Slots of at least `count` nodes around a point, searching at least min_radius km."""
+        count = min(count, len(self.nodes))
+        visited: Set[Tuple[int, int]] = set()
+        candidates: List[int] = []
+        radius = self.shard_size
+        while True:
+            if 8 * math.pi * (radius / self.shard_size) ** 2 > len(self.nodes):
+                return np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+            for shard in self._shards_within(latitude, longitude, radius):
+                if shard not in visited:
+                    visited.add(shard)
+                    candidates.extend(self.shards.get(shard, ()))
+            if len(candidates) >= count and radius >= min_radius:
+                return np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            radius *= 2
+
     def update_node_load(self, node_id: str, load: int):
         """Update current load of a node."""
         if node_id in self.nodes:
             self.nodes[node_id].current_load = load
-            
+            self.loads[self.slots[node_id]] = load
+
+    def _score(self, latitude: float, longitude: float, slots: np.ndarray) -> np.ndarray:
+        """Distance in km scaled up by each node's load factor."""
+        distance = haversine_km(latitude, longitude, self.latitudes[slots], self.longitudes[slots])
+        return distance * (1 + self.loads[slots] / self.capacities[slots])
+
+    def _grow(self):
+        old = len(self.slot_ids)
+        new = old * 2
+        self.slot_ids.extend([None] * old)
+        self.free_slots.extend(range(new - 1, old - 1, -1))
+        for name in ('latitudes', 'longitudes', 'capacities', 'loads'):
+            array = getattr(self, name)
+            grown = np.ones(new) if name == 'capacities' else np.zeros(new)
+            grown[:old] = array
+            setattr(self, name, grown)
+
+    def _band(self, latitude: float) -> int:
+        return min(self.num_bands - 1, max(0, int((latitude + 90) / self.band_height)))
+
+    def _cells_in_band(self, band: int) -> int:
+        """Longitude cells in a band, sized by the band's edge nearest the equator."""
+        south = -90 + band * self.band_height
+        north = south + self.band_height
+        widest = 0.0 if south <= 0 <= north else min(abs(south), abs(north))
+        circumference = 360 * KM_PER_DEGREE * math.cos(math.radians(widest))
+        return max(1, math.ceil(circumference / self.shard_size))
+
     def _get_shard(self, latitude: float, longitude: float) -> Tuple[int, int]:
-        """Convert coordinates to shard indices."""
-        lat_idx = int((latitude + 90) / self.shard_size)
-        lon_idx = int((longitude + 180) / self.shard_size)
-        return (lat_idx, lon_idx)
-        
-    def _haversine_distance(self, lat1: float, lon1: float, 
+        """Convert coordinates to (band, cell) indices."""
+        band = self._band(latitude)
+        cells = self.band_cells[band]
+        cell = int((longitude + 180) % 360 / 360 * cells) % cells
+        return (band, cell)
+
+    def _shards_within(self, latitude: float, longitude: float, radius_km: float):
+        """Yield every cell that may contain points within radius_km of the target."""
+        radius_deg = radius_km / KM_PER_DEGREE
+        first = self._band(max(-90.0, latitude - radius_deg))
+        last = self._band(min(90.0, latitude + radius_deg))
+
+        # Widest longitude offset of any point within the radius
+        if abs(latitude) + radius_deg >= 90:
+            span = 180.0
+        else:
+            ratio = math.sin(math.radians(radius_deg)) / math.cos(math.radians(latitude))
+            span = math.degrees(math.asin(min(1.0, ratio)))
+
+        for band in range(first, last + 1):
+            occupied = self.occupied[band]
+            if not occupied:
+                continue
+            cells = self.band_cells[band]
+            width = 360 / cells
+            low = math.floor(((longitude - span + 180) % 360) / width)
+            count = math.ceil(2 * span / width) + 1
+            if span >= 180 or count >= cells:
+                for cell in occupied:
+                    yield (band, cell)
+                continue
+
+            # The cell range may wrap past the antimeridian
+            high = low + count
+            start = bisect.bisect_left(occupied, low)
+            for cell in occupied[start:bisect.bisect_left(occupied, min(high, cells))]:
+                yield (band, cell)
+            if high > cells:
+                for cell in occupied[:bisect.bisect_left(occupied, high - cells)]:
+                    yield (band, cell)
+
+    def _haversine_distance(self, lat1: float, lon1: float,
                            lat2: float, lon2: float) -> float:
         """Calculate distance between two points on Earth in km."""
-        R = 6371  # Earth's radius in km
-        
-        # Convert to radians
-        lat1, lon1 = math.radians(lat1), math.radians(lon1)
-        lat2, lon2 = math.radians(lat2), math.radians(lon2)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + \
-            math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
\ No newline at end of file
+        return float(haversine_km(lat1, lon1, lat2, lon2))
@@ -0,0 +1,202 @@
+"""Cache of compiled models per model, input shape and dtype."""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import torch
+
+from .utils.merkle_utils import compute_model_merkle_root, compute_weight_hash
+
+BACKENDS = ("torchscript", "inductor")
+
+CacheKey = Tuple[str, str, Tuple[int, ...], str, str]
+
+class CompiledModelCache:
+    def __init__(
+        self,
+        cache_dir: str = "./compiled_models",
+        backend: str = "torchscript",
+        background: bool = True
+    ):
+        """Initialize the compiled model cache.
+
+        Artifacts are keyed by the model's code (the classes of its modules
+        and their forward bytecode) and by the Merkle root of its weights plus
+        a digest of its buffers and frozen parameters, which freezing bakes in
+        as constants. The same model served under any model ID, after a
+        restart or on another node sharing cache_dir, reuses one compiled file.
+        Digests are computed once per model ID; call invalidate() when a
+        model's weights change.
+
+        Args:
+            cache_dir: Directory holding compiled artifacts
+            backend: "torchscript" traces and freezes the model and persists the result;
+                "inductor" uses torch.compile, which is kept in memory and relies on
+                inductor's own kernel cache across restarts
+            background: Compile on a background thread and serve the eager model
+                until the artifact is ready; otherwise get() waits for it
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown compile backend {backend}, expected one of {BACKENDS}")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        self.background = background
+
+        # Guards the dicts only; compiles run on the executor, one future per key
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-compile")
+        self._compiled: Dict[CacheKey, Callable] = {}
+        self._pending: Dict[CacheKey, Future] = {}
+        self._failed: set = set()
+        self._digests: Dict[str, Tuple[str, str]] = {}
+        self.metrics = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'compiled': 0,
+            'fallbacks': 0,
+            'eager_while_compiling': 0
+        }
+
+    def get(self, model_id: str, model: torch.nn.Module, example_input: torch.Tensor) -> Callable:
+        """Get the compiled form of a model for this input signature.
+
+        Falls back to the eager model while a background compile is running
+        and if compilation fails; failed signatures are not retried.
+
+        Args:
+            model_id: Model identifier, used for logging
+            model: Eager model
+            example_input: Input whose shape, dtype and device select the artifact
+
+        Returns:
+            Callable producing the same output as the eager model
+        """
+        key = self._cache_key(model_id, model, example_input)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self.metrics['memory_hits'] += 1
+            return compiled
+        if key in self._failed:
+            return model
+
+        with self._lock:
+            if key in self._compiled:
+                return self._compiled[key]
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._build, key, model_id, model, example_input)
+                self._pending[key] = future
+
+        if self.background and not future.done():
+            self.metrics['eager_while_compiling'] += 1
+            return model
+        return future.result() or model
+
+    def invalidate(self, model_id: str):
+        """Forget a model's digests, e.g. after its weights change."""
+        with self._lock:
+            self._digests.pop(model_id, None)
+
+    def shutdown(self):
+        """Stop the compile thread, abandoning queued compiles."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def artifact_path(self, key: CacheKey) -> Path:
+        """Get the on-disk location of a compiled artifact."""
+        code, weights, shape, dtype, device = key
+        shape_str = "x".join(str(dim) for dim in shape) or "scalar"
+        torch_version = torch.__version__.split("+")[0]
+        return self.cache_dir / f"{code[:16]}-{weights}-{shape_str}-{dtype}-{device}-torch{torch_version}.pt"
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            'entries': len(self._compiled),
+            'compiling': len(self._pending),
+            'backend': self.backend
+        }
+
+    def _cache_key(self, model_id: str, model: torch.nn.Module, example_input: torch.Tensor) -> CacheKey:
+        # Copies of a model (e.g. after a tiered-cache move) reuse its digests
+        digests = self._digests.get(model_id)
+        if digests is None:
+            digests = (self._code_digest(model), self._weights_digest(model))
+            with self._lock:
+                self._digests[model_id] = digests
+        dtype = str(example_input.dtype).replace("torch.", "")
+        return (*digests, tuple(example_input.shape), dtype, example_input.device.type)
+
+    @staticmethod
+    def _code_digest(model: torch.nn.Module) -> str:
+        """Digest the class and forward bytecode of every module in the model."""
+        digest = hashlib.sha256()
+        for name, module in model.named_modules():
+            cls = type(module)
+            digest.update(f"{name}:{cls.__module__}.{cls.__qualname__}".encode())
+            code = getattr(cls.forward, "__code__", None)
+            if code is not None:
+                digest.update(code.co_code)
+                # Nested code objects repr with their address; their parent's bytecode covers them
+                digest.update(repr([c for c in code.co_consts if not hasattr(c, "co_code")]).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _weights_digest(model: torch.nn.Module) -> str:
+        """Digest the trainable weights' Merkle root with every other frozen-in tensor."""
+        digest = hashlib.sha256(compute_model_merkle_root(model).encode())
+        frozen = [(name, p) for name, p in model.named_parameters() if not p.requires_grad]
+        for name, tensor in frozen + list(model.named_buffers()):
+            digest.update(name.encode())
+            digest.update(compute_weight_hash(tensor).encode())
+        return digest.hexdigest()
+
+    def _build(self, key: CacheKey, model_id: str, model: torch.nn.Module, example_input: torch.Tensor) -> Optional[Callable]:
+        """Compile on the executor thread; returns None when compilation failed."""
+        try:
+            compiled = self._load_or_compile(key, model, example_input)
+        except Exception as e:
+            logging.warning(f"Compiling {model_id} failed, running eagerly: {e}")
+            with self._lock:
+                self._failed.add(key)
+                self._pending.pop(key, None)
+            self.metrics['fallbacks'] += 1
+            return None
+
+        with self._lock:
+            self._compiled[key] = compiled
+            self._pending.pop(key, None)
+        return compiled
+
+    def _load_or_compile(self, key: CacheKey, model: torch.nn.Module, example_input: torch.Tensor) -> Callable:
+        if self.backend == "inductor":
+            self.metrics['compiled'] += 1
+            return torch.compile(model, dynamic=False)
+
+        path = self.artifact_path(key)
+        if path.exists():
+            try:
+                compiled = torch.jit.load(str(path), map_location=example_input.device)
+                self.metrics['disk_hits'] += 1
+                return compiled
+            except Exception as e:
+                logging.warning(f"Discarding unreadable compiled artifact {path.name}: {e}")
+
+        model.eval()
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example_input)
+            compiled = torch.jit.freeze(traced)
+
+        # Write atomically so concurrent nodes never read a partial file
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        torch.jit.save(compiled, str(tmp_path))
+        tmp_path.replace(path)
+
+        self.metrics['compiled'] += 1
+        return compiled
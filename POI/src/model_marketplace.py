@@ -7,6 +7,8 @@ from eth_account import Account
 from eth_typing import Address
 import ipfs_client
 
+from .utils.transaction import get_transaction_sender
+
 class ModelMarketplace:
     def __init__(
         self,
@@ -17,6 +19,7 @@ class ModelMarketplace:
         """Initialize the AI model marketplace."""
         self.web3 = Web3(Web3.HTTPProvider(web3_provider))
         self.account = Account.from_key(private_key)
+        self.tx_sender = get_transaction_sender(self.web3, self.account)
         self.contract = self._load_contract(pou_contract_address)
         self.ipfs = ipfs_client.connect()
         
@@ -47,19 +50,13 @@ class ModelMarketplace:
         
         # Register on blockchain
         model_id = Web3.keccak(text=metadata_hash)
-        tx = self.contract.functions.registerModel(
-            model_id,
-            reward_per_use
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        self.tx_sender.send_and_wait(
+            self.contract.functions.registerModel(
+                model_id,
+                reward_per_use
+            ),
+            {'gas': 2000000}
+        )
         
         return model_id.hex()
         
@@ -96,20 +93,14 @@ class ModelMarketplace:
             # Add safety margin to gas estimate
             gas_limit = estimate_gas_with_margin(gas_estimate)
             
-            # Build transaction with estimated gas
-            tx = self.contract.functions.useModel(
-                Web3.to_bytes(hexstr=model_id),
-                Web3.to_bytes(hexstr=execution_id)
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': gas_limit,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            # Sign and send transaction
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            # Sign and send transaction with estimated gas
+            tx_hash = self.tx_sender.send(
+                self.contract.functions.useModel(
+                    Web3.to_bytes(hexstr=model_id),
+                    Web3.to_bytes(hexstr=execution_id)
+                ),
+                {'gas': gas_limit}
+            )
             
             try:
                 async def wait_for_receipt():
@@ -1,96 +1,217 @@
 """Model usage predictor for optimizing model loading."""
 
-import torch
-import torch.nn as nn
-from collections import defaultdict
-from typing import Dict, List, Set, Optional
+import heapq
+import math
 import time
 import logging
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Rescale stored weights before exp() growth loses float precision
+MAX_EXPONENT = 50.0
+
+class _DecayedCounter:
+    """Weights per key with a lazily maintained max-heap for top-k queries.
+
+    Weights are stored forward-decayed (scaled by exp(rate * (t - t0))),
+    so an increment never touches other keys and ordering is the same as
+    for the decayed values at any later time.
+    """
+
+    def __init__(self):
+        self.weights: Dict[str, float] = {}
+        self.total = 0.0
+        self._heap: List[Tuple[float, str]] = []
+
+    def add(self, key: str, amount: float):
+        weight = self.weights.get(key, 0.0) + amount
+        self.weights[key] = weight
+        self.total += amount
+        heapq.heappush(self._heap, (-weight, key))
+        # Superseded heap entries are skipped on read; compact once they dominate
+        if len(self._heap) > 2 * len(self.weights) + 16:
+            self._rebuild()
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """Get the k heaviest keys without disturbing the heap."""
+        found = []
+        while self._heap and len(found) < k:
+            neg_weight, key = heapq.heappop(self._heap)
+            if self.weights.get(key) == -neg_weight:
+                found.append((key, -neg_weight))
+        for key, weight in found:
+            heapq.heappush(self._heap, (-weight, key))
+        return found
+
+    def scale(self, factor: float):
+        self.weights = {key: weight * factor for key, weight in self.weights.items()}
+        self.total *= factor
+        self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(-weight, key) for key, weight in self.weights.items()]
+        heapq.heapify(self._heap)
 
 class ModelPredictor:
-    def __init__(self, cache_size: int = 5):
+    def __init__(
+        self,
+        cache_size: int = 5,
+        half_life: float = 24 * 3600,
+        user_weight: float = 2.0,
+        max_users: int = 100000
+    ):
+        """Initialize the predictor.
+
+        Usage is modelled as a first-order Markov chain over models: each
+        request adds a transition from the user's previous model, both to
+        that user's chain and to a global one. All counts decay
+        exponentially, so a usage pattern fades with the given half-life.
+
+        Args:
+            cache_size: Models worth keeping cached
+            half_life: Seconds for a usage's weight to halve
+            user_weight: Weight of a user's own transitions relative to global ones
+            max_users: Users whose chains are kept, least recently active dropped first
+        """
         self.cache_size = cache_size
-        self.user_history: Dict[str, List[str]] = defaultdict(list)
-        self.model_usage_count: Dict[str, int] = defaultdict(int)
+        self.decay_rate = math.log(2) / half_life
+        self.user_weight = user_weight
+        self.max_users = max_users
+
+        self._epoch: Optional[float] = None
+        self.popularity = _DecayedCounter()
+        self.transitions: Dict[str, _DecayedCounter] = defaultdict(_DecayedCounter)
+        self.user_transitions: "OrderedDict[str, Dict[str, _DecayedCounter]]" = OrderedDict()
+        self.last_model: Dict[str, str] = {}
         self.last_used: Dict[str, float] = defaultdict(float)
         self.cached_models: Set[str] = set()
-        
-    def record_usage(self, user_id: str, model_id: str):
+
+    def record_usage(self, user_id: str, model_id: str, timestamp: Optional[float] = None):
         """Record model usage for prediction."""
-        self.user_history[user_id].append(model_id)
-        self.model_usage_count[model_id] += 1
-        self.last_used[model_id] = time.time()
-        
-        # Keep history bounded
-        if len(self.user_history[user_id]) > 100:
-            self.user_history[user_id] = self.user_history[user_id][-100:]
-            
+        now = time.time() if timestamp is None else timestamp
+        amount = self._weight_at(now)
+
+        self.popularity.add(model_id, amount)
+        self.last_used[model_id] = now
+
+        previous = self.last_model.get(user_id)
+        self.last_model[user_id] = model_id
+        chains = self.user_transitions.pop(user_id, None) or {}
+        self.user_transitions[user_id] = chains
+        if previous is not None:
+            self.transitions[previous].add(model_id, amount)
+            chains.setdefault(previous, _DecayedCounter()).add(model_id, amount)
+
+        if len(self.user_transitions) > self.max_users:
+            stale_user, _ = self.user_transitions.popitem(last=False)
+            self.last_model.pop(stale_user, None)
+
     def predict_next_models(self, user_id: str, k: int = 3) -> List[str]:
         """Predict next k models likely to be used."""
-        if user_id not in self.user_history or not self.user_history[user_id]:
-            # Return most commonly used models if no history
-            sorted_models = sorted(
-                self.model_usage_count.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
-            return [m[0] for m in sorted_models[:k]]
-            
-        # Use recent history and global popularity
-        recent_models = self.user_history[user_id][-5:]
-        scores = defaultdict(float)
-        
-        # Score based on recency and frequency
-        for model_id in self.model_usage_count:
-            # Recency score
-            if model_id in recent_models:
-                scores[model_id] += 3.0
-                
-            # Frequency score
-            scores[model_id] += self.model_usage_count[model_id] / \
-                              sum(self.model_usage_count.values())
-                              
-            # Time decay
-            time_diff = time.time() - self.last_used[model_id]
-            scores[model_id] *= max(0.1, 1.0 - (time_diff / (24 * 3600)))
-            
-        return sorted(scores, key=scores.get, reverse=True)[:k]
-        
+        previous = self.last_model.get(user_id)
+        if previous is None:
+            # Return most popular models if no history
+            return [model_id for model_id, _ in self.popularity.top(k)]
+
+        scores: Dict[str, float] = defaultdict(float)
+        sources = [(self.transitions.get(previous), 1.0)]
+        user_chains = self.user_transitions.get(user_id, {})
+        sources.append((user_chains.get(previous), self.user_weight))
+
+        for counter, weight in sources:
+            if counter is None or not counter.total:
+                continue
+            for model_id, count in counter.top(k):
+                scores[model_id] += weight * count / counter.total
+
+        # Fill remaining slots with popular models
+        if len(scores) < k and self.popularity.total:
+            for model_id, count in self.popularity.top(k):
+                scores[model_id] += 0.1 * count / self.popularity.total
+
+        return heapq.nlargest(k, scores, key=scores.get)
+
     def update_cache(self, available_gpu_memory: float):
         """Update cached models based on predictions and available GPU memory."""
-        scores = defaultdict(float)
-        
-        # Score all models based on usage patterns
-        for model_id in self.model_usage_count:
-            scores[model_id] = self.model_usage_count[model_id] / \
-                             max(1, time.time() - self.last_used[model_id])
-                             
-        # Sort by score
-        sorted_models = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Update cache with top models that fit in memory
-        new_cache = set()
-        remaining_memory = available_gpu_memory
-        
-        for model_id, _ in sorted_models:
-            if remaining_memory > 0:
-                new_cache.add(model_id)
-                # Assume each model takes ~2GB (can be made more precise)
-                remaining_memory -= 2
-            else:
-                break
-                
-        return new_cache
+        # Assume each model takes ~2GB (can be made more precise)
+        slots = max(0, math.ceil(available_gpu_memory / 2))
+        return {model_id for model_id, _ in self.popularity.top(slots)}
 
     def should_cache_model(self, model_id: str) -> bool:
         """Determine if a model should be cached based on usage patterns."""
         if len(self.cached_models) < self.cache_size:
             return True
-            
+
         # Get least used cached model
-        least_used = min(
-            self.cached_models,
-            key=lambda m: self.model_usage_count[m]
-        )
-        
-        return self.model_usage_count[model_id] > self.model_usage_count[least_used]
\ No newline at end of file
+        weights = self.popularity.weights
+        least_used = min(self.cached_models, key=lambda m: weights.get(m, 0.0))
+
+        return weights.get(model_id, 0.0) > weights.get(least_used, 0.0)
+
+    def _weight_at(self, now: float) -> float:
+        """Forward-decayed weight of one usage at time `now`."""
+        if self._epoch is None:
+            # Anchor at the first usage so replayed logs start at weight 1
+            self._epoch = now
+        exponent = self.decay_rate * (now - self._epoch)
+        if exponent > MAX_EXPONENT:
+            self._rebase(now)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, now: float):
+        """Move the decay epoch to `now`, rescaling every stored weight."""
+        factor = math.exp(-self.decay_rate * (now - self._epoch))
+        self._epoch = now
+        counters = [self.popularity, *self.transitions.values()]
+        for chains in self.user_transitions.values():
+            counters.extend(chains.values())
+        for counter in counters:
+            counter.scale(factor)
+        logging.debug(f"Rebased usage weights for {len(counters)} counters")
+
+def evaluate_predictor(
+    events: Iterable[Tuple[float, str, str]],
+    k: int = 3,
+    predictor: Optional[ModelPredictor] = None
+) -> Dict[str, Any]:
+    """Replay a usage log and measure how often prefetching would have hit.
+
+    Before each request the user's current prediction is taken as the
+    prefetched set; the request hits when its model is in that set.
+
+    Args:
+        events: (timestamp, user_id, model_id) tuples in time order
+        k: Models prefetched per prediction
+        predictor: Predictor to evaluate; a default one when omitted
+
+    Returns:
+        Hit rate, request counts and average update and predict cost
+    """
+    predictor = predictor or ModelPredictor()
+    requests = hits = predicted = 0
+    predict_time = update_time = 0.0
+
+    for timestamp, user_id, model_id in events:
+        start = time.perf_counter()
+        prefetched = predictor.predict_next_models(user_id, k)
+        predict_time += time.perf_counter() - start
+
+        requests += 1
+        if prefetched:
+            predicted += 1
+            hits += model_id in prefetched
+
+        start = time.perf_counter()
+        predictor.record_usage(user_id, model_id, timestamp)
+        update_time += time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'predicted': predicted,
+        'hits': hits,
+        'hit_rate': hits / requests if requests else 0.0,
+        'hit_rate_when_predicted': hits / predicted if predicted else 0.0,
+        'predict_us_avg': predict_time / requests * 1e6 if requests else 0.0,
+        'update_us_avg': update_time / requests * 1e6 if requests else 0.0
+    }
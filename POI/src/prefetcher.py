@@ -0,0 +1,171 @@
+"""Background prefetching of predicted models into the model cache."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from .tiered_model_cache import TieredModelCache
+
+class ModelPrefetcher:
+    def __init__(
+        self,
+        model_cache: TieredModelCache,
+        size_hint: Callable[[str], Optional[int]],
+        max_queue: int = 8,
+        memory_budget: int = 2 * 1024**3,
+        unused_ttl: float = 300.0
+    ):
+        """Initialize the prefetcher.
+
+        Predicted models are loaded by one background thread so a cold load
+        never delays the request that triggered the prediction. Prefetched
+        models that have not been requested yet count against the memory
+        budget until they are used, evicted or older than unused_ttl.
+
+        Args:
+            model_cache: Cache whose top tier models are promoted into
+            size_hint: Estimated bytes of a model, or None if unknown
+            max_queue: Pending prefetches; the oldest prediction is dropped when full
+            memory_budget: Bytes of prefetched but not yet used models
+            unused_ttl: Seconds after which an unused prefetch counts as wasted
+        """
+        self.model_cache = model_cache
+        self.size_hint = size_hint
+        self.max_queue = max_queue
+        self.memory_budget = memory_budget
+        self.unused_ttl = unused_ttl
+
+        self.pending: "OrderedDict[str, None]" = OrderedDict()
+        self.outstanding: Dict[str, tuple] = {}
+        self.outstanding_bytes = 0
+        self.loading: Optional[str] = None
+        self._loading_used = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.metrics = {
+            'requested': 0,
+            'dropped': 0,
+            'cancelled': 0,
+            'over_budget': 0,
+            'loaded': 0,
+            'failed': 0,
+            'used': 0,
+            'wasted': 0,
+            'late': 0
+        }
+
+    def request(self, model_ids: Iterable[str]):
+        """Queue predicted models that are not already in the top tier."""
+        with self._cond:
+            if self._stopped:
+                return
+            for model_id in model_ids:
+                if (model_id in self.pending or model_id == self.loading
+                        or model_id in self.outstanding
+                        or self.model_cache.in_top_tier(model_id)):
+                    continue
+                self.pending[model_id] = None
+                self.metrics['requested'] += 1
+                if len(self.pending) > self.max_queue:
+                    self.pending.popitem(last=False)
+                    self.metrics['dropped'] += 1
+            self._ensure_started()
+            self._cond.notify()
+
+    def cancel(self, model_id: Optional[str] = None):
+        """Drop a queued prefetch, or all of them; a load in progress still completes."""
+        with self._cond:
+            if model_id is None:
+                self.metrics['cancelled'] += len(self.pending)
+                self.pending.clear()
+            elif self.pending.pop(model_id, False) is None:
+                self.metrics['cancelled'] += 1
+
+    def note_use(self, model_id: str):
+        """Record that a request needs a model, crediting any prefetch of it."""
+        with self._cond:
+            if model_id in self.outstanding:
+                self._settle(model_id, 'used')
+            elif model_id == self.loading or model_id in self.pending:
+                # The request path loads it now; the prefetch arrived too late
+                self.metrics['late'] += 1
+                self.pending.pop(model_id, None)
+                self._loading_used = self._loading_used or model_id == self.loading
+            self._expire()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Cancel pending work and wait for the worker thread to exit."""
+        with self._cond:
+            self._stopped = True
+            self.pending.clear()
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._cond:
+            self._expire()
+            return {
+                **self.metrics,
+                'queue_depth': len(self.pending),
+                'outstanding': len(self.outstanding),
+                'outstanding_bytes': self.outstanding_bytes
+            }
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="model-prefetcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self.pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                model_id, _ = self.pending.popitem(last=False)
+                self._expire()
+                if self.model_cache.in_top_tier(model_id):
+                    continue
+
+                size = self.size_hint(model_id) or 0
+                if self.outstanding_bytes + size > self.memory_budget:
+                    self.metrics['over_budget'] += 1
+                    continue
+                self.loading = model_id
+                self._loading_used = False
+
+            try:
+                self.model_cache.get(model_id)
+                loaded = True
+            except Exception as e:
+                logging.error(f"Failed to prefetch model {model_id}: {e}")
+                loaded = False
+
+            with self._cond:
+                self.loading = None
+                if not loaded:
+                    self.metrics['failed'] += 1
+                    continue
+                self.metrics['loaded'] += 1
+                if self._loading_used:
+                    continue
+                self.outstanding[model_id] = (time.time(), size)
+                self.outstanding_bytes += size
+                logging.info(f"Prefetched model {model_id} to {self.model_cache.where(model_id)} cache")
+
+    def _expire(self):
+        """Count prefetches that were evicted or sat unused for too long as wasted."""
+        now = time.time()
+        for model_id, (loaded_at, _) in list(self.outstanding.items()):
+            if now - loaded_at > self.unused_ttl or not self.model_cache.in_top_tier(model_id):
+                self._settle(model_id, 'wasted')
+
+    def _settle(self, model_id: str, outcome: str):
+        _, size = self.outstanding.pop(model_id)
+        self.outstanding_bytes -= size
+        self.metrics[outcome] += 1
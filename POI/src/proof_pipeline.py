@@ -0,0 +1,265 @@
+"""Background pipeline committing Merkle roots over batches of execution proofs."""
+
+import asyncio
+import inspect
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from web3 import Web3
+
+@dataclass
+class ExecutionRecord:
+    handle: str
+    model_id: str
+    input_hash: bytes
+    output_hash: bytes
+    proof: bytes
+    queued_at: float
+    attempts: int = 0
+
+    @property
+    def leaf(self) -> bytes:
+        """Leaf hash, equal to keccak256(abi.encodePacked(modelId, inputHash, outputHash))."""
+        return bytes(Web3.solidity_keccak(
+            ['string', 'bytes32', 'bytes32'],
+            [self.model_id, self.input_hash, self.output_hash]
+        ))
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    """Hash two nodes in sorted order (OpenZeppelin MerkleProof compatible)."""
+    return bytes(Web3.keccak(a + b if a <= b else b + a))
+
+def build_merkle_tree(leaves: List[bytes]) -> List[List[bytes]]:
+    """Build all levels of a Merkle tree, leaves first and root last.
+
+    An unpaired node is promoted to the next level unchanged.
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        next_level = [
+            _hash_pair(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        levels.append(next_level)
+    return levels
+
+def get_inclusion_proof(levels: List[List[bytes]], index: int) -> List[bytes]:
+    """Get the sibling path for the leaf at index."""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+def verify_inclusion(leaf: bytes, proof: List[bytes], root: bytes) -> bool:
+    """Verify a leaf against a committed Merkle root."""
+    node = leaf
+    for sibling in proof:
+        node = _hash_pair(node, sibling)
+    return node == root
+
+CommitFn = Callable[[bytes, int], Union[str, Awaitable[str]]]
+DeadLetterFn = Callable[[List[ExecutionRecord], Exception], None]
+
+class ProofSubmissionPipeline:
+    def __init__(
+        self,
+        commit_root: CommitFn,
+        interval: float = 5.0,
+        max_batch_size: int = 4096,
+        max_receipts: int = 100000,
+        max_attempts: int = 5,
+        retry_backoff: float = 2.0,
+        max_retry_delay: float = 300.0,
+        dead_letter: Optional[DeadLetterFn] = None
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            commit_root: Callable committing (merkle_root, record_count) on chain and
+                returning the transaction hash. May be sync (run in the thread pool) or async.
+            interval: Seconds between commits
+            max_batch_size: Maximum records covered by a single root
+            max_receipts: Number of committed records whose inclusion proofs are retained
+            max_attempts: Commit attempts per record before it is dead-lettered
+            retry_backoff: Seconds before the first retry; doubles per failed attempt
+            max_retry_delay: Upper bound on the delay between retries
+            dead_letter: Called with records that exhausted their attempts and the
+                last error, e.g. to persist them for manual resubmission
+        """
+        self.commit_root = commit_root
+        self.interval = interval
+        self.max_batch_size = max_batch_size
+        self.max_receipts = max_receipts
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.dead_letter = dead_letter
+
+        # enqueue() is called from executor threads, so pending records are lock-protected
+        self._lock = threading.Lock()
+        self._pending: List[ExecutionRecord] = []
+        self._sequence = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+
+        self.records: Dict[str, ExecutionRecord] = {}
+        self.receipts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.batches_committed = 0
+        self.records_committed = 0
+        self.commit_failures = 0
+        self.records_failed = 0
+
+    def enqueue(
+        self,
+        model_id: str,
+        input_hash: bytes,
+        output_hash: bytes,
+        proof: bytes
+    ) -> str:
+        """Queue an execution record and return its provisional execution handle."""
+        seq = next(self._sequence)
+        handle = Web3.to_hex(Web3.keccak(
+            input_hash + output_hash + seq.to_bytes(8, 'big') + model_id.encode()
+        ))
+        record = ExecutionRecord(handle, model_id, input_hash, output_hash, proof, time.time())
+
+        with self._lock:
+            self._pending.append(record)
+            self.records[handle] = record
+        return handle
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def start(self):
+        """Start committing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._commit_loop())
+
+    async def stop(self):
+        """Stop the background task and commit anything still pending."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self.pending_count:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> Optional[Dict[str, Any]]:
+        """Commit one batch of pending records.
+
+        Returns:
+            Batch summary, or None if nothing was pending
+        """
+        with self._lock:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+
+        if not batch:
+            return None
+
+        levels = build_merkle_tree([record.leaf for record in batch])
+        root = levels[-1][0]
+
+        try:
+            tx_hash = await self._call_commit(root, len(batch))
+        except Exception as e:
+            self._handle_failure(batch, e)
+            raise
+
+        self._retry_at = 0.0
+        committed_at = time.time()
+        for index, record in enumerate(batch):
+            self.receipts[record.handle] = {
+                'status': 'committed',
+                'root': Web3.to_hex(root),
+                'txHash': tx_hash,
+                'leaf': Web3.to_hex(record.leaf),
+                'leafIndex': index,
+                'proof': [Web3.to_hex(node) for node in get_inclusion_proof(levels, index)],
+                'queueMs': int((committed_at - record.queued_at) * 1000)
+            }
+            self.records.pop(record.handle, None)
+
+        while len(self.receipts) > self.max_receipts:
+            self.receipts.popitem(last=False)
+
+        self.batches_committed += 1
+        self.records_committed += len(batch)
+        logging.info(f"Committed proof root {Web3.to_hex(root)} covering {len(batch)} executions")
+
+        return {'root': Web3.to_hex(root), 'txHash': tx_hash, 'count': len(batch)}
+
+    def get_status(self, handle: str) -> Optional[Dict[str, Any]]:
+        """Get commitment status and inclusion proof for an execution handle."""
+        if handle in self.receipts:
+            return self.receipts[handle]
+        if handle in self.records:
+            return {'status': 'pending'}
+        return None
+
+    def _handle_failure(self, batch: List[ExecutionRecord], error: Exception):
+        """Requeue a failed batch with backoff, dead-lettering records out of attempts."""
+        self.commit_failures += 1
+        retry, exhausted = [], []
+        for record in batch:
+            record.attempts += 1
+            (exhausted if record.attempts >= self.max_attempts else retry).append(record)
+
+        # Put retryable records back at the front so ordering is preserved
+        with self._lock:
+            self._pending = retry + self._pending
+        attempts = max(record.attempts for record in batch)
+        delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_retry_delay)
+        self._retry_at = time.monotonic() + delay
+
+        if not exhausted:
+            return
+        for record in exhausted:
+            self.records.pop(record.handle, None)
+            self.receipts[record.handle] = {
+                'status': 'failed',
+                'error': str(error),
+                'attempts': record.attempts
+            }
+        while len(self.receipts) > self.max_receipts:
+            self.receipts.popitem(last=False)
+        self.records_failed += len(exhausted)
+        logging.error(f"Dropping {len(exhausted)} executions after {self.max_attempts} failed commits: {error}")
+
+        if self.dead_letter:
+            try:
+                self.dead_letter(exhausted, error)
+            except Exception as e:
+                logging.error(f"Proof dead-letter handler failed: {e}")
+
+    async def _call_commit(self, root: bytes, count: int) -> str:
+        if inspect.iscoroutinefunction(self.commit_root):
+            return await self.commit_root(root, count)
+        return await asyncio.get_running_loop().run_in_executor(None, self.commit_root, root, count)
+
+    async def _commit_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if time.monotonic() < self._retry_at:
+                continue
+            try:
+                while self.pending_count:
+                    await self.flush()
+            except Exception as e:
+                logging.error(f"Proof batch commit failed: {e}")
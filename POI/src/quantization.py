@@ -0,0 +1,265 @@
+"""Int8 dynamically quantized serving tier for CPU inference."""
+
+import copy
+import io
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+INT8_SUFFIX = "@int8"
+
+# Largest relative output error each request quality tier accepts
+QUALITY_TIERS = {
+    "exact": 0.0,
+    "high": 0.01,
+    "standard": 0.05,
+    "economy": 0.1
+}
+
+QUANTIZABLE_MODULES = {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}
+
+@dataclass
+class VariantReport:
+    """Accuracy, latency and memory of an int8 variant relative to fp32."""
+    accepted: bool
+    max_abs_error: float
+    relative_error: float
+    top1_agreement: Optional[float]
+    fp32_latency_ms: float
+    int8_latency_ms: float
+    fp32_bytes: int
+    int8_bytes: int
+    calibration_samples: int
+    served: int = 0
+    built_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, float]:
+        report = asdict(self)
+        report['latency_delta_ms'] = self.int8_latency_ms - self.fp32_latency_ms
+        report['memory_delta_bytes'] = self.int8_bytes - self.fp32_bytes
+        return report
+
+def _serialized_size(model: torch.nn.Module) -> int:
+    """Size of a model's state dict; packed int8 weights are not plain tensors."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+def _timed_outputs(model: torch.nn.Module, inputs: List[torch.Tensor]):
+    start = time.perf_counter()
+    with torch.no_grad():
+        outputs = [model(x) for x in inputs]
+    latency_ms = (time.perf_counter() - start) * 1000 / max(len(inputs), 1)
+    return outputs, latency_ms
+
+class QuantizationManager:
+    def __init__(
+        self,
+        tolerance: float = 0.05,
+        calibration_samples: int = 16,
+        background: bool = True
+    ):
+        """Initialize the quantized tier.
+
+        Args:
+            tolerance: Largest relative error (max |int8 - fp32| / max |fp32|) on the
+                calibration set for a variant to be served at all
+            calibration_samples: Inputs collected per model before a variant is built
+            background: Build variants on a background thread so the request that
+                completes calibration is not held up; otherwise observe() builds inline
+        """
+        self.tolerance = tolerance
+        self.calibration_samples = calibration_samples
+        self.background = background
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quantize")
+        self._pending: Dict[str, Future] = {}
+        # Bumped by drop_variant so builds started before a drop are discarded
+        self._generations: Dict[str, int] = {}
+        self.variants: Dict[str, torch.nn.Module] = {}
+        self.reports: Dict[str, VariantReport] = {}
+        self.calibration: Dict[str, List[torch.Tensor]] = {}
+        self.failed: set = set()
+
+    def build_variant(
+        self,
+        model_id: str,
+        model: torch.nn.Module,
+        calibration_inputs: List[torch.Tensor],
+        generation: Optional[int] = None
+    ) -> VariantReport:
+        """Quantize a model and check it against fp32 outputs.
+
+        Args:
+            model_id: Model identifier
+            model: Full-precision model
+            calibration_inputs: Inputs used to compare int8 and fp32 outputs
+            generation: Model generation the build started at; the variant is
+                discarded if the model was dropped since
+
+        Returns:
+            Report for the variant; it is only served if accepted
+        """
+        fp32_model = copy.deepcopy(model).cpu().eval()
+        int8_model = torch.quantization.quantize_dynamic(
+            fp32_model, QUANTIZABLE_MODULES, dtype=torch.qint8
+        )
+        inputs = [x.detach().cpu() for x in calibration_inputs]
+
+        reference, fp32_latency = _timed_outputs(fp32_model, inputs)
+        quantized, int8_latency = _timed_outputs(int8_model, inputs)
+
+        max_abs_error = 0.0
+        max_reference = 0.0
+        agreements = []
+        for ref, out in zip(reference, quantized):
+            max_abs_error = max(max_abs_error, (ref - out).abs().max().item())
+            max_reference = max(max_reference, ref.abs().max().item())
+            if ref.dim() >= 2:
+                agreements.append((ref.argmax(dim=-1) == out.argmax(dim=-1)).float().mean().item())
+
+        relative_error = max_abs_error / max_reference if max_reference else max_abs_error
+        report = VariantReport(
+            accepted=relative_error <= self.tolerance,
+            max_abs_error=max_abs_error,
+            relative_error=relative_error,
+            top1_agreement=sum(agreements) / len(agreements) if agreements else None,
+            fp32_latency_ms=fp32_latency,
+            int8_latency_ms=int8_latency,
+            fp32_bytes=_serialized_size(fp32_model),
+            int8_bytes=_serialized_size(int8_model),
+            calibration_samples=len(inputs)
+        )
+
+        with self._lock:
+            if generation is not None and generation != self._generations.get(model_id, 0):
+                logging.info(f"Discarding int8 variant of {model_id} built from replaced weights")
+                return report
+            self.reports[model_id] = report
+            if report.accepted:
+                self.variants[model_id] = int8_model
+            else:
+                self.variants.pop(model_id, None)
+
+        logging.info(
+            f"Int8 variant of {model_id}: relative error {relative_error:.4f}, "
+            f"{'accepted' if report.accepted else 'rejected'}"
+        )
+        return report
+
+    def observe(
+        self,
+        model_id: str,
+        input_data: torch.Tensor,
+        load_model: Callable[[], torch.nn.Module]
+    ):
+        """Collect a served input for calibration, building the variant once enough are seen.
+
+        Args:
+            model_id: Model identifier
+            input_data: Input of a full-precision request
+            load_model: Returns the fp32 model; only called, on the build thread,
+                when the variant is built
+        """
+        with self._lock:
+            if model_id in self.reports or model_id in self.failed or model_id in self._pending:
+                return
+            samples = self.calibration.setdefault(model_id, [])
+            if len(samples) >= self.calibration_samples:
+                return
+            samples.append(input_data.detach().cpu().clone())
+            if len(samples) < self.calibration_samples:
+                return
+
+            generation = self._generations.get(model_id, 0)
+            future = self._executor.submit(self._build, model_id, load_model, samples, generation)
+            self._pending[model_id] = future
+
+        if not self.background:
+            future.result()
+
+    def _build(
+        self,
+        model_id: str,
+        load_model: Callable[[], torch.nn.Module],
+        samples: List[torch.Tensor],
+        generation: int
+    ):
+        """Build a calibrated variant off the request path."""
+        try:
+            self.build_variant(model_id, load_model(), samples, generation)
+        except Exception as e:
+            logging.error(f"Failed to quantize model {model_id}: {e}")
+            with self._lock:
+                if generation == self._generations.get(model_id, 0):
+                    self.failed.add(model_id)
+        finally:
+            with self._lock:
+                if generation == self._generations.get(model_id, 0):
+                    self.calibration.pop(model_id, None)
+                    self._pending.pop(model_id, None)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until variants currently being built are done."""
+        with self._lock:
+            futures = list(self._pending.values())
+        for future in futures:
+            future.exception(timeout)
+
+    def shutdown(self):
+        """Stop the build thread, abandoning queued builds."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def route(self, model_id: str, quality_tier: str = "exact") -> str:
+        """Get the serving ID for a request: the int8 variant when the tier allows it."""
+        if quality_tier not in QUALITY_TIERS:
+            raise ValueError(f"Unknown quality tier {quality_tier}")
+
+        report = self.reports.get(model_id)
+        if (
+            model_id in self.variants
+            and report is not None
+            and report.relative_error <= QUALITY_TIERS[quality_tier]
+        ):
+            return model_id + INT8_SUFFIX
+        return model_id
+
+    def is_variant(self, serving_id: str) -> bool:
+        return serving_id.endswith(INT8_SUFFIX)
+
+    def get_variant(self, serving_id: str) -> Optional[torch.nn.Module]:
+        """Get the int8 model behind a serving ID returned by route.
+
+        Returns None if the variant was dropped after routing; callers then
+        serve the full-precision model.
+        """
+        model_id = self.base_id(serving_id)
+        with self._lock:
+            model = self.variants.get(model_id)
+            if model is not None:
+                self.reports[model_id].served += 1
+        return model
+
+    def base_id(self, serving_id: str) -> str:
+        """Get the model ID behind a serving ID."""
+        return serving_id[:-len(INT8_SUFFIX)] if self.is_variant(serving_id) else serving_id
+
+    def drop_variant(self, model_id: str):
+        """Forget a model's variant, e.g. after its weights change."""
+        with self._lock:
+            self._generations[model_id] = self._generations.get(model_id, 0) + 1
+            self.variants.pop(model_id, None)
+            self.reports.pop(model_id, None)
+            self.calibration.pop(model_id, None)
+            self._pending.pop(model_id, None)
+            self.failed.discard(model_id)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get per-variant accuracy, latency and memory deltas."""
+        return {model_id: report.to_dict() for model_id, report in self.reports.items()}
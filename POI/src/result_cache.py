@@ -0,0 +1,196 @@
+"""Bounded cache of inference results with single-flight request coalescing."""
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import torch
+
+from .utils.tensor_hash import hash_tensor
+
+@dataclass
+class _Entry:
+    result: Dict[str, Any]
+    size: int
+    expires_at: float
+
+def tensor_digest(data: Any) -> str:
+    """Hash a tensor's dtype, shape and raw bytes."""
+    return hash_tensor(data).hex()
+
+def _result_size(result: Dict[str, Any]) -> int:
+    size = 0
+    for value in result.values():
+        if hasattr(value, "nbytes"):
+            size += value.nbytes
+        elif isinstance(value, (bytes, str)):
+            size += len(value)
+        else:
+            size += 64
+    return size
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float = 300.0
+    ):
+        """Initialize the result cache.
+
+        Args:
+            max_entries: Most results kept; least recently used are evicted first
+            max_bytes: Budget for the estimated size of stored results
+            ttl: Seconds a result may be served after it was computed
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self.bytes_used = 0
+        self.metrics = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'evictions': 0,
+            'expired': 0
+        }
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Get a stored result if it has not expired."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+            self.metrics['hits'] += 1
+            return dict(entry.result)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Get a result, computing it at most once across concurrent callers.
+
+        Returns:
+            Tuple of (result, served_from_cache)
+        """
+        cached, future, owner = self._claim(key)
+        if cached is not None:
+            return cached, True
+        if not owner:
+            return dict(future.result()), True
+
+        try:
+            result = compute()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._complete(key, future, result)
+        return result, False
+
+    async def get_or_compute_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Async form of get_or_compute; waiters do not block the event loop."""
+        cached, future, owner = self._claim(key)
+        if cached is not None:
+            return cached, True
+        if not owner:
+            return dict(await asyncio.wrap_future(future)), True
+
+        try:
+            result = await compute()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        self._complete(key, future, result)
+        return result, False
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        """Drop every stored result whose key matches."""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._remove(key)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.metrics['hits'] + self.metrics['misses']
+            return {
+                **self.metrics,
+                'entries': len(self._entries),
+                'bytes_used': self.bytes_used,
+                'hit_rate': self.metrics['hits'] / lookups if lookups else 0.0
+            }
+
+    def _claim(self, key: Hashable) -> Tuple[Optional[Dict[str, Any]], Optional[Future], bool]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.metrics['hits'] += 1
+                return dict(entry.result), None, False
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.metrics['coalesced'] += 1
+                return None, future, False
+
+            self.metrics['misses'] += 1
+            future = Future()
+            self._inflight[key] = future
+            return None, future, True
+
+    def _complete(self, key: Hashable, future: Future, result: Dict[str, Any]):
+        # Callers share the stored arrays, so freeze them against mutation
+        output = result.get('output')
+        if hasattr(output, "setflags"):
+            output.setflags(write=False)
+
+        size = _result_size(result)
+        with self._lock:
+            self._inflight.pop(key, None)
+            if size <= self.max_bytes:
+                self._remove(key)
+                self._entries[key] = _Entry(dict(result), size, time.time() + self.ttl)
+                self.bytes_used += size
+                self._evict()
+        future.set_result(result)
+
+    def _fail(self, key: Hashable, future: Future, error: BaseException):
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_exception(error)
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.time():
+            self._remove(key)
+            self.metrics['expired'] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= entry.size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.bytes_used > self.max_bytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self.bytes_used -= entry.size
+            self.metrics['evictions'] += 1
@@ -0,0 +1,259 @@
+"""Incremental feed of task assignments from coordinator events."""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from web3 import Web3
+
+class TaskFeed:
+    def __init__(
+        self,
+        web3: Web3,
+        event: Any,
+        node_address: str,
+        cursor_path: str = "./task_cursor.json",
+        poll_interval: Optional[float] = 5.0,
+        subscription: Optional[Callable[[], AsyncIterator[Any]]] = None,
+        initial_lookback: int = 100,
+        confirmations: int = 0,
+        min_chunk: int = 10,
+        max_chunk: int = 5000,
+        target_events_per_chunk: int = 500,
+        dedupe_capacity: int = 100000,
+        queue_size: int = 10000
+    ):
+        """Initialize the task feed.
+
+        Args:
+            web3: Web3 instance
+            event: Contract event to read, e.g. contract.events.TaskAssigned
+            node_address: Only assignments listing this node are delivered
+            cursor_path: File persisting the last block whose assignments were all
+                scanned and delivered
+            poll_interval: Seconds between log polls; None disables polling
+            subscription: Returns an async iterator of pushed events (e.g. a websocket
+                log subscription); polling resumes if it ends or fails
+            initial_lookback: Blocks scanned on first start without a saved cursor
+            confirmations: Blocks behind the head to stay, to avoid reorged logs
+            min_chunk: Smallest block range per get_logs call
+            max_chunk: Largest block range per get_logs call
+            target_events_per_chunk: Ranges grow while they return fewer events than this
+            dedupe_capacity: Task IDs remembered for deduplication
+            queue_size: Maximum undelivered assignments
+        """
+        self.web3 = web3
+        self.event = event
+        self.node_address = node_address
+        self.cursor_path = Path(cursor_path)
+        self.poll_interval = poll_interval
+        self.subscription = subscription
+        self.initial_lookback = initial_lookback
+        self.confirmations = confirmations
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.target_events_per_chunk = target_events_per_chunk
+        self.dedupe_capacity = dedupe_capacity
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Polling scans from `scanned`; the persisted cursor trails it until
+        # every assignment queued from the blocks up to it has been delivered
+        self.cursor: Optional[int] = None
+        self.scanned: Optional[int] = None
+        self.pushed_block: Optional[int] = None
+        self._undelivered: Dict[int, int] = {}
+        self.chunk_size = min_chunk
+        self._seen: "OrderedDict[Any, None]" = OrderedDict()
+        self._poll_task: Optional[asyncio.Task] = None
+        self._subscription_task: Optional[asyncio.Task] = None
+        self.metrics = {
+            'events_seen': 0,
+            'assignments': 0,
+            'duplicates': 0,
+            'get_logs_calls': 0,
+            'chunk_splits': 0
+        }
+
+    async def start(self):
+        """Load the cursor and start polling and/or the subscription."""
+        self.cursor = self._load_cursor()
+        if self.cursor is None:
+            head = await self._run(lambda: self.web3.eth.block_number)
+            self.cursor = max(head - self.initial_lookback, -1)
+        self.scanned = self.cursor
+
+        if self.subscription:
+            self._subscription_task = asyncio.create_task(self._consume_subscription())
+        if self.poll_interval is not None:
+            self._start_polling()
+
+    async def stop(self):
+        """Stop background work and persist the cursor."""
+        for task in (self._poll_task, self._subscription_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._poll_task = self._subscription_task = None
+        self._save_cursor()
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for the next new assignment for this node."""
+        assignment = await self.queue.get()
+        block_number = assignment['block_number']
+        if block_number in self._undelivered:
+            self._undelivered[block_number] -= 1
+            if not self._undelivered[block_number]:
+                del self._undelivered[block_number]
+            self._advance_cursor()
+        return assignment
+
+    async def poll_once(self) -> int:
+        """Scan blocks after the last scanned one up to the confirmed head.
+
+        Returns:
+            Number of new assignments queued
+        """
+        head = await self._run(lambda: self.web3.eth.block_number) - self.confirmations
+        queued = 0
+
+        while self.scanned < head:
+            from_block = self.scanned + 1
+            to_block = min(from_block + self.chunk_size - 1, head)
+            try:
+                self.metrics['get_logs_calls'] += 1
+                events = await self._run(
+                    lambda: self.event.get_logs(fromBlock=from_block, toBlock=to_block)
+                )
+            except Exception as e:
+                # Providers cap result counts and ranges; retry with a smaller range
+                if self.chunk_size <= self.min_chunk:
+                    raise
+                self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+                self.metrics['chunk_splits'] += 1
+                logging.warning(f"get_logs {from_block}-{to_block} failed, shrinking range: {e}")
+                continue
+
+            for event in events:
+                queued += await self._handle_event(event)
+
+            self.scanned = to_block
+            self._advance_cursor()
+
+            if len(events) < self.target_events_per_chunk:
+                self.chunk_size = min(self.max_chunk, self.chunk_size * 2)
+
+        return queued
+
+    async def push(self, event: Any) -> bool:
+        """Feed one event from an external source; returns whether it was a new assignment.
+
+        While polling runs, pushed events never move the cursor: blocks
+        between it and the event may not have been scanned, so polling still
+        covers them and the dedupe set drops the repeats. Without polling the
+        pushed stream is the only source, so blocks before the event count as
+        scanned and the cursor follows them once their assignments are delivered.
+        """
+        queued = await self._handle_event(event)
+        block_number = event.get('blockNumber')
+        if block_number is not None and (self.pushed_block is None or block_number > self.pushed_block):
+            self.pushed_block = block_number
+            if self.poll_interval is None and self._poll_task is None and self.scanned is not None:
+                # Later events may still arrive for this block
+                self.scanned = max(self.scanned, block_number - 1)
+                self._advance_cursor()
+        return bool(queued)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            'cursor': self.cursor,
+            'scanned': self.scanned,
+            'pushed_block': self.pushed_block,
+            'chunk_size': self.chunk_size,
+            'queue_depth': self.queue.qsize()
+        }
+
+    async def _handle_event(self, event: Any) -> int:
+        self.metrics['events_seen'] += 1
+        args = event['args']
+        task_id = args['taskId']
+
+        if self.node_address not in args['nodes']:
+            return 0
+        if task_id in self._seen:
+            self.metrics['duplicates'] += 1
+            return 0
+
+        self._seen[task_id] = None
+        if len(self._seen) > self.dedupe_capacity:
+            self._seen.popitem(last=False)
+
+        block_number = event.get('blockNumber')
+        if block_number is not None:
+            self._undelivered[block_number] = self._undelivered.get(block_number, 0) + 1
+        await self.queue.put({
+            'task_id': task_id,
+            'nodes': args['nodes'],
+            'block_number': block_number
+        })
+        self.metrics['assignments'] += 1
+        return 1
+
+    def _advance_cursor(self):
+        """Persist the highest block up to which everything was scanned and delivered."""
+        if self.scanned is None:
+            return
+        cursor = self.scanned
+        if self._undelivered:
+            cursor = min(cursor, min(self._undelivered) - 1)
+        if self.cursor is None or cursor > self.cursor:
+            self.cursor = cursor
+            self._save_cursor()
+
+    def _start_polling(self):
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logging.error(f"Task feed poll failed: {e}")
+            await asyncio.sleep(self.poll_interval or 5.0)
+
+    async def _consume_subscription(self):
+        try:
+            async for event in self.subscription():
+                await self.push(event)
+            logging.warning("Task subscription ended, falling back to polling")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Task subscription failed, falling back to polling: {e}")
+        self._start_polling()
+
+    async def _run(self, fn: Callable[[], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn)
+
+    def _load_cursor(self) -> Optional[int]:
+        try:
+            with open(self.cursor_path) as f:
+                return json.load(f)['block']
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError) as e:
+            logging.error(f"Ignoring unreadable task cursor {self.cursor_path}: {e}")
+            return None
+
+    def _save_cursor(self):
+        if self.cursor is None:
+            return
+        tmp_path = self.cursor_path.with_suffix(self.cursor_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({'block': self.cursor}, f)
+        tmp_path.replace(self.cursor_path)
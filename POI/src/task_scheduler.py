@@ -0,0 +1,242 @@
+"""Admission control and earliest-deadline-first scheduling of edge tasks."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+PAID = "paid"
+FREE = "free"
+
+@dataclass(order=True)
+class _QueuedTask:
+    deadline: float
+    seq: int
+    task_id: Any = field(compare=False)
+    payload: Any = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+class _TierStats:
+    def __init__(self, window: int):
+        self.waits_ms: Deque[float] = deque(maxlen=window)
+        self.service_ms: Deque[float] = deque(maxlen=window)
+        self.admitted = 0
+        self.completed = 0
+        self.shed_full = 0
+        self.shed_deadline = 0
+        self.expired = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        waits = sorted(self.waits_ms)
+        return {
+            'admitted': self.admitted,
+            'completed': self.completed,
+            'shed_full': self.shed_full,
+            'shed_deadline': self.shed_deadline,
+            'expired': self.expired,
+            'wait_ms_avg': sum(waits) / len(waits) if waits else 0.0,
+            'wait_ms_p95': waits[int(len(waits) * 0.95)] if waits else 0.0,
+            'service_ms_avg': sum(self.service_ms) / len(self.service_ms) if self.service_ms else 0.0
+        }
+
+class TaskScheduler:
+    def __init__(
+        self,
+        run_task: Callable[[Any, Any], Awaitable[Any]],
+        max_concurrency: int = 4,
+        free_concurrency: Optional[int] = None,
+        max_paid_queue: int = 100,
+        max_free_queue: int = 50,
+        default_deadline: float = 300.0,
+        metrics_window: int = 1000
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            run_task: Coroutine function called with (task_id, payload)
+            max_concurrency: Tasks running at once
+            free_concurrency: Slots free-tier tasks may occupy; defaults to a quarter
+                of max_concurrency so paid work always has room
+            max_paid_queue: Paid tasks waiting before new ones are refused
+            max_free_queue: Free-tier tasks waiting before new ones are refused
+            default_deadline: Seconds from submission used when a task has no deadline
+            metrics_window: Recent samples kept for wait and service time statistics
+        """
+        self.run_task = run_task
+        self.max_concurrency = max_concurrency
+        self.free_concurrency = free_concurrency or max(1, max_concurrency // 4)
+        self.max_queue = {PAID: max_paid_queue, FREE: max_free_queue}
+        self.default_deadline = default_deadline
+
+        self.queues: Dict[str, List[_QueuedTask]] = {PAID: [], FREE: []}
+        self.running: Dict[Any, asyncio.Task] = {}
+        self._running_free = 0
+        self._queued_ids = set()
+        self._seq = itertools.count()
+        self.stats = {PAID: _TierStats(metrics_window), FREE: _TierStats(metrics_window)}
+        self._registered = False
+
+    def is_known(self, task_id: Any) -> bool:
+        """Check whether a task is queued or running."""
+        return task_id in self._queued_ids or task_id in self.running
+
+    def submit(
+        self,
+        task_id: Any,
+        payload: Any = None,
+        free: bool = False,
+        deadline: Optional[float] = None
+    ) -> bool:
+        """Admit a task, or refuse it if it cannot be served in time.
+
+        Args:
+            task_id: Task identifier
+            payload: Passed to run_task
+            free: Whether the task belongs to the free tier
+            deadline: Unix time the task must finish by
+
+        Returns:
+            True if the task was queued or started, False if it was shed
+        """
+        tier = FREE if free else PAID
+        stats = self.stats[tier]
+        now = time.time()
+        deadline = deadline or now + self.default_deadline
+
+        if len(self.queues[tier]) >= self.max_queue[tier]:
+            stats.shed_full += 1
+            logging.warning(f"Shedding {tier} task {task_id}: queue full")
+            return False
+
+        if now + self._estimated_wait(tier) > deadline:
+            stats.shed_deadline += 1
+            logging.warning(f"Shedding {tier} task {task_id}: deadline cannot be met")
+            return False
+
+        heapq.heappush(self.queues[tier], _QueuedTask(deadline, next(self._seq), task_id, payload, now))
+        self._queued_ids.add(task_id)
+        stats.admitted += 1
+        self._dispatch()
+        return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'running': len(self.running),
+            'running_free': self._running_free,
+            'queue_depth': {tier: len(queue) for tier, queue in self.queues.items()},
+            **{tier: stats.to_dict() for tier, stats in self.stats.items()}
+        }
+
+    def collect(self):
+        """Prometheus collector hook yielding queue gauges and per-tier counters."""
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        metrics = self.get_metrics()
+        queued = GaugeMetricFamily('scheduler_queue_depth', 'Tasks waiting to run', labels=['tier'])
+        running = GaugeMetricFamily('scheduler_running', 'Tasks running', labels=['tier'])
+        waits = GaugeMetricFamily(
+            'scheduler_wait_ms',
+            'Queue wait over the recent window in ms',
+            labels=['tier', 'stat']
+        )
+        service = GaugeMetricFamily(
+            'scheduler_service_ms_avg',
+            'Average task run time over the recent window in ms',
+            labels=['tier']
+        )
+        admitted = CounterMetricFamily('scheduler_admitted', 'Tasks admitted', labels=['tier'])
+        completed = CounterMetricFamily('scheduler_completed', 'Tasks finished', labels=['tier'])
+        shed = CounterMetricFamily('scheduler_shed', 'Tasks refused at submission', labels=['tier', 'reason'])
+        expired = CounterMetricFamily(
+            'scheduler_deadline_missed',
+            'Tasks dropped because their deadline passed while queued',
+            labels=['tier']
+        )
+
+        running_free = metrics['running_free']
+        for tier in (PAID, FREE):
+            tier_metrics = metrics[tier]
+            queued.add_metric([tier], metrics['queue_depth'][tier])
+            running.add_metric([tier], running_free if tier == FREE else metrics['running'] - running_free)
+            waits.add_metric([tier, 'avg'], tier_metrics['wait_ms_avg'])
+            waits.add_metric([tier, 'p95'], tier_metrics['wait_ms_p95'])
+            service.add_metric([tier], tier_metrics['service_ms_avg'])
+            admitted.add_metric([tier], tier_metrics['admitted'])
+            completed.add_metric([tier], tier_metrics['completed'])
+            shed.add_metric([tier, 'queue_full'], tier_metrics['shed_full'])
+            shed.add_metric([tier, 'deadline'], tier_metrics['shed_deadline'])
+            expired.add_metric([tier], tier_metrics['expired'])
+
+        yield from (queued, running, waits, service, admitted, completed, shed, expired)
+
+    def register_prometheus(self, registry: Any = None):
+        """Expose this scheduler through a Prometheus registry (the default one if not given)."""
+        if self._registered:
+            return
+        from prometheus_client import REGISTRY
+        (registry or REGISTRY).register(self)
+        self._registered = True
+
+    async def drain(self):
+        """Wait for every queued and running task to finish."""
+        while self.running or any(self.queues.values()):
+            await asyncio.gather(*self.running.values(), return_exceptions=True)
+
+    def _estimated_wait(self, tier: str) -> float:
+        """Rough seconds until a new task in this tier would start."""
+        service_ms = self.stats[tier].service_ms or self.stats[PAID].service_ms or self.stats[FREE].service_ms
+        if not service_ms:
+            return 0.0
+        avg_service = sum(service_ms) / len(service_ms) / 1000
+        slots = self.free_concurrency if tier == FREE else self.max_concurrency
+        ahead = len(self.queues[tier]) + (len(self.queues[PAID]) if tier == FREE else 0)
+        backlog = max(0, len(self.running) + ahead - slots + 1)
+        return backlog * avg_service / slots + avg_service
+
+    def _dispatch(self):
+        while len(self.running) < self.max_concurrency:
+            entry, tier = self._next_task()
+            if entry is None:
+                return
+
+            self._queued_ids.discard(entry.task_id)
+            stats = self.stats[tier]
+            now = time.time()
+            if now > entry.deadline:
+                stats.expired += 1
+                logging.warning(f"Dropping {tier} task {entry.task_id}: deadline passed while queued")
+                continue
+
+            stats.waits_ms.append((now - entry.enqueued_at) * 1000)
+            if tier == FREE:
+                self._running_free += 1
+            self.running[entry.task_id] = asyncio.create_task(self._run(entry, tier))
+
+    def _next_task(self):
+        """Pop the earliest-deadline paid task, or a free task if a free slot is open."""
+        paid, free = self.queues[PAID], self.queues[FREE]
+        free_allowed = free and self._running_free < self.free_concurrency
+        if paid and (not free_allowed or paid[0].deadline <= free[0].deadline):
+            return heapq.heappop(paid), PAID
+        if free_allowed:
+            return heapq.heappop(free), FREE
+        return None, None
+
+    async def _run(self, entry: _QueuedTask, tier: str):
+        start = time.time()
+        try:
+            await self.run_task(entry.task_id, entry.payload)
+        except Exception as e:
+            logging.error(f"Task {entry.task_id} failed: {e}")
+        finally:
+            stats = self.stats[tier]
+            stats.service_ms.append((time.time() - start) * 1000)
+            stats.completed += 1
+            if tier == FREE:
+                self._running_free -= 1
+            self.running.pop(entry.task_id, None)
+            self._dispatch()
@@ -0,0 +1,99 @@
+"""
+Tests for dynamic micro-batching
+"""
+import asyncio
+import threading
+
+import pytest
+import torch
+
+from ..inference_batcher import InferenceBatcher
+
+class RecordingModel:
+    """Doubles its input and records the rows of every batch it runs"""
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model_id, batch):
+        with self.lock:
+            self.batches.append(batch.shape[0])
+        return batch * 2
+
+def test_outputs_split_per_request():
+    """Concurrent requests share a forward pass and each gets its own rows back"""
+    async def run():
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=8, max_wait_ms=50)
+        inputs = [torch.full((rows, 3), float(i)) for i, rows in enumerate([1, 2, 1])]
+
+        outputs = await asyncio.gather(*[batcher.submit("m", x) for x in inputs])
+        await batcher.close()
+
+        assert model.batches == [4]
+        for x, out in zip(inputs, outputs):
+            assert torch.equal(out, x * 2)
+        assert batcher.get_metrics("m")["m"]["requests"] == 3
+
+    asyncio.run(run())
+
+def test_batches_capped_at_max_size():
+    """No forward pass stacks more rows than max_batch_size"""
+    async def run():
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=4, max_wait_ms=50)
+
+        await asyncio.gather(*[batcher.submit("m", torch.ones(1, 3)) for _ in range(10)])
+        await batcher.close()
+
+        assert sum(model.batches) == 10
+        assert max(model.batches) <= 4
+        assert model.batches[:2] == [4, 4]
+
+    asyncio.run(run())
+
+def test_partial_batch_runs_after_max_wait():
+    """A lone request is not held longer than max_wait_ms"""
+    async def run():
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=32, max_wait_ms=20)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await batcher.submit("m", torch.ones(1, 3))
+        elapsed = loop.time() - start
+        await batcher.close()
+
+        assert model.batches == [1]
+        assert elapsed < 1.0
+
+    asyncio.run(run())
+
+def test_error_reaches_every_waiter():
+    """A failed forward pass fails every request in the batch, and the worker keeps serving"""
+    async def run():
+        calls = []
+
+        def run_batch(model_id, batch):
+            calls.append(batch.shape[0])
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return batch
+
+        batcher = InferenceBatcher(run_batch, max_batch_size=8, max_wait_ms=50)
+        results = await asyncio.gather(
+            *[batcher.submit("m", torch.ones(1, 3)) for _ in range(3)],
+            return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        assert torch.equal(await batcher.submit("m", torch.ones(1, 3)), torch.ones(1, 3))
+        await batcher.close()
+
+    asyncio.run(run())
+
+def test_rejects_empty_batch_size():
+    """max_batch_size must allow at least one row"""
+    with pytest.raises(ValueError):
+        InferenceBatcher(lambda m, x: x, max_batch_size=0)
@@ -0,0 +1,85 @@
+"""
+Tests for serving models through the CPU worker pool
+"""
+import pytest
+import torch
+
+from ..inference_node import InferenceNode
+from ..utils.latency import LatencyRecorder
+from ..utils.merkle_utils import WeightVerificationError, compute_model_merkle_root, parameter_proofs
+from ..utils.weight_format import read_header, save_weights
+
+class FakePool:
+    def __init__(self):
+        self.started = {}
+
+    def has_model(self, model_id):
+        return model_id in self.started
+
+    def start_model(self, model_id, source):
+        self.started[model_id] = source
+
+    def run(self, model_id, input_data):
+        return input_data * 2
+
+def make_model():
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.Linear(4, 2))
+
+def make_node(tmp_path):
+    """A node with only the state the worker path reads"""
+    node = InferenceNode.__new__(InferenceNode)
+    node.models_dir = str(tmp_path)
+    node.worker_pool = FakePool()
+    node.latency = LatencyRecorder()
+    node.verify_weights = True
+    node.trusted_roots = {}
+    node.model_roots = {}
+    return node
+
+def save_model(tmp_path, model_id, model):
+    path = tmp_path / model_id / "model.joyw"
+    path.parent.mkdir()
+    save_weights(model, path, metadata={"merkle": parameter_proofs(model)})
+    return path
+
+def test_workers_start_on_verified_weights(tmp_path):
+    """Weight files are checked before workers map them, and loading is timed separately"""
+    node = make_node(tmp_path)
+    model = make_model()
+    path = save_model(tmp_path, "m", model)
+    trace = {}
+
+    output = node._forward_on_workers("m", torch.ones(1, 4), trace)
+
+    assert torch.equal(output, torch.full((1, 4), 2.0))
+    assert node.worker_pool.started["m"] == path
+    assert node.model_roots["m"] == compute_model_merkle_root(model)
+    assert set(trace) == {'load', 'forward'}
+    assert set(node.latency.snapshot("m")["m"]) == {'load', 'forward'}
+
+def test_tampered_weights_never_reach_workers(tmp_path):
+    """A weight file that fails its Merkle proofs is rejected before any worker starts"""
+    node = make_node(tmp_path)
+    path = save_model(tmp_path, "m", make_model())
+    header, blob_start = read_header(path)
+    data = bytearray(path.read_bytes())
+    data[blob_start + header["tensors"][0]["offset"]] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(WeightVerificationError):
+        node._forward_on_workers("m", torch.ones(1, 4))
+
+    assert not node.worker_pool.started
+    assert "m" not in node.model_roots
+
+def test_untrusted_root_is_rejected(tmp_path):
+    """Workers are not started when the file's root differs from the trusted one"""
+    node = make_node(tmp_path)
+    save_model(tmp_path, "m", make_model())
+    node.trusted_roots["m"] = "0" * 64
+
+    with pytest.raises(WeightVerificationError):
+        node._forward_on_workers("m", torch.ones(1, 4))
+
+    assert not node.worker_pool.started
@@ -0,0 +1,112 @@
+"""
+Tests for geospatial node selection
+"""
+import numpy as np
+import pytest
+
+from ..location_manager import LocationManager, haversine_km
+
+def random_points(rng, count):
+    # Uniform on the sphere, so polar cells are exercised as much as equatorial ones
+    latitudes = np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+    longitudes = rng.uniform(-180, 180, count)
+    return latitudes, longitudes
+
+def populate(manager, rng, count, loaded=True):
+    latitudes, longitudes = random_points(rng, count)
+    for i, (lat, lon) in enumerate(zip(latitudes, longitudes)):
+        manager.add_node(f"n{i}", float(lat), float(lon), gpu_capacity=int(rng.integers(1, 5)))
+        if loaded:
+            manager.update_node_load(f"n{i}", int(rng.integers(0, 4)))
+
+def brute_force(manager, latitude, longitude, k):
+    nodes = list(manager.nodes.values())
+    distances = haversine_km(
+        latitude, longitude,
+        [n.latitude for n in nodes], [n.longitude for n in nodes]
+    )
+    scores = [d * (1 + n.current_load / max(1, n.gpu_capacity)) for d, n in zip(distances, nodes)]
+    return [nodes[i].node_id for i in np.argsort(scores)[:k]]
+
+def test_haversine_known_distances():
+    """Quarter and half circumferences come out exactly"""
+    assert haversine_km(0, 0, 0, 90) == pytest.approx(6371.0 * np.pi / 2)
+    assert haversine_km(90, 0, -90, 0) == pytest.approx(6371.0 * np.pi)
+    assert haversine_km(10, 179.5, 10, -179.5) == pytest.approx(haversine_km(10, 0, 10, 1))
+
+@pytest.mark.parametrize("node_count", [5, 300, 3000])
+def test_nearest_nodes_match_brute_force(node_count):
+    """Ring search returns the same nodes as scoring every node"""
+    rng = np.random.default_rng(node_count)
+    manager = LocationManager(initial_capacity=16)
+    populate(manager, rng, node_count)
+
+    queries = list(zip(*random_points(rng, 50)))
+    queries += [(89.9, 10.0), (-89.9, -170.0), (0.0, 179.99), (45.0, -179.99)]
+    for lat, lon in queries:
+        assert manager.find_nearest_nodes(lat, lon, k=5) == brute_force(manager, lat, lon, 5)
+
+def test_moved_and_removed_nodes_are_reindexed():
+    """Moving or removing nodes updates the index used for searches"""
+    rng = np.random.default_rng(1)
+    manager = LocationManager(shard_size_km=50.0)
+    populate(manager, rng, 500, loaded=False)
+
+    manager.add_node("n0", 51.5, -0.1)
+    for i in range(1, 100):
+        manager.remove_node(f"n{i}")
+
+    assert manager.find_nearest_nodes(51.5, -0.1, k=1) == ["n0"]
+    for lat, lon in zip(*random_points(rng, 20)):
+        assert manager.find_nearest_nodes(lat, lon, k=3) == brute_force(manager, lat, lon, 3)
+
+def test_empty_manager_and_large_k():
+    """Searches never ask for more nodes than are registered"""
+    manager = LocationManager()
+    assert manager.find_nearest_nodes(0.0, 0.0) == []
+
+    manager.add_node("only", 10.0, 10.0)
+    assert manager.find_nearest_nodes(-10.0, -170.0, k=3) == ["only"]
+
+def test_bulk_routing_matches_per_request_routing():
+    """Without added load each request goes to the node find_nearest_nodes picks"""
+    rng = np.random.default_rng(7)
+    manager = LocationManager()
+    populate(manager, rng, 2000)
+    latitudes, longitudes = random_points(rng, 500)
+    loads_before = manager.loads.copy()
+
+    routed = manager.route_batch(latitudes, longitudes, request_load=0.0, commit=False)
+
+    expected = [manager.find_nearest_nodes(lat, lon, k=1)[0] for lat, lon in zip(latitudes, longitudes)]
+    assert routed == expected
+    assert np.array_equal(manager.loads, loads_before)
+
+def test_bulk_routing_spreads_load_like_sequential_routing():
+    """A burst is assigned as if each request were routed and then added to its node's load"""
+    rng = np.random.default_rng(3)
+    manager = LocationManager()
+    populate(manager, rng, 2000, loaded=False)
+    # Tight enough to fall in one routing group, which is assigned in request order
+    burst_lats = 48.85 + rng.normal(0, 0.05, 40)
+    burst_lons = 2.35 + rng.normal(0, 0.05, 40)
+
+    sequential = LocationManager()
+    for node in manager.nodes.values():
+        sequential.add_node(node.node_id, node.latitude, node.longitude, node.gpu_capacity)
+    expected = []
+    for lat, lon in zip(burst_lats, burst_lons):
+        node_id = sequential.find_nearest_nodes(lat, lon, k=1)[0]
+        sequential.update_node_load(node_id, sequential.nodes[node_id].current_load + 1)
+        expected.append(node_id)
+
+    routed = manager.route_batch(burst_lats, burst_lons)
+
+    assert routed == expected
+    assert len(set(routed)) > 1
+    for node_id in set(routed):
+        assert manager.nodes[node_id].current_load == routed.count(node_id)
+
+def test_bulk_routing_without_nodes():
+    """Every request gets None when no nodes are registered"""
+    assert LocationManager().route_batch([0.0, 1.0], [0.0, 1.0]) == [None, None]
@@ -0,0 +1,228 @@
+"""
+Tests for model weight Merkle roots, proofs and verification
+"""
+import hashlib
+
+import pytest
+import torch
+
+from ..utils.merkle_utils import (
+    LayerVerifier,
+    ModelMerkleTree,
+    WeightVerificationError,
+    compute_file_merkle_root,
+    compute_model_merkle_root,
+    file_parameter_proofs,
+    parameter_proofs,
+    verify_parameter,
+    verify_weight_file
+)
+from ..utils.weight_format import convert_checkpoint, load_model, read_header, save_weights
+
+def make_model():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(
+        torch.nn.Linear(8, 8),
+        torch.nn.ReLU(),
+        torch.nn.Linear(8, 8),
+        torch.nn.Linear(8, 2)
+    )
+    # Frozen parameters are not leaves
+    model[0].bias.requires_grad_(False)
+    return model
+
+def reference_root(model):
+    """Root as earlier releases computed it, rehashing every parameter"""
+    level = [
+        hashlib.sha256(p.detach().cpu().numpy().tobytes()).hexdigest()
+        for p in model.parameters() if p.requires_grad
+    ]
+    while len(level) > 1:
+        level = [
+            hashlib.sha256((level[i] + level[min(i + 1, len(level) - 1)]).encode()).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+def test_root_matches_reference():
+    """Trees give the same root as hashing every trainable parameter from scratch"""
+    model = make_model()
+
+    assert ModelMerkleTree(model).root() == reference_root(model)
+    assert ModelMerkleTree(model, parallel=True).root() == reference_root(model)
+    assert compute_model_merkle_root(torch.nn.ReLU()) == hashlib.sha256(b"").hexdigest()
+
+def test_in_place_update_rehashes_only_changed_leaf():
+    """An in-place update moves the root to the fresh root, rehashing one leaf"""
+    model = make_model()
+    tree = ModelMerkleTree(model)
+    before = tree.root()
+
+    with torch.no_grad():
+        model[2].weight.add_(1.0)
+    after = tree.root()
+
+    assert after != before
+    assert after == ModelMerkleTree(model).root() == reference_root(model)
+    metrics = tree.get_metrics()
+    assert metrics['full_builds'] == 1
+    assert metrics['incremental_updates'] == 1
+    assert metrics['leaves_hashed'] == metrics['leaves'] + 1
+
+def test_unchanged_model_reuses_every_leaf():
+    """Repeated roots of an unchanged model hash nothing"""
+    model = make_model()
+    tree = ModelMerkleTree(model)
+    tree.root()
+    hashed = tree.get_metrics()['leaves_hashed']
+
+    tree.root()
+
+    assert tree.get_metrics()['leaves_hashed'] == hashed
+
+def test_replaced_parameter_rebuilds_leaf():
+    """Assigning a new parameter object is picked up without invalidation"""
+    model = make_model()
+    tree = ModelMerkleTree(model)
+    tree.root()
+
+    model[3].bias = torch.nn.Parameter(torch.ones(2))
+
+    assert tree.root() == reference_root(model)
+
+def test_invalidate_picks_up_untracked_writes():
+    """Writes through .data need invalidate() before the root reflects them"""
+    model = make_model()
+    tree = ModelMerkleTree(model)
+    tree.root()
+
+    model[3].weight.data.fill_(0.5)
+    tree.invalidate(["3.weight"])
+    assert tree.root() == reference_root(model)
+
+    model[2].bias.data.fill_(0.5)
+    tree.invalidate()
+    assert tree.root() == reference_root(model)
+
+def test_tree_does_not_keep_model_alive():
+    """Trees hold their model weakly"""
+    model = make_model()
+    tree = ModelMerkleTree(model)
+    del model
+
+    with pytest.raises(ReferenceError):
+        tree.root()
+
+def save_with_proofs(model, path):
+    save_weights(model, path, metadata={"merkle": parameter_proofs(model)})
+    return path
+
+def tensor_range(path, name):
+    """Byte range of a tensor within a weight file"""
+    header, blob_start = read_header(path)
+    entry = next(e for e in header["tensors"] if e["name"] == name)
+    start = blob_start + entry["offset"]
+    return start, start + entry["nbytes"]
+
+def test_verify_parameter_against_root():
+    """Each parameter verifies against the root; altered data or proofs do not"""
+    model = make_model()
+    proofs = parameter_proofs(model)
+    root = compute_model_merkle_root(model)
+
+    for name, param in model.named_parameters():
+        if param.requires_grad:
+            assert verify_parameter(param, proofs["parameters"][name], proofs["count"], root)
+
+    proof = proofs["parameters"]["2.weight"]
+    assert not verify_parameter(model[2].weight + 1, proof, proofs["count"], root)
+    assert not verify_parameter(model[2].weight, proof, proofs["count"], "0" * 64)
+    assert not verify_parameter(model[2].weight, {**proof, "index": proof["index"] - 1}, proofs["count"], root)
+    assert not verify_parameter(model[2].weight, {**proof, "siblings": proof["siblings"][:-1]}, proofs["count"], root)
+
+def test_layer_verifier_checks_loads(tmp_path):
+    """Models load through the verifier, which fails on a trusted root mismatch"""
+    model = make_model()
+    path = save_with_proofs(model, tmp_path / "model.joyw")
+    root = compute_model_merkle_root(model)
+
+    verifier = LayerVerifier(parameter_proofs(model), root)
+    loaded = load_model(path, make_model(), check=verifier)
+    verifier.finish()
+
+    assert verifier.pending() == []
+    assert compute_model_merkle_root(loaded) == root
+    with pytest.raises(WeightVerificationError):
+        LayerVerifier(parameter_proofs(model), "0" * 64)
+
+def test_layer_verifier_rejects_and_tracks_pending():
+    """Corrupted tensors raise, and unseen parameters stay pending"""
+    model = make_model()
+    verifier = LayerVerifier(parameter_proofs(model))
+
+    verifier("0.weight", model[0].weight)
+    with pytest.raises(WeightVerificationError):
+        verifier("2.weight", torch.zeros(8, 8))
+
+    assert "2.weight" in verifier.pending()
+    assert "0.weight" not in verifier.pending()
+    with pytest.raises(WeightVerificationError):
+        verifier.finish()
+
+def test_verify_weight_file_reports_corrupted_tensor(tmp_path):
+    """One flipped byte is reported for its tensor only"""
+    model = make_model()
+    path = save_with_proofs(model, tmp_path / "model.joyw")
+    start, _ = tensor_range(path, "2.weight")
+    data = bytearray(path.read_bytes())
+    data[start] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    result = verify_weight_file(path, compute_model_merkle_root(model))
+
+    assert result["corrupted"] == ["2.weight"]
+    assert result["pending"] == []
+    assert len(result["verified"]) == parameter_proofs(model)["count"] - 1
+
+def test_verify_weight_file_reports_pending_tensors(tmp_path):
+    """Tensors past the end of a partial download are pending, not corrupted"""
+    model = make_model()
+    path = save_with_proofs(model, tmp_path / "model.joyw")
+    start, _ = tensor_range(path, "3.weight")
+    with open(path, "r+b") as f:
+        f.truncate(start + 4)
+
+    result = verify_weight_file(path)
+
+    assert result["pending"] == ["3.weight", "3.bias"]
+    assert result["corrupted"] == []
+    assert "0.weight" in result["verified"]
+
+def test_file_root_matches_model_root(tmp_path):
+    """Roots and proofs streamed from a weight file match the model's"""
+    model = make_model()
+    path = tmp_path / "model.joyw"
+    save_weights(model, path)
+
+    assert compute_file_merkle_root(path) == compute_model_merkle_root(model)
+    assert compute_file_merkle_root(path, block_size=16) == compute_model_merkle_root(model)
+    assert file_parameter_proofs(path) == parameter_proofs(model)
+
+def test_converted_checkpoint_root_matches_model_root(tmp_path):
+    """Converted whole-module checkpoints hash to the model root without the model"""
+    model = make_model()
+    checkpoint = tmp_path / "model.pt"
+    torch.save(model, checkpoint)
+
+    assert compute_file_merkle_root(convert_checkpoint(checkpoint)) == compute_model_merkle_root(model)
+
+def test_state_dict_file_needs_parameter_names(tmp_path):
+    """Files without a parameter list need the trainable names passed in"""
+    model = make_model()
+    path = tmp_path / "state.joyw"
+    save_weights(model.state_dict(), path)
+    names = [name for name, p in model.named_parameters() if p.requires_grad]
+
+    with pytest.raises(ValueError):
+        compute_file_merkle_root(path)
+    assert compute_file_merkle_root(path, names) == compute_model_merkle_root(model)
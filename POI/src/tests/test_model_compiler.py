@@ -0,0 +1,89 @@
+"""
+Tests for the compiled model cache
+"""
+import copy
+
+import pytest
+import torch
+
+from ..model_compiler import CompiledModelCache
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.BatchNorm1d(8), torch.nn.Linear(8, 2))
+    model.eval()
+    return model
+
+def test_compiles_in_background(model, tmp_path):
+    """The eager model serves requests until the compiled artifact is ready"""
+    cache = CompiledModelCache(cache_dir=tmp_path)
+    x = torch.randn(4, 8)
+
+    assert cache.get("m", model, x) is model
+    # The single compile thread runs jobs in order, so this waits for the compile
+    cache._executor.submit(lambda: None).result()
+    compiled = cache.get("m", model, x)
+
+    assert compiled is not model
+    with torch.no_grad():
+        assert torch.allclose(compiled(x), model(x), atol=1e-6)
+    assert cache.get_metrics()["compiled"] == 1
+    cache.shutdown()
+
+def test_buffers_are_part_of_the_key(model, tmp_path):
+    """Models differing only in buffers never share a frozen artifact"""
+    cache = CompiledModelCache(cache_dir=tmp_path, background=False)
+    other = copy.deepcopy(model)
+    other[1].running_mean.fill_(3.0)
+    x = torch.randn(4, 8)
+
+    first = cache.get("a", model, x)
+    second = cache.get("b", other, x)
+
+    assert first is not second
+    with torch.no_grad():
+        assert torch.allclose(second(x), other(x), atol=1e-6)
+        assert not torch.allclose(second(x), model(x))
+    assert cache.get_metrics()["entries"] == 2
+    cache.shutdown()
+
+class Doubled(torch.nn.Linear):
+    def forward(self, x):
+        return super().forward(x) * 2
+
+def test_code_is_part_of_the_key(tmp_path):
+    """Modules with identical weights but different forwards never share an artifact"""
+    cache = CompiledModelCache(cache_dir=tmp_path, background=False)
+    torch.manual_seed(0)
+    plain = torch.nn.Linear(8, 2).eval()
+    doubled = Doubled(8, 2).eval()
+    doubled.load_state_dict(plain.state_dict())
+    x = torch.randn(4, 8)
+
+    cache.get("plain", plain, x)
+    compiled = cache.get("doubled", doubled, x)
+
+    with torch.no_grad():
+        assert torch.allclose(compiled(x), plain(x) * 2, atol=1e-6)
+    assert cache.get_metrics()["compiled"] == 2
+    cache.shutdown()
+
+def test_digest_cached_per_model_id(model, tmp_path, monkeypatch):
+    """Copies of a model under the same ID reuse its digests until invalidated"""
+    cache = CompiledModelCache(cache_dir=tmp_path, background=False)
+    x = torch.randn(4, 8)
+    cache.get("m", model, x)
+
+    calls = []
+    digest = CompiledModelCache._weights_digest
+    monkeypatch.setattr(CompiledModelCache, "_weights_digest", staticmethod(lambda m: calls.append(m) or digest(m)))
+
+    cache.get("m", copy.deepcopy(model), x)
+    assert calls == []
+
+    cache.invalidate("m")
+    cache.get("m", copy.deepcopy(model), x)
+    assert len(calls) == 1
+    assert cache.get_metrics()["compiled"] == 1
+    cache.shutdown()
@@ -0,0 +1,70 @@
+"""
+Tests for the model usage predictor
+"""
+import math
+
+import pytest
+
+from ..model_predictor import MAX_EXPONENT, ModelPredictor, evaluate_predictor
+
+def test_usage_weight_doubles_each_half_life():
+    """A usage one half-life later counts twice as much as an earlier one"""
+    predictor = ModelPredictor(half_life=10.0)
+    predictor.record_usage("u", "old", timestamp=0.0)
+    predictor.record_usage("u", "new", timestamp=10.0)
+
+    weights = predictor.popularity.weights
+    assert weights["new"] / weights["old"] == pytest.approx(2.0)
+
+def test_recent_usage_outranks_stale_usage():
+    """Fewer recent requests beat more requests that have decayed"""
+    predictor = ModelPredictor(half_life=10.0)
+    for _ in range(3):
+        predictor.record_usage("u", "stale", timestamp=0.0)
+    for _ in range(2):
+        predictor.record_usage("v", "fresh", timestamp=20.0)
+
+    assert predictor.predict_next_models("new-user", k=2) == ["fresh", "stale"]
+
+def test_rebase_keeps_relative_weights():
+    """Rescaling the decay epoch keeps weights finite and their ratios intact"""
+    predictor = ModelPredictor(half_life=1.0)
+    predictor.record_usage("u", "a", timestamp=0.0)
+    predictor.record_usage("u", "b", timestamp=1.0)
+    later = 2 * MAX_EXPONENT / math.log(2)
+    predictor.record_usage("u", "c", timestamp=later)
+
+    weights = predictor.popularity.weights
+    assert all(math.isfinite(w) for w in weights.values())
+    assert weights["b"] / weights["a"] == pytest.approx(2.0)
+    assert weights["c"] == pytest.approx(1.0)
+    assert predictor.popularity.total == pytest.approx(sum(weights.values()))
+
+def test_next_models_ranked_by_transitions():
+    """After a fixed sequence the most frequent successors come first, then popular models"""
+    predictor = ModelPredictor()
+    for model_id in ["a", "b", "a", "b", "a", "c", "a"]:
+        predictor.record_usage("u", model_id, timestamp=0.0)
+
+    assert predictor.predict_next_models("u", k=3) == ["b", "c", "a"]
+
+def test_user_chain_outweighs_global_chain():
+    """A user's own transitions take precedence over everyone else's"""
+    predictor = ModelPredictor(user_weight=2.0)
+    for _ in range(5):
+        for model_id in ["a", "c"]:
+            predictor.record_usage("v", model_id, timestamp=0.0)
+    for model_id in ["a", "b", "a"]:
+        predictor.record_usage("u", model_id, timestamp=0.0)
+
+    assert predictor.predict_next_models("u", k=1) == ["b"]
+    assert predictor.predict_next_models("v", k=1) == ["a"]
+
+def test_evaluate_on_repeating_sequence():
+    """Once a cycle has been seen, every later request is predicted"""
+    events = [(float(t), "u", "abc"[t % 3]) for t in range(30)]
+
+    result = evaluate_predictor(events, k=1)
+
+    assert result['requests'] == 30
+    assert result['hits'] >= 30 - 4
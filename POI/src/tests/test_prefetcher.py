@@ -0,0 +1,155 @@
+"""
+Tests for the background model prefetcher
+"""
+import threading
+import time
+
+import pytest
+
+from ..prefetcher import ModelPrefetcher
+
+class FakeCache:
+    """Records loads; models listed in `blocked` wait for `release`"""
+    def __init__(self, blocked=()):
+        self.top = set()
+        self.loads = []
+        self.blocked = set(blocked)
+        self.release = threading.Event()
+        self.loading = threading.Event()
+
+    def in_top_tier(self, model_id):
+        return model_id in self.top
+
+    def get(self, model_id):
+        self.loads.append(model_id)
+        if model_id in self.blocked:
+            self.loading.set()
+            self.release.wait(5)
+        self.top.add(model_id)
+
+    def where(self, model_id):
+        return "ram" if model_id in self.top else None
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+@pytest.fixture
+def make_prefetcher():
+    prefetchers = []
+
+    def make(cache, **kwargs):
+        prefetcher = ModelPrefetcher(cache, lambda model_id: 100, **kwargs)
+        prefetchers.append(prefetcher)
+        return prefetcher
+
+    yield make
+    for prefetcher in prefetchers:
+        prefetcher.stop(timeout=5)
+
+def test_request_loads_in_background(make_prefetcher):
+    """Predicted models are loaded off the caller's thread and credited when used"""
+    cache = FakeCache()
+    prefetcher = make_prefetcher(cache)
+
+    prefetcher.request(["a", "b"])
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 2)
+    prefetcher.note_use("a")
+
+    assert cache.loads == ["a", "b"]
+    metrics = prefetcher.get_metrics()
+    assert metrics['used'] == 1
+    assert metrics['outstanding'] == 1
+    assert metrics['outstanding_bytes'] == 100
+
+def test_cached_and_duplicate_requests_are_skipped(make_prefetcher):
+    """Models already in the top tier or already queued are not fetched again"""
+    cache = FakeCache(blocked={"a"})
+    cache.top.add("hot")
+    prefetcher = make_prefetcher(cache)
+
+    prefetcher.request(["a"])
+    cache.loading.wait(5)
+    prefetcher.request(["a", "hot", "b", "b"])
+    cache.release.set()
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 2)
+
+    assert cache.loads == ["a", "b"]
+    assert prefetcher.get_metrics()['requested'] == 2
+
+def test_cancel_drops_queued_prefetches(make_prefetcher):
+    """Cancelled models are never loaded, while the load in progress completes"""
+    cache = FakeCache(blocked={"a"})
+    prefetcher = make_prefetcher(cache)
+
+    prefetcher.request(["a"])
+    cache.loading.wait(5)
+    prefetcher.request(["b", "c", "d"])
+    prefetcher.cancel("b")
+    prefetcher.cancel("missing")
+    assert prefetcher.get_metrics()['cancelled'] == 1
+
+    prefetcher.cancel()
+    cache.release.set()
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 1)
+    prefetcher.stop(timeout=5)
+
+    assert cache.loads == ["a"]
+    assert prefetcher.get_metrics()['cancelled'] == 3
+
+def test_full_queue_drops_oldest_prediction(make_prefetcher):
+    """A bounded queue keeps the newest predictions"""
+    cache = FakeCache(blocked={"a"})
+    prefetcher = make_prefetcher(cache, max_queue=2)
+
+    prefetcher.request(["a"])
+    cache.loading.wait(5)
+    prefetcher.request(["b", "c", "d"])
+    cache.release.set()
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 3)
+
+    assert cache.loads == ["a", "c", "d"]
+    assert prefetcher.get_metrics()['dropped'] == 1
+
+def test_memory_budget_limits_unused_prefetches(make_prefetcher):
+    """Prefetches stop once unused ones fill the budget, and resume as they are used"""
+    cache = FakeCache()
+    prefetcher = make_prefetcher(cache, memory_budget=150)
+
+    prefetcher.request(["a", "b"])
+    wait_for(lambda: prefetcher.get_metrics()['queue_depth'] == 0 and cache.loads == ["a"])
+    wait_for(lambda: prefetcher.get_metrics()['over_budget'] == 1)
+
+    prefetcher.note_use("a")
+    prefetcher.request(["b"])
+    wait_for(lambda: cache.loads == ["a", "b"])
+
+def test_use_during_load_counts_as_late(make_prefetcher):
+    """A request that needs a model still being prefetched is not credited as a hit"""
+    cache = FakeCache(blocked={"a"})
+    prefetcher = make_prefetcher(cache)
+
+    prefetcher.request(["a"])
+    cache.loading.wait(5)
+    prefetcher.note_use("a")
+    cache.release.set()
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 1)
+
+    metrics = prefetcher.get_metrics()
+    assert metrics['late'] == 1
+    assert metrics['outstanding'] == 0
+
+def test_evicted_prefetch_is_wasted(make_prefetcher):
+    """Prefetched models evicted before use count as wasted and free their budget"""
+    cache = FakeCache()
+    prefetcher = make_prefetcher(cache)
+
+    prefetcher.request(["a"])
+    wait_for(lambda: prefetcher.get_metrics()['loaded'] == 1)
+    cache.top.discard("a")
+
+    metrics = prefetcher.get_metrics()
+    assert metrics['wasted'] == 1
+    assert metrics['outstanding_bytes'] == 0
@@ -0,0 +1,73 @@
+"""
+Tests for the Merkle-batched proof submission pipeline
+"""
+import asyncio
+
+import pytest
+from web3 import Web3
+
+from ..proof_pipeline import ProofSubmissionPipeline, verify_inclusion
+
+def enqueue(pipeline, count):
+    return [
+        pipeline.enqueue("model", bytes([i]) * 32, bytes([i + 1]) * 32, b"proof")
+        for i in range(count)
+    ]
+
+def test_committed_records_get_inclusion_proofs():
+    """Every record in a committed batch verifies against the committed root"""
+    commits = []
+    pipeline = ProofSubmissionPipeline(lambda root, count: commits.append((root, count)) or "0xtx")
+    handles = enqueue(pipeline, 5)
+
+    summary = asyncio.run(pipeline.flush())
+
+    assert summary["count"] == 5 and commits[0][1] == 5
+    for handle in handles:
+        receipt = pipeline.get_status(handle)
+        assert receipt["status"] == "committed"
+        proof = [Web3.to_bytes(hexstr=node) for node in receipt["proof"]]
+        assert verify_inclusion(Web3.to_bytes(hexstr=receipt["leaf"]), proof, commits[0][0])
+
+def test_failed_commit_backs_off_and_requeues():
+    """A failed commit keeps records pending, in order, and delays the next attempt"""
+    def revert(root, count):
+        raise RuntimeError("reverted")
+
+    pipeline = ProofSubmissionPipeline(revert, retry_backoff=10.0)
+    handles = enqueue(pipeline, 3)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipeline.flush())
+
+    assert pipeline.pending_count == 3
+    assert [r.handle for r in pipeline._pending] == handles
+    assert all(pipeline.get_status(h) == {"status": "pending"} for h in handles)
+    assert pipeline._retry_at > 0
+    assert pipeline.commit_failures == 1
+
+def test_records_are_dead_lettered_after_max_attempts():
+    """A permanently reverting commit stops retrying and hands records to the dead letter"""
+    dead = []
+
+    def revert(root, count):
+        raise RuntimeError("reverted")
+
+    pipeline = ProofSubmissionPipeline(
+        revert,
+        max_attempts=3,
+        retry_backoff=0.0,
+        dead_letter=lambda records, error: dead.extend(records)
+    )
+    handles = enqueue(pipeline, 4)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            asyncio.run(pipeline.flush())
+
+    assert pipeline.pending_count == 0
+    assert [r.handle for r in dead] == handles
+    assert pipeline.records_failed == 4
+    status = pipeline.get_status(handles[0])
+    assert status["status"] == "failed" and status["attempts"] == 3
+    assert asyncio.run(pipeline.flush()) is None
@@ -0,0 +1,82 @@
+"""
+Tests for the int8 serving tier
+"""
+import threading
+
+import torch
+
+from ..quantization import INT8_SUFFIX, QuantizationManager
+
+def make_model():
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 4)).eval()
+
+def test_variant_built_off_request_path():
+    """The request completing calibration does not wait for the variant build"""
+    manager = QuantizationManager(tolerance=1.0, calibration_samples=2)
+    model = make_model()
+    release = threading.Event()
+
+    def load_model():
+        release.wait(5)
+        return model
+
+    for _ in range(2):
+        manager.observe("m", torch.randn(1, 16), load_model)
+    assert manager.route("m", "economy") == "m"
+
+    # Further requests are not queued behind the running build
+    manager.observe("m", torch.randn(1, 16), load_model)
+    release.set()
+    manager.wait(5)
+
+    assert manager.route("m", "economy") == "m" + INT8_SUFFIX
+    assert manager.reports["m"].calibration_samples == 2
+    manager.shutdown()
+
+def test_failed_build_is_not_retried():
+    """A variant whose build fails is given up on"""
+    manager = QuantizationManager(calibration_samples=1, background=False)
+    calls = []
+
+    def load_model():
+        calls.append(1)
+        raise RuntimeError("no model")
+
+    manager.observe("m", torch.randn(1, 16), load_model)
+    manager.observe("m", torch.randn(1, 16), load_model)
+
+    assert calls == [1]
+    assert "m" in manager.failed
+    assert manager.route("m", "economy") == "m"
+
+def test_drop_during_build_discards_variant():
+    """A variant built from weights dropped mid-build is never served"""
+    manager = QuantizationManager(tolerance=1.0, calibration_samples=1)
+    release = threading.Event()
+
+    def load_model():
+        release.wait(5)
+        return make_model()
+
+    manager.observe("m", torch.randn(1, 16), load_model)
+    manager.drop_variant("m")
+    release.set()
+    manager.wait(5)
+    manager._executor.submit(lambda: None).result()
+
+    assert "m" not in manager.variants
+    assert manager.route("m", "economy") == "m"
+    manager.shutdown()
+
+def test_dropped_variant_lookup_returns_none():
+    """Serving IDs routed before a drop resolve to nothing rather than raising"""
+    manager = QuantizationManager(tolerance=1.0, calibration_samples=1, background=False)
+    manager.observe("m", torch.randn(1, 16), make_model)
+    serving_id = manager.route("m", "economy")
+    assert manager.get_variant(serving_id) is not None
+
+    manager.drop_variant("m")
+
+    assert manager.get_variant(serving_id) is None
+    assert manager.base_id(serving_id) == "m"
@@ -0,0 +1,124 @@
+"""
+Tests for the inference result cache
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ..result_cache import ResultCache
+
+def test_concurrent_requests_compute_once():
+    """Identical concurrent requests share one model run"""
+    cache = ResultCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'output': np.ones(3)}
+
+    def request():
+        results.append(cache.get_or_compute("k", compute))
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=request) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while cache.get_metrics()['coalesced'] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+    assert all(np.array_equal(result['output'], np.ones(3)) for result, _ in results)
+    assert cache.get("k") is not None
+
+def test_async_requests_compute_once():
+    """Async callers coalesce onto the leader's computation"""
+    async def run():
+        cache = ResultCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {'output': np.zeros(2)}
+
+        results = await asyncio.gather(*[cache.get_or_compute_async("k", compute) for _ in range(5)])
+
+        assert len(calls) == 1
+        assert [cached for _, cached in results].count(False) == 1
+
+    asyncio.run(run())
+
+def test_leader_error_reaches_followers_and_is_not_cached():
+    """A failed computation fails its waiters and the next request retries"""
+    async def run():
+        cache = ResultCache()
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *[cache.get_or_compute_async("k", failing) for _ in range(3)],
+            return_exceptions=True
+        )
+        assert len(attempts) == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.get("k") is None
+
+        async def succeeding():
+            return {'output': np.ones(1)}
+
+        result, cached = await cache.get_or_compute_async("k", succeeding)
+        assert not cached
+
+    asyncio.run(run())
+
+def test_least_recently_used_evicted():
+    """Entries beyond max_entries are evicted oldest-use first"""
+    cache = ResultCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_compute(key, lambda: {'output': np.ones(1)})
+    cache.get("a")
+
+    cache.get_or_compute("c", lambda: {'output': np.ones(1)})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get_metrics()['evictions'] == 1
+
+def test_byte_budget_and_ttl():
+    """Results over the byte budget evict others; expired ones are not served"""
+    cache = ResultCache(max_bytes=1000, ttl=0.05)
+    cache.get_or_compute("small", lambda: {'output': np.zeros(10)})
+    cache.get_or_compute("large", lambda: {'output': np.zeros(120)})
+
+    assert cache.get("small") is None
+    assert cache.get_metrics()['bytes_used'] <= 1000
+
+    time.sleep(0.1)
+    assert cache.get("large") is None
+    assert cache.get_metrics()['expired'] == 1
+
+def test_cached_output_is_read_only():
+    """Stored arrays are shared between callers, so writes are refused"""
+    cache = ResultCache()
+    result, _ = cache.get_or_compute("k", lambda: {'output': np.ones(2)})
+
+    with pytest.raises(ValueError):
+        cache.get("k")['output'][0] = 5
@@ -0,0 +1,99 @@
+"""
+Tests for the coordinator task feed
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from ..task_feed import TaskFeed
+
+NODE = "0xnode"
+
+def assignment(task_id, block):
+    return {'args': {'taskId': task_id, 'nodes': [NODE]}, 'blockNumber': block}
+
+class FakeEvent:
+    def __init__(self, events):
+        self.events = events
+
+    def get_logs(self, fromBlock, toBlock):
+        return [e for e in self.events if fromBlock <= e['blockNumber'] <= toBlock]
+
+def make_feed(tmp_path, events, head, poll_interval=None):
+    web3 = SimpleNamespace(eth=SimpleNamespace(block_number=head))
+    return TaskFeed(
+        web3,
+        FakeEvent(events),
+        NODE,
+        cursor_path=str(tmp_path / "cursor.json"),
+        poll_interval=poll_interval,
+        initial_lookback=head
+    )
+
+def saved_cursor(tmp_path):
+    with open(tmp_path / "cursor.json") as f:
+        return json.load(f)['block']
+
+def test_cursor_waits_for_delivery(tmp_path):
+    """Blocks with queued assignments are rescanned after a restart until delivered"""
+    async def run():
+        feed = make_feed(tmp_path, [assignment(1, 3), assignment(2, 7)], head=10)
+        await feed.start()
+        assert await feed.poll_once() == 2
+        assert saved_cursor(tmp_path) == 2
+
+        assert (await feed.get())['task_id'] == 1
+        assert saved_cursor(tmp_path) == 6
+        await feed.stop()
+
+        restarted = make_feed(tmp_path, [assignment(1, 3), assignment(2, 7)], head=10)
+        await restarted.start()
+        assert await restarted.poll_once() == 1
+        assert (await restarted.get())['task_id'] == 2
+        assert saved_cursor(tmp_path) == 10
+
+    asyncio.run(run())
+
+def test_push_does_not_skip_unscanned_blocks(tmp_path):
+    """A pushed event from a later block leaves earlier blocks to polling"""
+    async def run():
+        events = [assignment(1, 4), assignment(2, 9)]
+        feed = make_feed(tmp_path, events, head=3, poll_interval=3600)
+        await feed.start()
+        while feed.scanned < 3:
+            await asyncio.sleep(0.01)
+
+        assert await feed.push(events[1])
+        assert feed.cursor == 3
+        assert feed.pushed_block == 9
+
+        feed.web3.eth.block_number = 10
+        assert await feed.poll_once() == 1
+        delivered = {(await feed.get())['task_id'] for _ in range(2)}
+        assert delivered == {1, 2}
+        assert feed.cursor == 10
+        await feed.stop()
+
+    asyncio.run(run())
+
+def test_push_only_feed_advances_cursor(tmp_path):
+    """Without polling, pushed blocks move the cursor once their tasks are delivered"""
+    async def run():
+        feed = make_feed(tmp_path, [], head=3)
+        await feed.start()
+
+        assert await feed.push(assignment(1, 5))
+        assert saved_cursor(tmp_path) == 4
+
+        assert await feed.push(assignment(2, 8))
+        assert (await feed.get())['task_id'] == 1
+        assert saved_cursor(tmp_path) == 7
+
+        assert (await feed.get())['task_id'] == 2
+        await feed.stop()
+
+        restarted = make_feed(tmp_path, [], head=20)
+        await restarted.start()
+        assert restarted.cursor == 7
+
+    asyncio.run(run())
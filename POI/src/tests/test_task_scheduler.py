@@ -0,0 +1,129 @@
+"""
+Tests for deadline-ordered task scheduling
+"""
+import asyncio
+import time
+
+import pytest
+
+from ..task_scheduler import TaskScheduler
+
+def make_scheduler(**kwargs):
+    order = []
+    gates = {}
+
+    async def run_task(task_id, payload):
+        order.append(task_id)
+        if task_id in gates:
+            await gates[task_id].wait()
+
+    return TaskScheduler(run_task, max_concurrency=1, **kwargs), order, gates
+
+def test_earliest_deadline_runs_first():
+    """Queued tasks start in deadline order, not submission order"""
+    async def run():
+        scheduler, order, gates = make_scheduler()
+        gates['blocker'] = asyncio.Event()
+        now = time.time()
+
+        assert scheduler.submit('blocker', deadline=now + 60)
+        await asyncio.sleep(0)
+        for task_id, offset in (('late', 30), ('soon', 10), ('middle', 20)):
+            assert scheduler.submit(task_id, deadline=now + offset)
+
+        gates['blocker'].set()
+        await scheduler.drain()
+
+        assert order == ['blocker', 'soon', 'middle', 'late']
+
+    asyncio.run(run())
+
+def test_paid_deadline_beats_free_tier():
+    """A free task waits behind paid work with an earlier deadline"""
+    async def run():
+        scheduler, order, gates = make_scheduler()
+        gates['blocker'] = asyncio.Event()
+        now = time.time()
+
+        scheduler.submit('blocker')
+        await asyncio.sleep(0)
+        scheduler.submit('free', free=True, deadline=now + 20)
+        scheduler.submit('paid', deadline=now + 10)
+
+        gates['blocker'].set()
+        await scheduler.drain()
+
+        assert order == ['blocker', 'paid', 'free']
+
+    asyncio.run(run())
+
+def test_deadline_missed_while_queued_is_dropped():
+    """A task whose deadline passes in the queue is counted and never run"""
+    async def run():
+        scheduler, order, gates = make_scheduler()
+        gates['blocker'] = asyncio.Event()
+
+        scheduler.submit('blocker')
+        await asyncio.sleep(0)
+        assert scheduler.submit('doomed', deadline=time.time() + 0.05)
+
+        await asyncio.sleep(0.1)
+        gates['blocker'].set()
+        await scheduler.drain()
+
+        assert order == ['blocker']
+        metrics = scheduler.get_metrics()['paid']
+        assert metrics['expired'] == 1
+        assert metrics['completed'] == 1
+
+    asyncio.run(run())
+
+def test_unmeetable_deadline_is_shed():
+    """Submissions that cannot finish in time given recent service times are refused"""
+    async def run():
+        async def slow(task_id, payload):
+            await asyncio.sleep(0.05)
+
+        scheduler = TaskScheduler(slow, max_concurrency=1, max_paid_queue=1)
+        scheduler.submit('first')
+        await scheduler.drain()
+
+        assert not scheduler.submit('hurried', deadline=time.time() + 0.01)
+        assert scheduler.submit('relaxed', deadline=time.time() + 60)
+        assert scheduler.submit('queued', deadline=time.time() + 60)
+        assert not scheduler.submit('overflow', deadline=time.time() + 60)
+        await scheduler.drain()
+
+        metrics = scheduler.get_metrics()['paid']
+        assert metrics['shed_deadline'] == 1
+        assert metrics['shed_full'] == 1
+
+    asyncio.run(run())
+
+def test_prometheus_export():
+    """Deadline misses and queue depth are exported per tier"""
+    prometheus_client = pytest.importorskip("prometheus_client")
+
+    async def run():
+        scheduler, _, gates = make_scheduler()
+        gates['blocker'] = asyncio.Event()
+        registry = prometheus_client.CollectorRegistry()
+        scheduler.register_prometheus(registry)
+        scheduler.register_prometheus(registry)
+
+        scheduler.submit('blocker')
+        await asyncio.sleep(0)
+        scheduler.submit('doomed', deadline=time.time() + 0.05)
+        scheduler.submit('queued', free=True, deadline=time.time() + 60)
+        assert registry.get_sample_value('scheduler_queue_depth', {'tier': 'free'}) == 1
+        assert registry.get_sample_value('scheduler_running', {'tier': 'paid'}) == 1
+
+        await asyncio.sleep(0.1)
+        gates['blocker'].set()
+        await scheduler.drain()
+
+        assert registry.get_sample_value('scheduler_deadline_missed_total', {'tier': 'paid'}) == 1
+        assert registry.get_sample_value('scheduler_completed_total', {'tier': 'free'}) == 1
+        assert registry.get_sample_value('scheduler_admitted_total', {'tier': 'paid'}) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,209 @@
+"""
+Tests for the tiered model cache
+"""
+import threading
+
+import pytest
+import torch
+
+from .. import tiered_model_cache
+from ..tiered_model_cache import LEVEL_DISK, LEVEL_RAM, CacheTier, TieredModelCache, model_size
+
+def make_model(seed):
+    torch.manual_seed(seed)
+    return torch.nn.Sequential(torch.nn.Linear(32, 32), torch.nn.ReLU(), torch.nn.Linear(32, 4))
+
+MODEL_BYTES = model_size(make_model(0))
+
+class Scaled(torch.nn.Module):
+    """Needs constructor arguments and has a buffer that weight files do not store"""
+    def __init__(self, width, scale):
+        super().__init__()
+        self.linear = torch.nn.Linear(width, width)
+        self.register_buffer("scale", torch.tensor(scale), persistent=False)
+
+    def forward(self, x):
+        return self.linear(x) * self.scale
+
+def make_tiers(ram_models, disk_models=4):
+    return [
+        CacheTier("ram", LEVEL_RAM, ram_models * MODEL_BYTES, "cpu"),
+        CacheTier("disk", LEVEL_DISK, disk_models * MODEL_BYTES)
+    ]
+
+def make_cache(tmp_path, ram_models, disk_models=4):
+    models = {"a": make_model(1), "b": make_model(2)}
+    loader = lambda model_id: make_model(1 if model_id == "a" else 2)
+    return TieredModelCache(loader, make_tiers(ram_models, disk_models), cache_dir=str(tmp_path)), models
+
+def test_demotion_leaves_served_model_intact(tmp_path):
+    """A model handed out keeps its weights after the cache demotes it"""
+    cache, models = make_cache(tmp_path, ram_models=1)
+    x = torch.randn(2, 32)
+
+    a = cache.get("a")
+    cache.get("b")
+
+    assert cache.where("a") == "disk"
+    assert a[0].weight.device.type == "cpu"
+    with torch.no_grad():
+        assert torch.equal(a(x), models["a"](x))
+
+def test_disk_tier_serves_mapped_weights(tmp_path):
+    """Models that only fit on disk are served from the weight file, not meta tensors"""
+    cache, models = make_cache(tmp_path, ram_models=0)
+    x = torch.randn(2, 32)
+
+    a = cache.get("a")
+
+    assert cache.where("a") == "disk"
+    assert not a[0].weight.is_meta
+    with torch.no_grad():
+        assert torch.equal(a(x), models["a"](x))
+
+def test_promotion_copies_disk_model(tmp_path):
+    """A promoted model is a new module, leaving the mapped one usable"""
+    cache, models = make_cache(tmp_path, ram_models=1)
+    x = torch.randn(2, 32)
+
+    cache.get("a")
+    cache.get("b")
+    b = cache.get("b")
+    a = cache.get("a")
+
+    assert cache.where("a") == "ram" and cache.where("b") == "disk"
+    with torch.no_grad():
+        assert torch.equal(a(x), models["a"](x))
+        assert torch.equal(b(x), models["b"](x))
+
+def test_oversized_model_raises(tmp_path):
+    """A model no tier can hold is an error rather than None"""
+    cache, _ = make_cache(tmp_path, ram_models=0, disk_models=0)
+
+    with pytest.raises(ValueError):
+        cache.get("a")
+    assert cache.where("a") is None
+
+def test_concurrent_misses_load_once(tmp_path):
+    """Callers missing on the same model share one load"""
+    release = threading.Event()
+    calls = []
+
+    def loader(model_id):
+        calls.append(model_id)
+        release.wait(5)
+        return make_model(1)
+
+    cache = TieredModelCache(loader, make_tiers(ram_models=2), cache_dir=str(tmp_path))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("a"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.get_metrics()['coalesced'] < 3:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a"]
+    assert len(results) == 4 and all(model is results[0] for model in results)
+
+def test_failed_load_reaches_waiters_and_is_retried(tmp_path):
+    """A loader error is raised to every waiting caller and not remembered"""
+    release = threading.Event()
+    attempts = []
+
+    def loader(model_id):
+        attempts.append(model_id)
+        if len(attempts) == 1:
+            release.wait(5)
+            raise IOError("weights unavailable")
+        return make_model(1)
+
+    cache = TieredModelCache(loader, make_tiers(ram_models=2), cache_dir=str(tmp_path))
+    errors = []
+
+    def fetch():
+        try:
+            cache.get("a")
+        except IOError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    while cache.get_metrics()['coalesced'] < 2:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert cache.get("a") is not None
+    assert len(attempts) == 2
+
+def test_promotion_keeps_miss_cost(tmp_path):
+    """Eviction priority keeps using what a full reload costs, not the promotion time"""
+    cache, _ = make_cache(tmp_path, ram_models=1)
+    cache.get("a")
+    miss_cost = cache.entries["a"].reload_cost
+    cache.get("b")
+
+    cache.get("a")
+
+    assert cache.where("a") == "ram"
+    assert cache.get_metrics()['promotions'] == 1
+    assert cache.entries["a"].reload_cost == miss_cost
+
+def test_promotion_copies_outside_lock(tmp_path, monkeypatch):
+    """Other models are served while a promotion is copying weights"""
+    cache, _ = make_cache(tmp_path, ram_models=2)
+    cache.get("a")
+    cache.make_room(2 * MODEL_BYTES)
+    cache.get("b")
+    assert cache.where("a") == "disk"
+
+    copying = threading.Event()
+    release = threading.Event()
+    copy_to = tiered_model_cache.copy_to
+
+    def slow_copy(model, device):
+        copying.set()
+        release.wait(5)
+        return copy_to(model, device)
+
+    monkeypatch.setattr(tiered_model_cache, "copy_to", slow_copy)
+    promotion = threading.Thread(target=cache.get, args=("a",))
+    promotion.start()
+    copying.wait(5)
+
+    served = []
+    reader = threading.Thread(target=lambda: served.append(cache.get("b")))
+    reader.start()
+    reader.join(2)
+    served_during_copy = bool(served)
+    release.set()
+    promotion.join()
+    reader.join()
+
+    assert served_during_copy
+    assert cache.where("a") == "ram"
+
+def test_disk_round_trip_without_constructor_args(tmp_path):
+    """Models whose constructors take arguments survive demotion to disk and promotion back"""
+    torch.manual_seed(0)
+    reference = Scaled(32, 2.0)
+    loader = lambda model_id: tiered_model_cache.copy_to(reference, "cpu")
+    cache = TieredModelCache(loader, make_tiers(ram_models=1), cache_dir=str(tmp_path))
+    x = torch.randn(2, 32)
+
+    cache.get("scaled")
+    cache.make_room(MODEL_BYTES)
+    assert cache.where("scaled") == "disk"
+    on_disk = cache.entries["scaled"].model
+    promoted = cache.get("scaled")
+
+    assert cache.where("scaled") == "ram"
+    with torch.no_grad():
+        assert torch.equal(on_disk(x), reference(x))
+        assert torch.equal(promoted(x), reference(x))
@@ -0,0 +1,96 @@
+"""
+Tests for the multi-process CPU inference worker pool
+"""
+import threading
+import time
+from multiprocessing import shared_memory
+
+import pytest
+import torch
+
+from ..worker_pool import InferenceWorkerPool
+
+@pytest.fixture
+def pool():
+    pool = InferenceWorkerPool(workers_per_model=1, pin_cores=False, max_tensor_bytes=1024 * 1024)
+    yield pool
+    pool.shutdown()
+
+class Hang(torch.nn.Module):
+    def forward(self, x):
+        if x.sum() > 0:
+            time.sleep(30)
+        return x
+
+def test_crashed_worker_is_respawned(pool):
+    """Requests after a worker dies go to a fresh worker rather than the dead one"""
+    model = torch.nn.Linear(4, 2)
+    pool.start_model("m", model)
+    x = torch.randn(3, 4)
+
+    dead = pool.workers["m"][0]
+    dead.process.kill()
+    dead.process.join()
+    with pytest.raises(Exception):
+        pool.run("m", x)
+
+    with torch.no_grad():
+        expected = model(x)
+    assert torch.allclose(pool.run("m", x), expected)
+    assert pool.respawned == 1
+    assert pool.workers["m"][0] is not dead
+
+def test_failed_start_releases_shared_memory(pool, tmp_path, monkeypatch):
+    """A worker that cannot load its model leaves no shared-memory segments behind"""
+    created = []
+
+    class Recording(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get("create"):
+                created.append(self.name)
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", Recording)
+
+    with pytest.raises(RuntimeError):
+        pool.start_model("missing", tmp_path / "missing.joyw")
+
+    assert len(created) == 2
+    for name in created:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+    assert not pool.has_model("missing")
+
+def test_hung_worker_times_out_and_is_replaced():
+    """A worker that stops replying fails its request and is replaced"""
+    pool = InferenceWorkerPool(workers_per_model=1, pin_cores=False, max_tensor_bytes=1024, reply_timeout=0.5)
+    try:
+        pool.start_model("m", Hang())
+        hung = pool.workers["m"][0]
+
+        with pytest.raises(TimeoutError):
+            pool.run("m", torch.ones(2))
+
+        assert not hung.process.is_alive()
+        assert torch.equal(pool.run("m", -torch.ones(2)), -torch.ones(2))
+        assert pool.respawned == 1
+    finally:
+        pool.shutdown()
+
+def test_core_allocation_is_unique_across_threads():
+    """Concurrent spawns never hand out the same core offset twice"""
+    pool = InferenceWorkerPool(threads_per_worker=1)
+    barrier = threading.Barrier(8)
+
+    def allocate():
+        barrier.wait()
+        for _ in range(100):
+            pool._allocate_cores()
+
+    threads = [threading.Thread(target=allocate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool._next_core == 800
@@ -0,0 +1,395 @@
+"""Tiered model cache spanning accelerators, host RAM and memory-mapped disk."""
+
+import copy
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import torch
+
+from .utils.weight_format import load_model, save_weights
+
+LEVEL_DEVICE = 0
+LEVEL_RAM = 1
+LEVEL_DISK = 2
+
+@dataclass
+class CacheTier:
+    """One storage tier; several accelerator tiers may share LEVEL_DEVICE."""
+    name: str
+    level: int
+    budget: int
+    device: Optional[str] = None
+    used: int = 0
+
+    @property
+    def free(self) -> int:
+        return self.budget - self.used
+
+@dataclass
+class _Entry:
+    model_id: str
+    model: torch.nn.Module
+    size: int
+    reload_cost: float
+    tier: Optional[CacheTier] = None
+    hits: int = 0
+    last_access: float = field(default_factory=time.time)
+    priority: float = 0.0
+    disk_path: Optional[Path] = None
+
+def model_size(model: torch.nn.Module) -> int:
+    """Bytes held by a model's parameters and buffers."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+def copy_to(model: torch.nn.Module, device: str) -> torch.nn.Module:
+    """Copy a model onto a device, leaving the original and its weights untouched.
+
+    Module.to() moves tensors in place, which would pull weights out from
+    under callers still holding the module; this builds a new module instead.
+    """
+    return _copy_module(model, lambda tensor: device)
+
+def skeleton_of(model: torch.nn.Module) -> torch.nn.Module:
+    """Copy a model with its saved tensors on the meta device, ready to map a weight file into.
+
+    Non-persistent buffers are not written to weight files, so they keep real
+    CPU copies. The skeleton never has to be rebuilt from the model's class,
+    whose constructor arguments are unknown here.
+    """
+    saved = {id(tensor) for tensor in model.state_dict(keep_vars=True).values()}
+    return _copy_module(model, lambda tensor: "meta" if id(tensor) in saved else "cpu")
+
+def _copy_module(model: torch.nn.Module, device_of: Callable[[torch.Tensor], str]) -> torch.nn.Module:
+    memo = {}
+    for tensor in itertools.chain(model.parameters(), model.buffers()):
+        if id(tensor) in memo:
+            continue
+        moved = tensor.detach().to(device_of(tensor), copy=True)
+        if isinstance(tensor, torch.nn.Parameter):
+            moved = torch.nn.Parameter(moved, requires_grad=tensor.requires_grad)
+        memo[id(tensor)] = moved
+    return copy.deepcopy(model, memo)
+
+def default_tiers(
+    device_budget: Optional[int] = None,
+    ram_budget: int = 8 * 1024**3,
+    disk_budget: int = 64 * 1024**3,
+    buffer_ratio: float = 0.4
+) -> List[CacheTier]:
+    """Build tiers for the accelerators present on this host, then RAM and disk.
+
+    On CPU-only hosts RAM is the top tier.
+
+    Args:
+        device_budget: Bytes per accelerator; defaults to total memory minus the buffer
+        ram_budget: Bytes of host RAM for models
+        disk_budget: Bytes of memory-mapped weight files
+        buffer_ratio: Share of accelerator memory left free when device_budget is unset
+    """
+    tiers = []
+    if torch.cuda.is_available():
+        for index in range(torch.cuda.device_count()):
+            total = torch.cuda.get_device_properties(index).total_memory
+            budget = device_budget or int(total * (1 - buffer_ratio))
+            tiers.append(CacheTier(f"cuda:{index}", LEVEL_DEVICE, budget, f"cuda:{index}"))
+    elif getattr(torch.backends, "mps", None) and torch.backends.mps.is_available():
+        tiers.append(CacheTier("mps", LEVEL_DEVICE, device_budget or ram_budget, "mps"))
+
+    tiers.append(CacheTier("ram", LEVEL_RAM, ram_budget, "cpu"))
+    tiers.append(CacheTier("disk", LEVEL_DISK, disk_budget))
+    return tiers
+
+class TieredModelCache:
+    def __init__(
+        self,
+        loader: Callable[[str], torch.nn.Module],
+        tiers: Optional[List[CacheTier]] = None,
+        cache_dir: str = "./model_cache",
+        pin_memory: bool = True
+    ):
+        """Initialize the cache.
+
+        Eviction uses Greedy-Dual-Size-Frequency: an entry's priority is the
+        cache clock plus hits * reload_cost / size, so cheap-to-reload, large,
+        rarely used models go first. The clock advances to each victim's
+        priority, which ages entries that have not been touched recently.
+        Evicted models are demoted one level (device -> RAM -> disk) instead
+        of being dropped. Moves build new modules, so a model already handed
+        out keeps its weights where they were; disk-tier models are served
+        straight from their memory-mapped weight file. Loads and promotions
+        copy weights outside the lock, one caller per model at a time.
+
+        Args:
+            loader: Loads a model onto the CPU by ID on a full miss
+            tiers: Storage tiers; defaults to default_tiers()
+            cache_dir: Directory for weight files of models demoted to disk
+            pin_memory: Pin RAM-tier weights when an accelerator is present
+        """
+        self.loader = loader
+        self.tiers = tiers if tiers is not None else default_tiers()
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+
+        self.top_level = min(tier.level for tier in self.tiers)
+        self.entries: Dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Future] = {}
+        self._clock = 0.0
+        self.metrics = {
+            'hits': {tier.name: 0 for tier in self.tiers},
+            'misses': 0,
+            'coalesced': 0,
+            'promotions': 0,
+            'demotions': 0,
+            'drops': 0
+        }
+
+    def get(self, model_id: str) -> torch.nn.Module:
+        """Get a model in the highest tier that can hold it, promoting or loading it as needed.
+
+        Raises:
+            ValueError: If the model is larger than every tier
+        """
+        while True:
+            with self._lock:
+                pending = self._inflight.get(model_id)
+                if pending is None:
+                    entry = self.entries.get(model_id)
+                    target = None
+                    if entry is not None:
+                        self.metrics['hits'][entry.tier.name] += 1
+                        self._touch(entry)
+                        target = self._promotion_target(entry)
+                        if target is None:
+                            return self._served(entry)
+                    pending = self._inflight[model_id] = Future()
+                    leader = True
+                else:
+                    self.metrics['coalesced'] += 1
+                    leader = False
+
+            if not leader:
+                # Another caller is loading or promoting this model; reuse its work
+                pending.result()
+                continue
+
+            try:
+                model = self._load(model_id) if entry is None else self._promote(entry, target)
+            except BaseException as e:
+                self._settle(model_id, pending, e)
+                raise
+            self._settle(model_id, pending)
+            if model is not None:
+                return model
+
+    def peek(self, model_id: str) -> Optional[torch.nn.Module]:
+        """Get a model held in memory without promoting it or counting a hit."""
+        with self._lock:
+            entry = self.entries.get(model_id)
+            if entry is None or entry.tier.level == LEVEL_DISK:
+                return None
+            return entry.model
+
+    def in_top_tier(self, model_id: str) -> bool:
+        with self._lock:
+            entry = self.entries.get(model_id)
+            return entry is not None and entry.tier.level == self.top_level
+
+    def size_of(self, model_id: str) -> Optional[int]:
+        """Get the bytes a cached model occupies in any tier."""
+        with self._lock:
+            entry = self.entries.get(model_id)
+            return entry.size if entry else None
+
+    def where(self, model_id: str) -> Optional[str]:
+        """Get the name of the tier holding a model."""
+        with self._lock:
+            entry = self.entries.get(model_id)
+            return entry.tier.name if entry else None
+
+    def make_room(self, nbytes: int, level: Optional[int] = None):
+        """Demote models until every tier at a level has nbytes free, e.g. after an OOM."""
+        level = self.top_level if level is None else level
+        with self._lock:
+            for tier in self.tiers:
+                if tier.level == level:
+                    self._make_room(tier, nbytes)
+
+    def invalidate(self, model_id: str):
+        """Forget a model everywhere, e.g. after its weights change."""
+        with self._lock:
+            entry = self.entries.pop(model_id, None)
+            if entry is not None:
+                self._release(entry)
+
+    def get_metrics(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self.metrics,
+                'tiers': {
+                    tier.name: {
+                        'used': tier.used,
+                        'budget': tier.budget,
+                        'models': sorted(e.model_id for e in self.entries.values() if e.tier is tier)
+                    }
+                    for tier in self.tiers
+                }
+            }
+
+    def _load(self, model_id: str) -> torch.nn.Module:
+        """Load a model on a full miss and place it in the top tier that holds it."""
+        start = time.perf_counter()
+        model = self.loader(model_id)
+        reload_cost = time.perf_counter() - start
+        model.eval()
+        entry = _Entry(model_id, model, model_size(model), reload_cost)
+
+        with self._lock:
+            self.metrics['misses'] += 1
+            target = self._target_tier(entry.size, self.top_level)
+        if target is not None and target.level != LEVEL_DISK:
+            # Not handed out yet, so it moves in place
+            model = self._copy(model, target, in_place=True)
+
+        with self._lock:
+            self.entries[model_id] = entry
+            self._touch(entry)
+            if target is not None and target.level != LEVEL_DISK:
+                self._make_room(target, entry.size, exclude=entry)
+                self._move(entry, target, model)
+            else:
+                self._place(entry, self.top_level)
+            return self._served(entry)
+
+    def _promote(self, entry: _Entry, target: CacheTier) -> Optional[torch.nn.Module]:
+        """Copy a cached model up to `target` and swap it in.
+
+        Returns:
+            The promoted model, or None if the entry was moved or invalidated
+            while copying and the lookup has to start over
+        """
+        source = entry.model
+        model = self._copy(source, target)
+
+        with self._lock:
+            if self.entries.get(entry.model_id) is not entry or entry.model is not source:
+                return None
+            self._make_room(target, entry.size, exclude=entry)
+            self._move(entry, target, model)
+            self.metrics['promotions'] += 1
+            return self._served(entry)
+
+    def _promotion_target(self, entry: _Entry) -> Optional[CacheTier]:
+        """Get the higher tier an entry should move to, if any."""
+        if entry.tier.level == self.top_level:
+            return None
+        tier = self._target_tier(entry.size, self.top_level)
+        if tier is None or tier.level >= entry.tier.level:
+            return None
+        return tier
+
+    def _settle(self, model_id: str, pending: Future, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(model_id, None)
+        if error is None:
+            pending.set_result(None)
+        else:
+            pending.set_exception(error)
+
+    def _served(self, entry: _Entry) -> torch.nn.Module:
+        if entry.model is None:
+            raise ValueError(f"Model {entry.model_id} fits no cache tier")
+        return entry.model
+
+    def _touch(self, entry: _Entry):
+        entry.hits += 1
+        entry.last_access = time.time()
+        entry.priority = self._clock + entry.hits * entry.reload_cost / max(entry.size, 1)
+
+    def _place(self, entry: _Entry, level: int):
+        """Move an entry to the first level at or below `level` that can hold it."""
+        tier = self._target_tier(entry.size, level)
+        if tier is None:
+            logging.warning(f"Model {entry.model_id} fits no cache tier, dropping it")
+            self.entries.pop(entry.model_id, None)
+            self._release(entry)
+            self.metrics['drops'] += 1
+            return
+
+        if tier is not entry.tier:
+            self._make_room(tier, entry.size, exclude=entry)
+            self._move(entry, tier)
+
+    def _target_tier(self, size: int, level: int) -> Optional[CacheTier]:
+        """Get the tier at the first level at or below `level` whose budget fits `size`."""
+        for candidate_level in sorted({t.level for t in self.tiers if t.level >= level}):
+            tiers = [t for t in self.tiers if t.level == candidate_level and t.budget >= size]
+            if tiers:
+                # Spread models across accelerators by picking the emptiest one
+                return max(tiers, key=lambda t: t.free)
+        return None
+
+    def _make_room(self, tier: CacheTier, nbytes: int, exclude: Optional[_Entry] = None):
+        while tier.free < nbytes:
+            candidates = [e for e in self.entries.values() if e.tier is tier and e is not exclude]
+            if not candidates:
+                return
+            victim = min(candidates, key=lambda e: e.priority)
+            self._clock = max(self._clock, victim.priority)
+            self.metrics['demotions'] += 1
+            self._place(victim, tier.level + 1)
+
+    def _move(self, entry: _Entry, tier: CacheTier, model: Optional[torch.nn.Module] = None):
+        """Put an entry in a tier, using `model` if it was already copied there."""
+        if model is not None:
+            entry.model = model
+        elif tier.level == LEVEL_DISK:
+            self._to_disk(entry)
+        else:
+            # Freshly loaded entries are not handed out yet, so they can move in place
+            entry.model = self._copy(entry.model, tier, in_place=entry.tier is None)
+
+        if entry.tier is not None:
+            entry.tier.used -= entry.size
+        tier.used += entry.size
+        entry.tier = tier
+
+    def _to_disk(self, entry: _Entry):
+        if entry.disk_path is None or not entry.disk_path.exists():
+            entry.disk_path = self.cache_dir / f"{entry.model_id.replace('/', '_')}.joyw"
+            save_weights(entry.model, entry.disk_path)
+        # Map the file into a fresh skeleton; pages are read back in on use
+        entry.model = load_model(entry.disk_path, skeleton_of(entry.model))
+
+    def _copy(self, model: torch.nn.Module, tier: CacheTier, in_place: bool = False) -> torch.nn.Module:
+        """Put a model's weights on a tier's device, pinning them in RAM if useful."""
+        if in_place:
+            model = model.to(tier.device, non_blocking=self.pin_memory)
+        else:
+            model = copy_to(model, tier.device)
+        if tier.level == LEVEL_RAM and self.pin_memory:
+            self._pin(model)
+        return model
+
+    def _pin(self, model: torch.nn.Module):
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            if not tensor.is_pinned():
+                tensor.data = tensor.data.pin_memory()
+
+    def _release(self, entry: _Entry):
+        if entry.tier is not None:
+            entry.tier.used -= entry.size
+            entry.tier = None
+        if entry.disk_path is not None:
+            entry.disk_path.unlink(missing_ok=True)
+        entry.model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
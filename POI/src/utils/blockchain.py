@@ -1,10 +1,20 @@
 """Blockchain utility functions."""
 import asyncio
 from web3 import Web3
-from typing import Callable, Any
+from typing import Callable, Any, Union
 
 from ..constants import MAX_RETRIES, RETRY_DELAY, GAS_ESTIMATE_MARGIN
 
+def provider_key(web3: Web3) -> Union[str, int]:
+    """Key identifying the node a Web3 instance talks to.
+
+    Components each build their own provider for the same URL, so the
+    endpoint is what identifies a connection; providers without one (IPC,
+    WebSocket, test providers) are told apart by object identity.
+    """
+    provider = web3.provider
+    return getattr(provider, 'endpoint_uri', None) or id(provider)
+
 async def with_retry(
     func: Callable,
     max_retries: int = MAX_RETRIES,
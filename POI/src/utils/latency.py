@@ -0,0 +1,123 @@
+"""
+Per-stage latency spans with rolling percentile histograms
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class LatencyHistogram:
+    """Rolling window of samples plus lifetime count and sum."""
+
+    def __init__(self, window: int = 2048):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        summary = {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0
+        }
+        for q in QUANTILES:
+            key = f"p{int(q * 100)}"
+            summary[key] = ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+        return summary
+
+class LatencyRecorder:
+    """Collects stage timings per model and exports them to Prometheus."""
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+        self._registered = False
+
+    @contextmanager
+    def span(self, model_id: str, stage: str, trace: Optional[Dict[str, float]] = None) -> Iterator[None]:
+        """Time a block as one stage of a request.
+
+        Args:
+            model_id: Model the request targets
+            stage: Stage name, e.g. "forward"
+            trace: Optional per-request dict that also receives the duration in ms
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.record(model_id, stage, elapsed_ms)
+            if trace is not None:
+                trace[stage] = trace.get(stage, 0.0) + elapsed_ms
+
+    def record(self, model_id: str, stage: str, elapsed_ms: float):
+        with self._lock:
+            stages = self._histograms.setdefault(model_id, {})
+            histogram = stages.get(stage)
+            if histogram is None:
+                histogram = stages[stage] = LatencyHistogram(self.window)
+            histogram.add(elapsed_ms)
+
+    def snapshot(self, model_id: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Get count, average and percentiles per model and stage."""
+        with self._lock:
+            models = [model_id] if model_id else list(self._histograms)
+            return {
+                m: {stage: h.summary() for stage, h in self._histograms.get(m, {}).items()}
+                for m in models
+            }
+
+    def collect(self):
+        """Prometheus collector hook yielding quantile gauges and counts."""
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+        quantiles = GaugeMetricFamily(
+            'inference_stage_latency_ms',
+            'Inference stage latency percentiles over the recent window in ms',
+            labels=['model_id', 'stage', 'quantile']
+        )
+        counts = CounterMetricFamily(
+            'inference_stage',
+            'Inference stages recorded',
+            labels=['model_id', 'stage']
+        )
+        totals = CounterMetricFamily(
+            'inference_stage_time_ms',
+            'Total time spent in each inference stage in ms',
+            labels=['model_id', 'stage']
+        )
+
+        for model_id, stages in self.snapshot().items():
+            for stage, summary in stages.items():
+                for q in QUANTILES:
+                    quantiles.add_metric([model_id, stage, str(q)], summary[f"p{int(q * 100)}"])
+                counts.add_metric([model_id, stage], summary['count'])
+                totals.add_metric([model_id, stage], summary['avg'] * summary['count'])
+
+        yield quantiles
+        yield counts
+        yield totals
+
+    def register_prometheus(self, registry: Any = None):
+        """Expose this recorder through a Prometheus registry (the default one if not given)."""
+        if self._registered:
+            return
+        from prometheus_client import REGISTRY
+        (registry or REGISTRY).register(self)
+        self._registered = True
+
+_recorder = LatencyRecorder()
+
+def get_latency_recorder() -> LatencyRecorder:
+    """Get the process-wide latency recorder."""
+    return _recorder
@@ -1,49 +1,271 @@
 """
 Utilities for computing merkle roots of model weights
+
+Leaves are the SHA256 hex digests of each trainable parameter's bytes, in
+named_parameters() order; internal nodes hash the concatenation of their
+children's hex digests, and the last node of an odd level is paired with
+itself. Roots are therefore unchanged from earlier releases.
+
+ModelMerkleTree keeps every level of the tree for a model, remembers which
+version of each parameter its leaf was hashed from, and on the next call
+rehashes only parameters that changed plus the nodes on their paths to the
+root. Leaves are hashed from zero-copy views of parameter memory on a shared
+thread pool; hashlib releases the GIL, so large tensors hash on separate
+cores.
+
+parameter_proofs() gives every parameter an inclusion proof against the
+root. Stored in a weight file's metadata:
+
+    save_weights(model, path, metadata={"merkle": parameter_proofs(model)})
+
+they let a loader verify each tensor as it is mapped in (LayerVerifier
+passed as load_model's check) and a partial download be checked tensor by
+tensor (verify_weight_file), so a corrupted tensor is found by hashing
+only that tensor and its path.
+
+compute_file_merkle_root gives the same root straight from a weight file,
+streaming each tensor through a fixed-size buffer without importing the
+model class, so validators can check multi-GB models on small machines:
+
+    python -m src.utils.merkle_utils model.joyw
 """
-import torch
+import argparse
 import hashlib
-from typing import List, Dict, Any
+import json
+import mmap
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+
+from .tensor_hash import PARALLEL_THRESHOLD, _get_executor, as_little_endian
+from .weight_format import read_header
+
+# Parameter (data pointer, in-place version counter, dtype, shape, device)
+VersionKey = Tuple[int, int, Any, Tuple[int, ...], str]
+# Leaf tasks per full hash when parallel, so small tensors share a hand-off
+LEAF_BATCHES = 64
+# Bytes held in memory at a time when hashing tensors from a weight file
+FILE_BLOCK_SIZE = 8 * 1024 * 1024
 
 def compute_weight_hash(weight_tensor: torch.Tensor) -> str:
     """Compute hash of a single weight tensor."""
-    # Convert tensor to bytes
-    tensor_bytes = weight_tensor.cpu().numpy().tobytes()
-    
-    # Compute SHA256 hash
-    return hashlib.sha256(tensor_bytes).hexdigest()
+    array, _ = as_little_endian(weight_tensor)
+    return hashlib.sha256(memoryview(array.reshape(-1).view(np.uint8))).hexdigest()
+
+class WeightVerificationError(ValueError):
+    """Raised when model weights do not match their Merkle root."""
+
+def _leaf_digest(data: Any) -> str:
+    """Leaf digest of a tensor, or of its little-endian bytes as stored in a weight file."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(data).hexdigest()
+    return compute_weight_hash(data)
+
+def _hash_pair(left: str, right: str) -> str:
+    return hashlib.sha256((left + right).encode()).hexdigest()
+
+def _next_level(level: Sequence[str]) -> List[str]:
+    """Pair up a level, pairing an odd last node with itself."""
+    last = len(level) - 1
+    return [_hash_pair(level[i], level[min(i + 1, last)]) for i in range(0, len(level), 2)]
+
+def _build_levels(leaves: List[str]) -> List[List[str]]:
+    """Get every level of the tree from the leaves up to the root."""
+    if not leaves:
+        return []
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        levels.append(_next_level(levels[-1]))
+    return levels
+
+def _proofs_from_levels(names: List[str], levels: List[List[str]]) -> Dict[str, Any]:
+    parameters = {}
+    for index, name in enumerate(names):
+        siblings = []
+        position = index
+        for level in levels[:-1]:
+            # The last node of an odd level pairs with itself and needs no sibling
+            if position ^ 1 < len(level):
+                siblings.append(level[position ^ 1])
+            position //= 2
+        parameters[name] = {"index": index, "siblings": siblings}
+    root = levels[-1][0] if levels else hashlib.sha256(b"").hexdigest()
+    return {"root": root, "count": len(names), "parameters": parameters}
 
 def compute_merkle_root(hashes: List[str]) -> str:
     """Compute merkle root from a list of hashes."""
     if len(hashes) == 0:
         return hashlib.sha256(b"").hexdigest()
-    
-    if len(hashes) == 1:
-        return hashes[0]
-    
-    # If odd number of hashes, duplicate the last one
-    if len(hashes) % 2 == 1:
-        hashes.append(hashes[-1])
-    
-    new_hashes = []
-    for i in range(0, len(hashes), 2):
-        combined = hashes[i] + hashes[i + 1]
-        new_hash = hashlib.sha256(combined.encode()).hexdigest()
-        new_hashes.append(new_hash)
-    
-    return compute_merkle_root(new_hashes)
+
+    level = hashes
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+def _version_key(param: torch.Tensor) -> VersionKey:
+    return (param.data_ptr(), param._version, param.dtype, tuple(param.shape), str(param.device))
+
+class ModelMerkleTree:
+    def __init__(self, model: torch.nn.Module, parallel: Optional[bool] = None):
+        """Initialize the tree; nothing is hashed until root() is called.
+
+        Args:
+            model: Model whose trainable parameters are the leaves
+            parallel: Hash leaves on the thread pool; by default only when
+                the parameters to rehash add up to a large buffer
+        """
+        self._model = weakref.ref(model)
+        self.parallel = parallel
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._levels: List[List[str]] = []
+        # name -> (weak reference to the parameter, version it was hashed at, leaf digest)
+        self._leaves: Dict[str, Tuple[weakref.ref, VersionKey, str]] = {}
+        self.metrics = {
+            'leaves_hashed': 0,
+            'leaves_reused': 0,
+            'nodes_hashed': 0,
+            'full_builds': 0,
+            'incremental_updates': 0
+        }
+
+    def root(self) -> str:
+        """Bring the tree up to date with the model's weights and return its root."""
+        model = self._model()
+        if model is None:
+            raise ReferenceError("Model was garbage collected")
+
+        with self._lock:
+            return self._refresh(model)
+
+    def parameter_proofs(self) -> Dict[str, Any]:
+        """Get an inclusion proof for every parameter against the current root.
+
+        Returns:
+            Dict with the root, the leaf count and, per parameter name, its
+            leaf index and the sibling digests from leaf to root
+        """
+        model = self._model()
+        if model is None:
+            raise ReferenceError("Model was garbage collected")
+
+        with self._lock:
+            self._refresh(model)
+            return _proofs_from_levels(self._names, self._levels)
+
+    def invalidate(self, names: Optional[Iterable[str]] = None):
+        """Force parameters to be rehashed on the next root() call.
+
+        Writes through param.data bypass the version counter that in-place
+        updates and optimizer steps bump, so callers updating weights that
+        way mark the affected parameters here.
+
+        Args:
+            names: Parameter names to rehash; every parameter when omitted
+        """
+        with self._lock:
+            if names is None:
+                self._leaves.clear()
+            else:
+                for name in names:
+                    self._leaves.pop(name, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {**self.metrics, 'leaves': len(self._names), 'depth': len(self._levels)}
+
+    def _refresh(self, model: torch.nn.Module) -> str:
+        """Rehash stale leaves and their paths; the lock must be held."""
+        params = [(name, p) for name, p in model.named_parameters() if p.requires_grad]
+        stale = [i for i, (name, p) in enumerate(params) if not self._is_current(name, p)]
+
+        digests = self._hash_leaves([params[i][1] for i in stale])
+        for i, digest in zip(stale, digests):
+            name, param = params[i]
+            self._leaves[name] = (weakref.ref(param), _version_key(param), digest)
+        self.metrics['leaves_hashed'] += len(stale)
+        self.metrics['leaves_reused'] += len(params) - len(stale)
+
+        names = [name for name, _ in params]
+        if names != self._names:
+            self._rebuild(names)
+        elif stale:
+            self._update({i: self._leaves[names[i]][2] for i in stale})
+
+        if not self._levels:
+            return hashlib.sha256(b"").hexdigest()
+        return self._levels[-1][0]
+
+    def _is_current(self, name: str, param: torch.Tensor) -> bool:
+        entry = self._leaves.get(name)
+        return entry is not None and entry[0]() is param and entry[1] == _version_key(param)
+
+    def _hash_leaves(self, params: List[torch.Tensor]) -> List[str]:
+        sizes = [p.numel() * p.element_size() for p in params]
+        total = sum(sizes)
+        parallel = self.parallel if self.parallel is not None else total >= PARALLEL_THRESHOLD
+        if not parallel or len(params) < 2:
+            return [compute_weight_hash(p) for p in params]
+
+        # Device-to-host copies happen inside the tasks, so at most one batch
+        # per worker is resident on the host at a time
+        target = max(total // LEAF_BATCHES, 1)
+        batches, batch, batch_bytes = [], [], 0
+        for param, size in zip(params, sizes):
+            batch.append(param)
+            batch_bytes += size
+            if batch_bytes >= target:
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+        if batch:
+            batches.append(batch)
+
+        results = _get_executor().map(lambda b: [compute_weight_hash(p) for p in b], batches)
+        return [digest for batch_digests in results for digest in batch_digests]
+
+    def _rebuild(self, names: List[str]):
+        """Rebuild every level after parameters were added, removed or reordered."""
+        self._names = names
+        for name in set(self._leaves) - set(names):
+            del self._leaves[name]
+
+        self._levels = _build_levels([self._leaves[name][2] for name in names])
+        self.metrics['nodes_hashed'] += sum(len(level) for level in self._levels[1:])
+        self.metrics['full_builds'] += 1
+
+    def _update(self, changed: Dict[int, str]):
+        """Replace changed leaves and rehash only the nodes on their paths."""
+        for index, digest in changed.items():
+            self._levels[0][index] = digest
+
+        dirty = set(changed)
+        for depth in range(1, len(self._levels)):
+            below = self._levels[depth - 1]
+            last = len(below) - 1
+            dirty = {i // 2 for i in dirty}
+            for i in dirty:
+                self._levels[depth][i] = _hash_pair(below[2 * i], below[min(2 * i + 1, last)])
+            self.metrics['nodes_hashed'] += len(dirty)
+        self.metrics['incremental_updates'] += 1
+
+_trees: "weakref.WeakKeyDictionary[torch.nn.Module, ModelMerkleTree]" = weakref.WeakKeyDictionary()
+_trees_lock = threading.Lock()
+
+def model_merkle_tree(model: torch.nn.Module) -> ModelMerkleTree:
+    """Get the cached tree for a model, creating it on first use."""
+    with _trees_lock:
+        tree = _trees.get(model)
+        if tree is None:
+            tree = _trees[model] = ModelMerkleTree(model)
+        return tree
 
 def compute_model_merkle_root(model: torch.nn.Module) -> str:
-    """Compute merkle root of model weights."""
-    # Get all weight tensors
-    weight_hashes = []
-    for name, param in model.named_parameters():
-        if param.requires_grad:
-            weight_hash = compute_weight_hash(param.data)
-            weight_hashes.append(weight_hash)
-    
-    # Compute merkle root
-    return compute_merkle_root(weight_hashes)
+    """Compute merkle root of model weights, rehashing only parameters changed since the last call."""
+    return model_merkle_tree(model).root()
 
 def verify_model_weights(
     model: torch.nn.Module,
@@ -51,4 +273,212 @@ def verify_model_weights(
 ) -> bool:
     """Verify model weights against a merkle root."""
     computed_root = compute_model_merkle_root(model)
-    return computed_root == merkle_root
\ No newline at end of file
+    return computed_root == merkle_root
+
+def parameter_proofs(model: torch.nn.Module) -> Dict[str, Any]:
+    """Get per-parameter inclusion proofs for storing with a model's metadata."""
+    return model_merkle_tree(model).parameter_proofs()
+
+def verify_parameter(data: Any, proof: Dict[str, Any], count: int, merkle_root: str) -> bool:
+    """Verify one parameter against a model's merkle root.
+
+    Args:
+        data: Parameter tensor, or its bytes as stored in a weight file
+        proof: The parameter's entry from parameter_proofs()
+        count: Number of leaves in the tree
+        merkle_root: Root the parameter must belong to
+    """
+    node = _leaf_digest(data)
+    index = proof["index"]
+    siblings = iter(proof["siblings"])
+    width = count
+    if not 0 <= index < count:
+        return False
+
+    while width > 1:
+        if index == width - 1 and index % 2 == 0:
+            node = _hash_pair(node, node)
+        else:
+            sibling = next(siblings, None)
+            if sibling is None:
+                return False
+            node = _hash_pair(node, sibling) if index % 2 == 0 else _hash_pair(sibling, node)
+        index //= 2
+        width = (width + 1) // 2
+
+    return next(siblings, None) is None and node == merkle_root
+
+class LayerVerifier:
+    def __init__(self, proofs: Dict[str, Any], merkle_root: Optional[str] = None):
+        """Initialize a verifier that checks parameters one at a time as they load.
+
+        Instances are callable with (name, tensor), matching load_model's
+        check argument. Tensors without a proof, such as buffers, are skipped.
+
+        Args:
+            proofs: Proofs from parameter_proofs(), usually read from weight file metadata
+            merkle_root: Trusted root, e.g. from the model's on-chain registration;
+                without it the proofs' own root is used, which detects corrupted
+                tensors but not a consistently replaced model
+        """
+        self.merkle_root = merkle_root or proofs["root"]
+        if proofs["root"] != self.merkle_root:
+            raise WeightVerificationError(f"Proofs commit to root {proofs['root']}, expected {self.merkle_root}")
+        self.count = proofs["count"]
+        self.proofs = proofs["parameters"]
+        self.verified = set()
+
+    def __call__(self, name: str, data: Any):
+        proof = self.proofs.get(name)
+        if proof is None:
+            return
+        if not verify_parameter(data, proof, self.count, self.merkle_root):
+            raise WeightVerificationError(f"Parameter {name} does not match merkle root {self.merkle_root}")
+        self.verified.add(name)
+
+    def pending(self) -> List[str]:
+        """Get committed parameters that have not been verified yet."""
+        return [name for name in self.proofs if name not in self.verified]
+
+    def finish(self):
+        """Raise unless every committed parameter was seen and verified."""
+        pending = self.pending()
+        if pending:
+            raise WeightVerificationError(f"{len(pending)} committed parameters were never loaded, e.g. {pending[0]}")
+
+def verify_weight_file(
+    path: Union[str, Path],
+    merkle_root: Optional[str] = None
+) -> Dict[str, List[str]]:
+    """Check the tensors present in a possibly partially downloaded weight file.
+
+    Each tensor whose byte range has fully arrived is hashed on its own and
+    checked against its proof; the rest of the file is never read.
+
+    Args:
+        path: Weight file carrying parameter proofs in its metadata
+        merkle_root: Trusted root; the proofs' own root when omitted
+
+    Returns:
+        Dict of parameter names that are verified, corrupted and still pending
+    """
+    header, blob_start = read_header(path)
+    proofs = header.get("metadata", {}).get("merkle")
+    if proofs is None:
+        raise WeightVerificationError(f"{path} carries no parameter proofs")
+    verifier = LayerVerifier(proofs, merkle_root)
+
+    result = {"verified": [], "corrupted": [], "pending": []}
+    size = os.path.getsize(path)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for entry in header["tensors"]:
+                name = entry["name"]
+                if name not in verifier.proofs:
+                    continue
+                start = blob_start + entry["offset"]
+                end = start + entry["nbytes"]
+                if end > size:
+                    result["pending"].append(name)
+                    continue
+                try:
+                    verifier(name, view[start:end])
+                    result["verified"].append(name)
+                except WeightVerificationError:
+                    result["corrupted"].append(name)
+        finally:
+            view.release()
+
+    # Committed parameters absent from the header can never arrive
+    listed = {entry["name"] for entry in header["tensors"]}
+    result["corrupted"].extend(name for name in verifier.proofs if name not in listed)
+    return result
+
+def _file_leaf_names(header: Dict[str, Any], names: Optional[Sequence[str]]) -> List[str]:
+    """Get the tensors that are leaves, in leaf order."""
+    if names is not None:
+        return list(names)
+    proofs = header.get("metadata", {}).get("merkle")
+    if proofs:
+        return sorted(proofs["parameters"], key=lambda name: proofs["parameters"][name]["index"])
+    if "parameters" in header:
+        return header["parameters"]
+    raise ValueError("Weight file does not list its trainable parameters; pass their names")
+
+def file_leaf_hashes(
+    path: Union[str, Path],
+    names: Optional[Sequence[str]] = None,
+    block_size: int = FILE_BLOCK_SIZE
+) -> Tuple[List[str], List[str]]:
+    """Hash a weight file's parameters without loading the model.
+
+    Tensors are read in file order through one reusable buffer, so memory
+    stays at block_size however large the model is.
+
+    Args:
+        path: Weight file
+        names: Parameter names in leaf order; taken from the file when omitted
+        block_size: Bytes read per step
+
+    Returns:
+        Tuple of (parameter names, leaf digests) in leaf order
+    """
+    header, blob_start = read_header(path)
+    names = _file_leaf_names(header, names)
+    entries = {entry["name"]: entry for entry in header["tensors"]}
+    for name in names:
+        if name not in entries:
+            raise ValueError(f"{path} has no tensor {name}")
+
+    digests = {}
+    view = memoryview(bytearray(block_size))
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        for name in sorted(names, key=lambda name: entries[name]["offset"]):
+            f.seek(blob_start + entries[name]["offset"])
+            h = hashlib.sha256()
+            remaining = entries[name]["nbytes"]
+            while remaining:
+                read = f.readinto(view[:min(remaining, block_size)])
+                if not read:
+                    raise ValueError(f"{path} is truncated inside tensor {name}")
+                h.update(view[:read])
+                remaining -= read
+            digests[name] = h.hexdigest()
+
+    return names, [digests[name] for name in names]
+
+def compute_file_merkle_root(
+    path: Union[str, Path],
+    names: Optional[Sequence[str]] = None,
+    block_size: int = FILE_BLOCK_SIZE
+) -> str:
+    """Compute the root compute_model_merkle_root gives, straight from a weight file."""
+    _, leaves = file_leaf_hashes(path, names, block_size)
+    return compute_merkle_root(leaves)
+
+def file_parameter_proofs(
+    path: Union[str, Path],
+    names: Optional[Sequence[str]] = None,
+    block_size: int = FILE_BLOCK_SIZE
+) -> Dict[str, Any]:
+    """Build parameter proofs from a weight file, e.g. for a registration pipeline."""
+    names, leaves = file_leaf_hashes(path, names, block_size)
+    return _proofs_from_levels(names, _build_levels(leaves))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute Merkle roots of weight files without loading models")
+    parser.add_argument("weights", nargs="+", help=".joyw files to hash")
+    parser.add_argument("--proofs", action="store_true", help="Print per-parameter proofs as well")
+    args = parser.parse_args()
+
+    for path in args.weights:
+        if args.proofs:
+            print(json.dumps({"path": path, **file_parameter_proofs(path)}))
+        else:
+            print(json.dumps({"path": path, "root": compute_file_merkle_root(path)}))
+
+if __name__ == "__main__":
+    main()
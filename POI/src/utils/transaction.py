@@ -1,10 +1,227 @@
 """Transaction handling utilities."""
-from typing import Dict, Any
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple, Union
 from web3 import Web3
 from eth_typing import Hash32
 
-from ..constants import TRANSACTION_TIMEOUT, GAS_ESTIMATE_MARGIN
-from .blockchain import with_retry, estimate_gas_with_margin
+from ..constants import TRANSACTION_TIMEOUT, GAS_ESTIMATE_MARGIN, MAX_RETRIES
+from .blockchain import estimate_gas_with_margin, provider_key, with_retry
+
+class NonceManager:
+    """Assigns nonces locally so concurrent transactions never collide."""
+
+    def __init__(self, web3: Web3, address: str):
+        self.web3 = web3
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._lock = threading.Lock()
+        self.resyncs = 0
+
+    def next_nonce(self) -> int:
+        """Reserve the next nonce, syncing from the chain on first use."""
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.web3.eth.get_transaction_count(self.address, 'pending')
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def release(self, nonce: int):
+        """Return a nonce that was never broadcast.
+
+        The counter steps back when it was the latest one handed out;
+        otherwise later nonces are already in use and the counter resyncs
+        so the gap is filled.
+        """
+        with self._lock:
+            if self._next_nonce == nonce + 1:
+                self._next_nonce = nonce
+            else:
+                self._next_nonce = None
+                self.resyncs += 1
+
+    def resync(self):
+        """Drop the local counter so the next nonce is read from the chain."""
+        with self._lock:
+            self._next_nonce = None
+            self.resyncs += 1
+
+class TransactionSender:
+    """Builds, signs and broadcasts transactions for a single account."""
+
+    def __init__(
+        self,
+        web3: Web3,
+        account: Any,
+        max_in_flight: int = 64
+    ):
+        """Initialize the sender.
+
+        Args:
+            web3: Web3 instance
+            account: Local account used for signing
+            max_in_flight: Maximum concurrent unconfirmed transactions from async callers
+        """
+        self.web3 = web3
+        self.account = account
+        self.nonces = NonceManager(web3, account.address)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._metrics_lock = threading.Lock()
+
+        self.queued = 0
+        self.in_flight = 0
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.confirmation_ms: deque = deque(maxlen=1000)
+
+    def send(self, contract_call: Any, tx_params: Dict[str, Any]) -> bytes:
+        """Build, sign and broadcast a contract call without waiting for a receipt.
+
+        Args:
+            contract_call: Bound contract function, e.g. contract.functions.foo(1)
+            tx_params: Extra transaction fields such as 'gas' or 'value'
+
+        Returns:
+            Transaction hash
+        """
+        last_error = None
+
+        for _ in range(MAX_RETRIES):
+            nonce = self.nonces.next_nonce()
+            try:
+                tx = contract_call.build_transaction({
+                    'from': self.account.address,
+                    **self._fee_params(),
+                    **tx_params,
+                    'nonce': nonce
+                })
+                signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
+            except Exception:
+                # Gas estimation or signing failed before broadcast; hand the nonce back
+                self.nonces.release(nonce)
+                with self._metrics_lock:
+                    self.failed += 1
+                raise
+
+            try:
+                tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:
+                # Any failed broadcast leaves a gap, so re-read the nonce from the chain
+                self.nonces.resync()
+                if "nonce too low" not in str(e).lower():
+                    with self._metrics_lock:
+                        self.failed += 1
+                    raise
+                last_error = e
+                logging.warning(f"Nonce {nonce} too low for {self.account.address}, resyncing")
+                continue
+
+            with self._metrics_lock:
+                self.sent += 1
+            return tx_hash
+
+        with self._metrics_lock:
+            self.failed += 1
+        raise last_error
+
+    def send_and_wait(
+        self,
+        contract_call: Any,
+        tx_params: Dict[str, Any],
+        timeout: int = TRANSACTION_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Send a transaction and block until it is mined.
+
+        Returns:
+            Transaction receipt
+        """
+        tx_hash = self.send(contract_call, tx_params)
+        return self.wait_for_receipt(tx_hash, timeout)
+
+    def wait_for_receipt(self, tx_hash: bytes, timeout: int = TRANSACTION_TIMEOUT) -> Dict[str, Any]:
+        """Wait for a receipt, recording confirmation latency."""
+        start_time = time.time()
+        with self._metrics_lock:
+            self.in_flight += 1
+        try:
+            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        finally:
+            with self._metrics_lock:
+                self.in_flight -= 1
+
+        with self._metrics_lock:
+            self.confirmed += 1
+            self.confirmation_ms.append((time.time() - start_time) * 1000)
+        return receipt
+
+    async def send_async(self, contract_call: Any, tx_params: Dict[str, Any]) -> bytes:
+        """Send a transaction from async code without blocking the event loop."""
+        return await self._run_in_slot(self.send, contract_call, tx_params)
+
+    async def send_and_wait_async(
+        self,
+        contract_call: Any,
+        tx_params: Dict[str, Any],
+        timeout: int = TRANSACTION_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Send a transaction from async code and wait for its receipt."""
+        return await self._run_in_slot(self.send_and_wait, contract_call, tx_params, timeout)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, throughput and confirmation latency metrics."""
+        with self._metrics_lock:
+            latencies = sorted(self.confirmation_ms)
+            return {
+                'queue_depth': self.queued,
+                'in_flight': self.in_flight,
+                'sent': self.sent,
+                'confirmed': self.confirmed,
+                'failed': self.failed,
+                'nonce_resyncs': self.nonces.resyncs,
+                'confirmation_ms_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+                'confirmation_ms_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+            }
+
+    def _fee_params(self) -> Dict[str, Any]:
+        """Get fee fields for a new transaction."""
+        return {'gasPrice': self.web3.eth.gas_price}
+
+    async def _run_in_slot(self, func, *args):
+        """Run a blocking send in the thread pool, bounded by max_in_flight."""
+        with self._metrics_lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+
+        def run():
+            with self._slots:
+                with self._metrics_lock:
+                    self.queued -= 1
+                return func(*args)
+
+        return await loop.run_in_executor(None, run)
+
+_senders: Dict[Tuple[Union[str, int], str], TransactionSender] = {}
+_senders_lock = threading.Lock()
+
+def get_transaction_sender(web3: Web3, account: Any) -> TransactionSender:
+    """Get the process-wide sender for an account.
+
+    Components that sign with the same key against the same node share one
+    sender, and therefore one nonce sequence, even when each built its own
+    Web3 instance.
+    """
+    # The sender's reference to web3 keeps identity keys from being reused
+    key = (provider_key(web3), account.address)
+    with _senders_lock:
+        if key not in _senders:
+            _senders[key] = TransactionSender(web3, account)
+        return _senders[key]
 
 async def build_and_send_transaction(
     web3: Web3,
@@ -14,11 +231,14 @@ async def build_and_send_transaction(
 ) -> Dict[str, Any]:
     """Build and send a transaction with proper gas estimation and nonce handling.
     
+    Nonces are assigned by the account's shared TransactionSender, which
+    resyncs from the chain when the node reports a stale nonce.
+    
     Args:
         web3: Web3 instance
         contract_func: Contract function to call
         account: Account to send from
-        retry_nonce: Whether to retry with new nonce if transaction fails
+        retry_nonce: Whether to retry transient send failures
         
     Returns:
         Transaction receipt
@@ -26,6 +246,8 @@ async def build_and_send_transaction(
     Raises:
         RuntimeError: If transaction fails after retries
     """
+    sender = get_transaction_sender(web3, account)
+    
     async def estimate_gas():
         return await contract_func.estimate_gas({'from': account.address})
         
@@ -33,33 +255,16 @@ async def build_and_send_transaction(
     gas_estimate = await with_retry(estimate_gas)
     gas_limit = estimate_gas_with_margin(gas_estimate)
     
-    async def send_tx(nonce: int = None):
-        if nonce is None:
-            nonce = web3.eth.get_transaction_count(account.address)
-            
-        # Build transaction
-        tx = contract_func.build_transaction({
-            'from': account.address,
-            'gas': gas_limit,
-            'gasPrice': web3.eth.gas_price,
-            'nonce': nonce
-        })
-        
-        # Sign and send
-        signed_tx = web3.eth.account.sign_transaction(tx, account.key)
-        tx_hash = await web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
-        # Wait for receipt
-        receipt = await web3.eth.wait_for_transaction_receipt(tx_hash, timeout=TRANSACTION_TIMEOUT)
+    async def send_tx():
+        receipt = await sender.send_and_wait_async(
+            contract_func,
+            {'gas': gas_limit},
+            timeout=TRANSACTION_TIMEOUT
+        )
         if receipt['status'] != 1:
             raise RuntimeError("Transaction failed")
         return receipt
         
-    try:
-        return await with_retry(lambda: send_tx())
-    except Exception as e:
-        if retry_nonce and "nonce too low" in str(e).lower():
-            # Retry with fresh nonce
-            nonce = web3.eth.get_transaction_count(account.address)
-            return await send_tx(nonce)
-        raise
\ No newline at end of file
+    if retry_nonce:
+        return await with_retry(send_tx)
+    return await send_tx()
@@ -0,0 +1,325 @@
+"""
+Memory-mapped model weight format
+
+A weight file holds a small JSON header followed by one flat blob of
+little-endian tensor data, each tensor aligned to ALIGNMENT bytes:
+
+    MAGIC | version (u32) | header length (u64) | header JSON | padding | blob
+
+The header carries an architecture descriptor (importable module, class name
+and constructor kwargs) plus name, dtype, shape and blob offset for every
+tensor in the state dict; files saved from a model also list its trainable
+parameters, so their Merkle root can be computed without the model class.
+Loading maps the file read-only and wraps each tensor around the mapping,
+so nothing is copied or unpickled and processes on one host share the same
+page-cache pages.
+"""
+import argparse
+import importlib
+import itertools
+import json
+import mmap
+import struct
+import sys
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+import torch
+
+MAGIC = b"JOYW"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+WEIGHTS_FILENAME = "model.joyw"
+
+_PREAMBLE = struct.Struct("<4sIQ")
+
+# Called with each tensor's name and mapped data as it is read; raises to reject it
+TensorCheck = Callable[[str, torch.Tensor], None]
+
+def _align(offset: int, alignment: int = ALIGNMENT) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+def _dtype_from_name(name: str) -> torch.dtype:
+    dtype = getattr(torch, name.replace("torch.", ""), None)
+    if not isinstance(dtype, torch.dtype):
+        raise ValueError(f"Unsupported dtype in weight file: {name}")
+    return dtype
+
+def describe_architecture(model: torch.nn.Module, kwargs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the architecture descriptor for a model instance."""
+    cls = type(model)
+    return {
+        "module": cls.__module__,
+        "class": cls.__qualname__,
+        "kwargs": kwargs or {}
+    }
+
+def save_weights(
+    model_or_state: Union[torch.nn.Module, Dict[str, torch.Tensor]],
+    path: Union[str, Path],
+    architecture: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Write a model's state dict in the mmap weight format.
+
+    Args:
+        model_or_state: Model or state dict to save
+        path: Destination file
+        architecture: Architecture descriptor; derived from the model when omitted
+        metadata: JSON-serializable model metadata stored in the header,
+            such as per-parameter Merkle proofs
+
+    Returns:
+        The header that was written
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Weight files can only be written on little-endian hosts")
+
+    if isinstance(model_or_state, torch.nn.Module):
+        state = model_or_state.state_dict()
+        architecture = architecture or describe_architecture(model_or_state)
+        parameters = [name for name, param in model_or_state.named_parameters() if param.requires_grad]
+    else:
+        state = model_or_state
+        parameters = None
+
+    tensors = []
+    offset = 0
+    for name, tensor in state.items():
+        nbytes = tensor.numel() * tensor.element_size()
+        offset = _align(offset)
+        tensors.append({
+            "name": name,
+            "dtype": str(tensor.dtype).replace("torch.", ""),
+            "shape": list(tensor.shape),
+            "offset": offset,
+            "nbytes": nbytes
+        })
+        offset += nbytes
+
+    header = {
+        "architecture": architecture,
+        "byteorder": "little",
+        "alignment": ALIGNMENT,
+        "blob_size": offset,
+        "tensors": tensors
+    }
+    if parameters is not None:
+        header["parameters"] = parameters
+    if metadata:
+        header["metadata"] = metadata
+    header_bytes = json.dumps(header, sort_keys=True).encode()
+    blob_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (blob_start - f.tell()))
+
+        for entry, tensor in zip(tensors, state.values()):
+            f.write(b"\0" * (blob_start + entry["offset"] - f.tell()))
+            data = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8)
+            f.write(data.numpy().data)
+
+    return header
+
+def read_header(path: Union[str, Path]) -> Tuple[Dict[str, Any], int]:
+    """Read a weight file header.
+
+    Returns:
+        Tuple of (header, blob_start_offset)
+    """
+    with open(path, "rb") as f:
+        magic, version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a JOYW weight file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported weight format version {version}")
+        header = json.loads(f.read(header_len))
+
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"Weight file is {header['byteorder']}-endian, host is {sys.byteorder}-endian")
+    return header, _align(_PREAMBLE.size + header_len, header["alignment"])
+
+class MappedWeights:
+    """Read-only memory mapping of a weight file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.header, self.blob_start = read_header(self.path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def architecture(self) -> Optional[Dict[str, Any]]:
+        return self.header.get("architecture")
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.header.get("metadata", {})
+
+    def tensor(self, entry: Dict[str, Any]) -> torch.Tensor:
+        """Wrap one tensor around the mapping without copying."""
+        dtype = _dtype_from_name(entry["dtype"])
+        count = 1
+        for dim in entry["shape"]:
+            count *= dim
+        if count == 0:
+            return torch.empty(entry["shape"], dtype=dtype)
+
+        with warnings.catch_warnings():
+            # The mapping is read-only by design; inference never writes to weights
+            warnings.simplefilter("ignore", UserWarning)
+            flat = torch.frombuffer(
+                self._mmap,
+                dtype=dtype,
+                count=count,
+                offset=self.blob_start + entry["offset"]
+            )
+        return flat.view(entry["shape"])
+
+    def items(self, check: Optional[TensorCheck] = None) -> Iterator[Tuple[str, torch.Tensor]]:
+        """Yield tensors in file order, passing each to check before it is handed out."""
+        for entry in self.header["tensors"]:
+            tensor = self.tensor(entry)
+            if check is not None:
+                check(entry["name"], tensor)
+            yield entry["name"], tensor
+
+    def state_dict(self, check: Optional[TensorCheck] = None) -> Dict[str, torch.Tensor]:
+        return dict(self.items(check))
+
+def build_model(architecture: Dict[str, Any], meta: bool = True) -> torch.nn.Module:
+    """Instantiate a model from its architecture descriptor.
+
+    With meta=True parameters are created on the meta device, skipping
+    allocation of weights that are about to be replaced by the mapping.
+    """
+    module = importlib.import_module(architecture["module"])
+    cls = module
+    for attr in architecture["class"].split("."):
+        cls = getattr(cls, attr)
+    if not (isinstance(cls, type) and issubclass(cls, torch.nn.Module)):
+        raise ValueError(f"{architecture['module']}.{architecture['class']} is not a torch module")
+
+    kwargs = architecture.get("kwargs", {})
+    if meta:
+        try:
+            with torch.device("meta"):
+                return cls(**kwargs)
+        except (AttributeError, TypeError, RuntimeError):
+            pass
+    return cls(**kwargs)
+
+def load_model(
+    path: Union[str, Path],
+    model: Optional[torch.nn.Module] = None,
+    check: Optional[TensorCheck] = None
+) -> torch.nn.Module:
+    """Load a model whose parameters point directly into the mapped weight file.
+
+    Args:
+        path: Weight file
+        model: Existing model instance to fill; built from the descriptor when omitted
+        check: Called on each tensor as it is mapped, before any is assigned;
+            reading a tensor to verify it is what pages it in, so checks run
+            interleaved with loading rather than as a pass over the whole model
+
+    Returns:
+        Model in eval mode
+    """
+    weights = MappedWeights(path)
+    if model is None:
+        if not weights.architecture:
+            raise ValueError(f"{path} has no architecture descriptor; pass a model instance")
+        model = build_model(weights.architecture)
+
+    state = weights.state_dict(check)
+    try:
+        model.load_state_dict(state, assign=True)
+    except TypeError:
+        # torch < 2.1 cannot assign; fall back to copying into allocated parameters
+        if _has_meta_tensors(model):
+            model = build_model(weights.architecture, meta=False)
+        model.load_state_dict(state)
+
+    # Non-persistent buffers are not in the file, so they need a real instance
+    if _has_meta_tensors(model):
+        model = build_model(weights.architecture, meta=False)
+        model.load_state_dict(state, assign=True)
+
+    model.eval()
+    return model
+
+def _has_meta_tensors(model: torch.nn.Module) -> bool:
+    return any(t.is_meta for t in itertools.chain(model.parameters(), model.buffers()))
+
+def is_weight_file(data: Any) -> bool:
+    """Check whether raw bytes hold a weight file."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+def load_model_from_bytes(
+    data: bytes,
+    cache_path: Union[str, Path],
+    model: Optional[torch.nn.Module] = None
+) -> torch.nn.Module:
+    """Persist downloaded weight-file bytes and load them through the mapping.
+
+    Writing to cache_path first lets later loads, and other processes on the
+    host, map the same file instead of holding private copies.
+    """
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(cache_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    tmp_path.replace(cache_path)
+    return load_model(cache_path, model)
+
+def find_weights(model_dir: Union[str, Path]) -> Optional[Path]:
+    """Get the mmap weight file in a model directory, if one exists."""
+    path = Path(model_dir) / WEIGHTS_FILENAME
+    return path if path.exists() else None
+
+def convert_checkpoint(
+    checkpoint_path: Union[str, Path],
+    output_path: Optional[Union[str, Path]] = None,
+    architecture_kwargs: Optional[Dict[str, Any]] = None
+) -> Path:
+    """Convert a pickled torch.save checkpoint to the mmap weight format.
+
+    Args:
+        checkpoint_path: .pt file holding a whole module or a state dict
+        output_path: Destination; defaults to the checkpoint path with a .joyw suffix
+        architecture_kwargs: Constructor kwargs recorded in the descriptor
+
+    Returns:
+        Path of the written weight file
+    """
+    checkpoint_path = Path(checkpoint_path)
+    output_path = Path(output_path) if output_path else checkpoint_path.with_suffix(".joyw")
+
+    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=False)
+    if isinstance(checkpoint, torch.nn.Module):
+        architecture = describe_architecture(checkpoint, architecture_kwargs)
+        save_weights(checkpoint, output_path, architecture)
+    elif isinstance(checkpoint, dict):
+        save_weights(checkpoint, output_path)
+    else:
+        raise ValueError(f"Unsupported checkpoint type: {type(checkpoint).__name__}")
+
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert .pt checkpoints to the mmap weight format")
+    parser.add_argument("checkpoints", nargs="+", help=".pt files to convert")
+    parser.add_argument("--kwargs", default="{}", help="Constructor kwargs as JSON")
+    args = parser.parse_args()
+
+    for checkpoint in args.checkpoints:
+        output = convert_checkpoint(checkpoint, architecture_kwargs=json.loads(args.kwargs))
+        print(f"{checkpoint} -> {output}")
+
+if __name__ == "__main__":
+    main()
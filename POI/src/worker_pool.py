@@ -0,0 +1,326 @@
+"""Multi-process CPU inference backend with shared model weights."""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import torch
+import torch.multiprocessing as mp
+
+from .utils.weight_format import load_model
+
+ModelSource = Union[str, Path, torch.nn.Module]
+
+def _dtype_name(dtype: torch.dtype) -> str:
+    return str(dtype).replace("torch.", "")
+
+def _worker_main(
+    model_source: ModelSource,
+    input_shm_name: str,
+    output_shm_name: str,
+    conn: Any,
+    cores: Optional[List[int]],
+    num_threads: int
+):
+    """Worker process loop: read inputs from shared memory, write outputs back."""
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(num_threads)
+
+    # Weight files are mapped (shared page cache); modules arrive backed by shared memory
+    if isinstance(model_source, (str, Path)):
+        model = load_model(model_source)
+    else:
+        model = model_source
+    model.eval()
+
+    input_shm = shared_memory.SharedMemory(name=input_shm_name)
+    output_shm = shared_memory.SharedMemory(name=output_shm_name)
+    conn.send(("ready", None))
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+
+            try:
+                kind, payload = message
+                if kind == "shm":
+                    shape, dtype_name = payload
+                    dtype = getattr(torch, dtype_name)
+                    numel = 1
+                    for dim in shape:
+                        numel *= dim
+                    input_data = torch.frombuffer(input_shm.buf, dtype=dtype, count=numel).view(shape)
+                else:
+                    input_data = payload
+
+                with torch.no_grad():
+                    output = model(input_data).contiguous()
+
+                nbytes = output.numel() * output.element_size()
+                if nbytes <= output_shm.size:
+                    out_view = torch.frombuffer(output_shm.buf, dtype=output.dtype, count=output.numel())
+                    out_view.copy_(output.reshape(-1))
+                    conn.send(("shm", (list(output.shape), _dtype_name(output.dtype))))
+                else:
+                    conn.send(("inline", output))
+
+            except Exception as e:
+                conn.send(("error", repr(e)))
+    finally:
+        # Drop views on the slabs so the mappings can be closed
+        input_data = output = out_view = None
+        input_shm.close()
+        output_shm.close()
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Any
+    input_shm: shared_memory.SharedMemory
+    output_shm: shared_memory.SharedMemory
+    cores: Optional[List[int]]
+    reply_timeout: Optional[float] = None
+
+    def run(self, input_data: torch.Tensor) -> torch.Tensor:
+        """Send one input through the worker and wait for its output.
+
+        A worker that does not reply within reply_timeout is killed, so the
+        pool replaces it instead of blocking its callers behind it.
+        """
+        input_data = input_data.detach().cpu().contiguous()
+        nbytes = input_data.numel() * input_data.element_size()
+
+        if 0 < nbytes <= self.input_shm.size:
+            view = torch.frombuffer(self.input_shm.buf, dtype=input_data.dtype, count=input_data.numel())
+            view.copy_(input_data.reshape(-1))
+            self.conn.send(("shm", (list(input_data.shape), _dtype_name(input_data.dtype))))
+        else:
+            self.conn.send(("inline", input_data))
+
+        if self.reply_timeout is not None and not self.conn.poll(self.reply_timeout):
+            self.process.terminate()
+            self.process.join(timeout=5)
+            raise TimeoutError(f"Worker did not reply within {self.reply_timeout}s")
+        kind, payload = self.conn.recv()
+        if kind == "error":
+            raise RuntimeError(f"Worker inference failed: {payload}")
+        if kind == "inline":
+            return payload
+
+        shape, dtype_name = payload
+        dtype = getattr(torch, dtype_name)
+        numel = 1
+        for dim in shape:
+            numel *= dim
+        # Copy out of the slab before the worker is handed its next request
+        return torch.frombuffer(self.output_shm.buf, dtype=dtype, count=numel).view(shape).clone()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        for shm in (self.input_shm, self.output_shm):
+            shm.close()
+            shm.unlink()
+
+class InferenceWorkerPool:
+    def __init__(
+        self,
+        workers_per_model: int = 2,
+        threads_per_worker: int = 1,
+        pin_cores: bool = True,
+        max_tensor_bytes: int = 64 * 1024 * 1024,
+        reply_timeout: Optional[float] = 60.0
+    ):
+        """Initialize the worker pool.
+
+        Args:
+            workers_per_model: Worker processes started for each model
+            threads_per_worker: Intra-op torch threads in each worker
+            pin_cores: Pin each worker to its own set of cores (Linux only)
+            max_tensor_bytes: Size of each worker's input and output shared-memory slab;
+                larger tensors fall back to being pickled over the pipe
+            reply_timeout: Seconds to wait for a worker's output before killing and
+                replacing it; None waits forever
+        """
+        self.workers_per_model = workers_per_model
+        self.threads_per_worker = threads_per_worker
+        self.pin_cores = pin_cores
+        self.max_tensor_bytes = max_tensor_bytes
+        self.reply_timeout = reply_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        # Spawns run both under _lock (start_model) and outside it (_respawn)
+        self._core_lock = threading.Lock()
+        self._next_core = 0
+        self.workers: Dict[str, List[_Worker]] = {}
+        self.idle: Dict[str, queue.Queue] = {}
+        self.sources: Dict[str, ModelSource] = {}
+        self.respawned = 0
+
+    def has_model(self, model_id: str) -> bool:
+        return model_id in self.workers
+
+    def start_model(
+        self,
+        model_id: str,
+        source: ModelSource,
+        num_workers: Optional[int] = None
+    ):
+        """Start worker processes serving a model.
+
+        Args:
+            model_id: Model identifier
+            source: Path to a memory-mapped weight file, or a loaded module whose
+                weights are moved to shared memory and shared by all workers
+            num_workers: Overrides workers_per_model for this model
+        """
+        with self._lock:
+            if model_id in self.workers:
+                return
+
+            if isinstance(source, torch.nn.Module):
+                source.share_memory()
+
+            workers = []
+            idle = queue.Queue()
+            for _ in range(num_workers or self.workers_per_model):
+                worker = self._spawn_worker(source)
+                workers.append(worker)
+                idle.put(worker)
+
+            self.workers[model_id] = workers
+            self.idle[model_id] = idle
+            self.sources[model_id] = source
+            logging.info(f"Started {len(workers)} inference workers for {model_id}")
+
+    def run(self, model_id: str, input_data: torch.Tensor) -> torch.Tensor:
+        """Run inference on the next free worker, blocking until it finishes."""
+        if model_id not in self.idle:
+            raise ValueError(f"No workers started for model {model_id}")
+
+        if not self.workers.get(model_id):
+            raise RuntimeError(f"No live workers for model {model_id}")
+
+        idle = self.idle[model_id]
+        worker = idle.get()
+        try:
+            return worker.run(input_data)
+        finally:
+            if worker.process.is_alive():
+                idle.put(worker)
+            else:
+                self._respawn(model_id, worker)
+
+    async def run_async(self, model_id: str, input_data: torch.Tensor) -> torch.Tensor:
+        """Run inference without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, model_id, input_data)
+
+    def stop_model(self, model_id: str):
+        """Stop all workers serving a model."""
+        with self._lock:
+            workers = self.workers.pop(model_id, [])
+            self.idle.pop(model_id, None)
+            self.sources.pop(model_id, None)
+        for worker in workers:
+            worker.stop()
+
+    def shutdown(self):
+        """Stop every worker process."""
+        for model_id in list(self.workers):
+            self.stop_model(model_id)
+
+    def _respawn(self, model_id: str, dead: _Worker):
+        """Replace a crashed worker so later requests are not routed to it."""
+        logging.error(f"Inference worker for {model_id} exited with code {dead.process.exitcode}, respawning")
+        dead.stop()
+        with self._lock:
+            workers = self.workers.get(model_id)
+            source = self.sources.get(model_id)
+            idle = self.idle.get(model_id)
+        if workers is None:
+            # The model was stopped while the request ran
+            return
+
+        try:
+            replacement = self._spawn_worker(source)
+        except Exception as e:
+            logging.error(f"Failed to respawn inference worker for {model_id}: {e}")
+            with self._lock:
+                if dead in workers:
+                    workers.remove(dead)
+            return
+
+        with self._lock:
+            if dead in workers:
+                workers[workers.index(dead)] = replacement
+            else:
+                workers.append(replacement)
+            self.respawned += 1
+        idle.put(replacement)
+
+    def _spawn_worker(self, source: ModelSource) -> _Worker:
+        cores = self._allocate_cores() if self.pin_cores else None
+        segments: List[shared_memory.SharedMemory] = []
+        parent_conn = child_conn = process = None
+        try:
+            input_shm = shared_memory.SharedMemory(create=True, size=self.max_tensor_bytes)
+            segments.append(input_shm)
+            output_shm = shared_memory.SharedMemory(create=True, size=self.max_tensor_bytes)
+            segments.append(output_shm)
+            parent_conn, child_conn = self._ctx.Pipe()
+
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(source, input_shm.name, output_shm.name, child_conn, cores, self.threads_per_worker),
+                daemon=True
+            )
+            process.start()
+            # Only the child holds its end now, so a crash during load reads as EOF
+            child_conn.close()
+
+            status, _ = parent_conn.recv()
+            if status != "ready":
+                raise RuntimeError(f"Unexpected worker status {status}")
+        except Exception as e:
+            if process is not None and process.pid is not None:
+                process.terminate()
+                process.join(timeout=5)
+            for conn in (parent_conn, child_conn):
+                if conn is not None:
+                    conn.close()
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+            raise RuntimeError(f"Inference worker failed to start: {e!r}") from e
+        return _Worker(process, parent_conn, input_shm, output_shm, cores, self.reply_timeout)
+
+    def _allocate_cores(self) -> List[int]:
+        """Assign the next threads_per_worker cores, wrapping around the machine."""
+        if hasattr(os, "sched_getaffinity"):
+            available = sorted(os.sched_getaffinity(0))
+        else:
+            available = list(range(os.cpu_count() or 1))
+
+        with self._core_lock:
+            cores = [
+                available[(self._next_core + i) % len(available)]
+                for i in range(self.threads_per_worker)
+            ]
+            self._next_core += self.threads_per_worker
+        return cores
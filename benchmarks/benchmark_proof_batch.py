@@ -0,0 +1,75 @@
+"""
+Benchmark ZKProver batch proof aggregation
+
+Generates execution proofs, aggregates them into one Merkle commitment and
+measures build time, peak memory, inclusion proof size and verification
+time per proof.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_proof_batch --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from src.zk_prover import ZKProver
+
+def generate_proofs(prover: ZKProver, count: int):
+    """Yield proofs the way nodes produce them, without holding them all."""
+    for i in range(count):
+        proof, _ = prover.generate_proof(prover.model_id, None, os.urandom(64), f"output-{i}".encode())
+        yield proof
+
+def run(size: int, samples: int, seed: int):
+    prover = ZKProver("benchmark-model")
+    proofs = list(generate_proofs(prover, size))
+
+    start = time.perf_counter()
+    batch = prover.aggregate_proofs(proofs)
+    build_s = time.perf_counter() - start
+
+    # tracemalloc slows allocation down, so measure memory in a separate build
+    tracemalloc.start()
+    prover.aggregate_proofs(proofs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rng = random.Random(seed)
+    indices = [rng.randrange(size) for _ in range(samples)]
+    commitment = batch.commitment()
+
+    start = time.perf_counter()
+    inclusions = [batch.inclusion_proof(i) for i in indices]
+    prove_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    verified = sum(ZKProver.verify_inclusion(proofs[i], p, commitment) for i, p in zip(indices, inclusions))
+    verify_s = time.perf_counter() - start
+
+    return {
+        "proofs": size,
+        "build_ms": build_s * 1000,
+        "build_us_per_proof": build_s / size * 1e6,
+        "peak_memory_mb": peak / 1024**2,
+        "tree_mb": batch.nbytes / 1024**2,
+        "commitment_bytes": len(json.dumps(commitment)),
+        "inclusion_proof_bytes": max(len(json.dumps(p.to_dict())) for p in inclusions),
+        "inclusion_us": prove_s / samples * 1e6,
+        "verify_us": verify_s / samples * 1e6,
+        "verified": verified == samples
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps([run(size, args.samples, args.seed) for size in args.sizes], indent=2))
+
+if __name__ == "__main__":
+    main()
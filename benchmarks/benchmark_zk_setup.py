@@ -0,0 +1,58 @@
+"""
+Benchmark ZKProver setup with and without the persistent artifact store
+
+For each constraint count, measures a cold setup that generates and writes
+the artifacts, a warm setup in a fresh process-equivalent store that maps
+them from disk, and a setup with no store at all. The warm path costs a
+header parse however large the circuit; entries are decoded on access.
+
+Run from the repository root:
+    python -m benchmarks.benchmark_zk_setup --constraints 100000 1000000
+"""
+import argparse
+import json
+import tempfile
+import time
+
+from src.utils.setup_store import SetupArtifactStore
+from src.zk_prover import ZKProver
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--constraints", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--inputs", type=int, default=16)
+    args = parser.parse_args()
+
+    results = []
+    for num_constraints in args.constraints:
+        params = {"num_constraints": num_constraints, "num_inputs": args.inputs}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            _, uncached = timed(lambda: ZKProver("bench").setup(params))
+            _, cold = timed(lambda: ZKProver("bench", setup_cache_dir=cache_dir).setup(params))
+
+            # A fresh store stands in for a restarted process
+            store = SetupArtifactStore(cache_dir)
+            prover = ZKProver("bench")
+            prover.setup_store = store
+            (proving_key, _), warm = timed(lambda: prover.setup(params))
+            _, first_access = timed(lambda: proving_key["points"][num_constraints // 2])
+            store.close()
+
+        results.append({
+            "num_constraints": num_constraints,
+            "uncached_s": uncached,
+            "cold_store_s": cold,
+            "warm_load_s": warm,
+            "first_point_access_s": first_access,
+            "speedup": uncached / warm
+        })
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Edge Computing Node Implementation with Sovereign RPC
 import asyncio
 import json
 import logging
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 import torch
 from web3 import Web3
@@ -13,6 +14,10 @@ from eth_typing import Address
 from .inference_node import InferenceNode
 from .zk_prover import ZKProver
 from .sovereign_rpc_node import SovereignRPCNode
+from .utils.transaction import get_transaction_sender
+from .utils.weight_format import is_weight_file, load_model_from_bytes
+from .utils.tensor_codec import to_torch
+from .utils.latency import get_latency_recorder
 
 class EdgeNode(InferenceNode):
     def __init__(
@@ -23,13 +28,16 @@ class EdgeNode(InferenceNode):
         rpc_config_path: str,
         web3_provider: str = "http://localhost:8545",
         host: str = "0.0.0.0",
-        port: int = 8080
+        port: int = 8080,
+        models_dir: str = "./models"
     ):
         """Initialize an edge computing node."""
         super().__init__(private_key, poi_address, web3_provider)
+        self.tx_sender = get_transaction_sender(self.web3, self.account)
         self.coordinator_contract = self._load_coordinator(coordinator_address)
         self.host = host
         self.port = port
+        self.models_dir = Path(models_dir)
         self.active_tasks: Dict[str, asyncio.Task] = {}
         
         # Initialize sovereign RPC node
@@ -48,19 +56,14 @@ class EdgeNode(InferenceNode):
         compute_capacity = self._get_compute_capacity()
         stake_amount = Web3.to_wei(1000, 'ether')  # 1000 JOY tokens
         
-        tx = self.coordinator_contract.functions.registerNode(
-            f"{self.host}:{self.port}",
-            compute_capacity,
-            stake_amount
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        await self.tx_sender.send_async(
+            self.coordinator_contract.functions.registerNode(
+                f"{self.host}:{self.port}",
+                compute_capacity,
+                stake_amount
+            ),
+            {'gas': 2000000}
+        )
         
         # Start background tasks
         asyncio.create_task(self._heartbeat_loop())
@@ -74,8 +77,11 @@ class EdgeNode(InferenceNode):
             if not model_data:
                 raise ValueError(f"Model {model_id} not found")
                 
-            # Load model
-            model = torch.load(model_data)
+            # Map weight files straight from the local cache; pickles are a legacy fallback
+            if is_weight_file(model_data):
+                model = load_model_from_bytes(model_data, self.models_dir / f"{model_id}.joyw")
+            else:
+                model = torch.load(model_data)
             model.eval()
             if torch.cuda.is_available():
                 model = model.cuda()
@@ -89,18 +95,13 @@ class EdgeNode(InferenceNode):
             )
             
             # Record on chain
-            tx = self.poi_contract.functions.recordModelLoad(
-                Web3.to_bytes(hexstr=model_id),
-                proof
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 200000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            await self.tx_sender.send_async(
+                self.poi_contract.functions.recordModelLoad(
+                    Web3.to_bytes(hexstr=model_id),
+                    proof
+                ),
+                {'gas': 200000}
+            )
             
         except Exception as e:
             logging.error(f"Failed to load model {model_id}: {e}")
@@ -119,9 +120,10 @@ class EdgeNode(InferenceNode):
         if not input_data:
             raise ValueError(f"Input data not found for task {task_id}")
             
-        # Convert to tensor if needed
-        if not isinstance(input_data, torch.Tensor):
-            input_data = torch.tensor(input_data)
+        # Binary payloads arrive as arrays viewing the received buffer; JSON lists are legacy
+        if isinstance(input_data, dict):
+            input_data = input_data.get('input', input_data.get('data'))
+        input_data = to_torch(input_data)
             
         return {
             'data': input_data,
@@ -129,53 +131,73 @@ class EdgeNode(InferenceNode):
             'model_id': task['modelId']
         }
         
-    async def execute_inference(self, model_id: str, input_data: Any) -> Dict[str, Any]:
-        """Execute model inference with proofs."""
-        if model_id not in self.models:
-            await self._load_model_from_ipfs(model_id)
+    async def execute_inference(
+        self,
+        model_id: str,
+        input_data: Any,
+        include_timings: bool = False
+    ) -> Dict[str, Any]:
+        """Execute model inference with proofs.
+        
+        Args:
+            model_id: Model to run
+            input_data: Input tensor
+            include_timings: Add per-stage latencies in ms to the result
+        """
+        recorder = get_latency_recorder()
+        trace: Dict[str, float] = {}
+        
+        with recorder.span(model_id, 'load', trace):
+            if model_id not in self.models:
+                await self._load_model_from_ipfs(model_id)
             
         model = self.models[model_id]
         
         with torch.no_grad():
             # Run inference
-            if torch.cuda.is_available():
-                input_data = input_data.cuda()
-            output_data = model(input_data)
+            with recorder.span(model_id, 'transfer', trace):
+                if torch.cuda.is_available():
+                    input_data = input_data.cuda()
+            with recorder.span(model_id, 'forward', trace):
+                output_data = model(input_data)
+                if output_data.is_cuda:
+                    torch.cuda.synchronize()
             
             # Generate proof
-            proof = self.zk_prover.generate_proof(
-                model_id,
-                input_data,
-                output_data
-            )
+            with recorder.span(model_id, 'proof', trace):
+                proof = self.zk_prover.generate_proof(
+                    model_id,
+                    input_data,
+                    output_data
+                )
             
             # Store result through RPC node
-            result_cid = await self.rpc_node.store_data({
-                'output': output_data.cpu().numpy().tolist(),
-                'proof': proof.hex()
-            })
+            with recorder.span(model_id, 'store', trace):
+                result_cid = await self.rpc_node.store_data({
+                    'output': output_data.cpu().numpy(),
+                    'proof': proof.hex()
+                })
             
             # Record on chain
-            tx = self.poi_contract.functions.recordInference(
-                Web3.to_bytes(hexstr=model_id),
-                Web3.to_bytes(hexstr=result_cid),
-                proof
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 300000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            with recorder.span(model_id, 'submit', trace):
+                tx_hash = await self.tx_sender.send_async(
+                    self.poi_contract.functions.recordInference(
+                        Web3.to_bytes(hexstr=model_id),
+                        Web3.to_bytes(hexstr=result_cid),
+                        proof
+                    ),
+                    {'gas': 300000}
+                )
             
-            return {
+            result = {
                 'output': output_data.cpu().numpy(),
                 'result_cid': result_cid,
                 'proof': proof.hex(),
                 'tx_hash': tx_hash.hex()
             }
+            if include_timings:
+                result['timings'] = trace
+            return result
             
     def _get_compute_capacity(self) -> int:
         """Get the node's compute capacity in FLOPS."""
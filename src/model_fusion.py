@@ -12,6 +12,7 @@ import torch
 import numpy as np
 from .model_marketplace import ModelMarketplace
 from .utils.ipfs_utils import IPFSStorage
+from .utils.transaction import get_transaction_sender
 
 class ModelFusion:
     def __init__(
@@ -24,6 +25,7 @@ class ModelFusion:
         """Initialize the model fusion engine."""
         self.web3 = Web3(Web3.HTTPProvider(web3_provider))
         self.account = Account.from_key(private_key)
+        self.tx_sender = get_transaction_sender(self.web3, self.account)
         self.fusion_contract = self._load_fusion_contract(fusion_contract_address)
         self.marketplace = ModelMarketplace(private_key, marketplace_address, web3_provider)
         self.ipfs = IPFSStorage()
@@ -154,21 +156,15 @@ class ModelFusion:
         ]
         
         # Register on blockchain
-        tx_hash = self.fusion_contract.functions.createFusedModel(
-            component_model_ids_bytes,
-            royalty_shares,
-            metadata_uri,
-            price_wei
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 3000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx_hash, self.account.key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.tx_sender.send_and_wait(
+            self.fusion_contract.functions.createFusedModel(
+                component_model_ids_bytes,
+                royalty_shares,
+                metadata_uri,
+                price_wei
+            ),
+            {'gas': 3000000}
+        )
         
         # Extract the fused model ID from the event logs
         fused_model_id = None
@@ -219,18 +215,12 @@ class ModelFusion:
             if isinstance(fused_model_id, str):
                 fused_model_id = bytes.fromhex(fused_model_id.replace('0x', ''))
                 
-            tx_hash = self.fusion_contract.functions.useFusedModel(
-                fused_model_id
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx_hash, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            self.tx_sender.send_and_wait(
+                self.fusion_contract.functions.useFusedModel(
+                    fused_model_id
+                ),
+                {'gas': 2000000}
+            )
             
             return True
             
@@ -8,6 +8,7 @@ from eth_typing import Address
 import ipfs_client
 import json
 import os
+from .utils.transaction import get_transaction_sender
 
 class ModelMarketplace:
     def __init__(
@@ -19,6 +20,7 @@ class ModelMarketplace:
         """Initialize the decentralized AI model marketplace."""
         self.web3 = Web3(Web3.HTTPProvider(web3_provider))
         self.account = Account.from_key(private_key)
+        self.tx_sender = get_transaction_sender(self.web3, self.account)
         self.contract = self._load_contract(marketplace_address)
         self.ipfs = ipfs_client.connect()
         
@@ -38,20 +40,14 @@ class ModelMarketplace:
         """Create a new personal store in the marketplace."""
         store_id = Web3.keccak(text=f"{self.account.address}:{name}")
         
-        tx = self.contract.functions.createStore(
-            store_id,
-            name,
-            description
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        self.tx_sender.send_and_wait(
+            self.contract.functions.createStore(
+                store_id,
+                name,
+                description
+            ),
+            {'gas': 2000000}
+        )
         
         return store_id.hex()
 
@@ -62,19 +58,13 @@ class ModelMarketplace:
     ) -> bool:
         """Update the caller's store information."""
         try:
-            tx = self.contract.functions.updateStore(
-                name,
-                description
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            self.tx_sender.send_and_wait(
+                self.contract.functions.updateStore(
+                    name,
+                    description
+                ),
+                {'gas': 2000000}
+            )
             
             return True
         except Exception as e:
@@ -119,26 +109,20 @@ class ModelMarketplace:
         model_id = Web3.keccak(text=f"{self.account.address}:{name}:{version}")
         
         # Register on blockchain
-        tx = self.contract.functions.registerModel(
-            model_id,
-            name,
-            description,
-            version,
-            metadata_hash,
-            doc_hash,
-            sample_hash,
-            tags,
-            price
-        ).build_transaction({
-            'from': self.account.address,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        self.tx_sender.send_and_wait(
+            self.contract.functions.registerModel(
+                model_id,
+                name,
+                description,
+                version,
+                metadata_hash,
+                doc_hash,
+                sample_hash,
+                tags,
+                price
+            ),
+            {'gas': 2000000}
+        )
         
         return model_id.hex()
         
@@ -171,26 +155,20 @@ class ModelMarketplace:
             else:
                 metadata_hash = current['metadata']
             
-            tx = self.contract.functions.updateModel(
-                Web3.to_bytes(hexstr=model_id),
-                name,
-                description,
-                version,
-                metadata_hash,
-                doc_hash,
-                sample_hash,
-                tags or current['tags'],
-                price or current['price']
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            self.tx_sender.send_and_wait(
+                self.contract.functions.updateModel(
+                    Web3.to_bytes(hexstr=model_id),
+                    name,
+                    description,
+                    version,
+                    metadata_hash,
+                    doc_hash,
+                    sample_hash,
+                    tags or current['tags'],
+                    price or current['price']
+                ),
+                {'gas': 2000000}
+            )
             
             return True
             
@@ -254,19 +232,13 @@ class ModelMarketplace:
         try:
             execution_id = Web3.keccak(text=f"{model_id}:{self.account.address}:{self.web3.eth.block_number}")
             
-            tx = self.contract.functions.useModel(
-                Web3.to_bytes(hexstr=model_id),
-                execution_id
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            self.tx_sender.send_and_wait(
+                self.contract.functions.useModel(
+                    Web3.to_bytes(hexstr=model_id),
+                    execution_id
+                ),
+                {'gas': 2000000}
+            )
             
             return True
             
@@ -277,18 +249,12 @@ class ModelMarketplace:
     def deactivate_model(self, model_id: str) -> bool:
         """Deactivate a model from the marketplace."""
         try:
-            tx = self.contract.functions.deactivateModel(
-                Web3.to_bytes(hexstr=model_id)
-            ).build_transaction({
-                'from': self.account.address,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.account.address)
-            })
-            
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-            tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            self.tx_sender.send_and_wait(
+                self.contract.functions.deactivateModel(
+                    Web3.to_bytes(hexstr=model_id)
+                ),
+                {'gas': 2000000}
+            )
             
             return True
             
@@ -16,6 +16,9 @@ from eth_account import Account
 from eth_typing import Address
 
 from .zk_prover import ZKProver
+from .utils.transaction import get_transaction_sender
+from .utils.latency import get_latency_recorder
+from .utils.tensor_codec import decode_payload, encode_payload, has_tensors, is_tensor_payload
 
 class SovereignRPCNode:
     def __init__(
@@ -38,6 +41,7 @@ class SovereignRPCNode:
         # Initialize Web3
         self.web3 = Web3(Web3.HTTPProvider(web3_provider))
         self.account = Account.from_key(private_key)
+        self.tx_sender = get_transaction_sender(self.web3, self.account)
         
         # Initialize IPFS client
         self.ipfs = aioipfs.AsyncIPFS()
@@ -58,8 +62,23 @@ class SovereignRPCNode:
         self.pinned_data: Dict[str, Any] = {}
         self.data_providers: Dict[str, List[str]] = {}
         
+        # Other components in this process exported through our metrics server
+        self.metrics_sources: List[Any] = []
+        
+    def add_metrics_source(self, source: Any):
+        """Serve another component's metrics from this node's Prometheus endpoint.
+        
+        Args:
+            source: Object with a register_prometheus(registry=None) method,
+                e.g. an InferenceNode or TaskScheduler
+        """
+        self.metrics_sources.append(source)
+        
     async def start(self):
         """Start the RPC node."""
+        # Keep cached fees current for all transaction builders
+        self.tx_sender.fee_oracle.start()
+        
         # Register with network
         await self._register_node()
         
@@ -78,16 +97,10 @@ class SovereignRPCNode:
         # Stake required tokens
         stake_amount = self.config['economics']['min_node_stake']
         
-        tx = self.staking_contract.functions.stake().build_transaction({
-            'from': self.account.address,
-            'value': stake_amount,
-            'gas': 2000000,
-            'gasPrice': self.web3.eth.gas_price,
-            'nonce': self.web3.eth.get_transaction_count(self.account.address)
-        })
-        
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-        await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        await self.tx_sender.send_async(
+            self.staking_contract.functions.stake(),
+            {'value': stake_amount, 'gas': 2000000}
+        )
         
         # Connect to bootstrap nodes
         for bootstrap in self.config['node']['bootstrap_nodes']:
@@ -106,17 +119,12 @@ class SovereignRPCNode:
                 }
                 
                 # Submit heartbeat
-                tx = self.network_contract.functions.heartbeat(
-                    json.dumps(metrics)
-                ).build_transaction({
-                    'from': self.account.address,
-                    'gas': 100000,
-                    'gasPrice': self.web3.eth.gas_price,
-                    'nonce': self.web3.eth.get_transaction_count(self.account.address)
-                })
-                
-                signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
-                await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                await self.tx_sender.send_async(
+                    self.network_contract.functions.heartbeat(
+                        json.dumps(metrics)
+                    ),
+                    {'gas': 100000}
+                )
                 
             except Exception as e:
                 logging.error(f"Heartbeat failed: {e}")
@@ -162,6 +170,9 @@ class SovereignRPCNode:
     async def store_data(self, data: Any) -> str:
         """Store data in the network.
         
+        Payloads holding arrays or tensors are stored in the binary tensor
+        format instead of JSON.
+        
         Args:
             data: Data to store
             
@@ -169,14 +180,20 @@ class SovereignRPCNode:
             IPFS CID of stored data
         """
         # Add to IPFS
-        cid = await self.ipfs.add_json(data)
+        if has_tensors(data):
+            payload = encode_payload(data, compression=self.config['data'].get('tensor_compression'))
+            cid = await self.ipfs.add_bytes(payload)
+            size = len(payload)
+        else:
+            cid = await self.ipfs.add_json(data)
+            size = len(json.dumps(data))
         
         # Generate proof of storage
         proof = await self.zk_prover.generate_storage_proof(data, cid)
         
         # Track locally
         self.pinned_data[cid] = {
-            'size': len(json.dumps(data)),
+            'size': size,
             'timestamp': self.web3.eth.get_block('latest').timestamp,
             'proof': proof
         }
@@ -193,10 +210,13 @@ class SovereignRPCNode:
             cid: IPFS CID of data
             
         Returns:
-            Retrieved data or None if not found
+            Retrieved data or None if not found. Tensor payloads come back as
+            a dict of read-only numpy arrays viewing the received bytes.
         """
         # Check cache first
         if cached := await self.cache.get(cid):
+            if is_tensor_payload(cached):
+                return decode_payload(cached)
             return json.loads(cached)
             
         try:
@@ -208,6 +228,11 @@ class SovereignRPCNode:
             if len(providers) < self.config['data']['min_providers']:
                 logging.warning(f"Data {cid} has insufficient providers")
                 
+            # Cache tensor payloads as raw bytes so hits decode without copying
+            if is_tensor_payload(data):
+                await self.cache.setex(cid, self.config['data']['cache_ttl'], data)
+                return decode_payload(data)
+                
             # Cache for future
             await self.cache.setex(
                 cid,
@@ -230,9 +255,17 @@ class SovereignRPCNode:
             'node_uptime': Gauge('node_uptime', 'Node uptime in seconds'),
             'peer_count': Gauge('peer_count', 'Number of connected peers'),
             'cache_hits': Gauge('cache_hits', 'Number of cache hits'),
-            'pinned_data_count': Gauge('pinned_data_count', 'Number of pinned data items')
+            'pinned_data_count': Gauge('pinned_data_count', 'Number of pinned data items'),
+            'tx_queue_depth': Gauge('tx_queue_depth', 'Transactions waiting for a send slot'),
+            'tx_in_flight': Gauge('tx_in_flight', 'Transactions awaiting confirmation'),
+            'tx_confirmation_ms': Gauge('tx_confirmation_ms', 'Average transaction confirmation latency in ms')
         }
         
+        # Per-stage inference latency percentiles from every node in this process
+        get_latency_recorder().register_prometheus()
+        for source in self.metrics_sources:
+            source.register_prometheus()
+        
         # Start server
         start_http_server(self.config['monitoring']['prometheus_port'])
         
@@ -242,4 +275,9 @@ class SovereignRPCNode:
             self.metrics['peer_count'].set(len(self.peers))
             self.metrics['pinned_data_count'].set(len(self.pinned_data))
             
+            tx_metrics = self.tx_sender.get_metrics()
+            self.metrics['tx_queue_depth'].set(tx_metrics['queue_depth'])
+            self.metrics['tx_in_flight'].set(tx_metrics['in_flight'])
+            self.metrics['tx_confirmation_ms'].set(tx_metrics['confirmation_ms_avg'])
+            
             await asyncio.sleep(15)  # Update every 15 seconds
\ No newline at end of file
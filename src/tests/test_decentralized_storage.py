@@ -163,6 +163,17 @@ def test_decentralized_storage_model_operations(storage, mock_ipfs):
         # Verify temp file cleanup
         assert not Path("temp_model.pt").exists()
 
+def test_store_model_joyw_requires_constructor_kwargs(storage):
+    """Weight files that could not be rebuilt are rejected before anything is stored"""
+    with pytest.raises(ValueError):
+        storage.store_model(
+            torch.nn.Linear(10, 2),
+            {"name": "test_model"},
+            StorageDuration.SHORT_TERM,
+            weight_format="joyw"
+        )
+    assert not Path("temp_model.joyw").exists()
+
 def test_storage_duration_validation(storage):
     test_data = b"test data"
     
@@ -0,0 +1,117 @@
+"""
+Tests for the cached fee oracle
+"""
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import MagicMock, PropertyMock
+
+from ..utils.fee_oracle import FeeOracle, get_fee_oracle
+
+@pytest.fixture
+def legacy_web3():
+    web3 = MagicMock()
+    web3.eth.get_block.return_value = {'number': 10}
+    web3.eth.gas_price = 20000000000
+    return web3
+
+@pytest.fixture
+def eip1559_web3():
+    web3 = MagicMock()
+    web3.eth.get_block.return_value = {'number': 10, 'baseFeePerGas': 10000000000}
+    web3.eth.max_priority_fee = 1000000000
+    return web3
+
+def test_legacy_fees(legacy_web3):
+    """Chains without a base fee get a legacy gas price"""
+    oracle = FeeOracle(legacy_web3)
+
+    assert oracle.get_fee_params() == {'gasPrice': 20000000000}
+    assert oracle.use_eip1559 is False
+
+def test_eip1559_fees(eip1559_web3):
+    """Chains with a base fee get EIP-1559 fields"""
+    oracle = FeeOracle(eip1559_web3, base_fee_multiplier=2.0)
+
+    params = oracle.get_fee_params()
+
+    assert params == {
+        'maxFeePerGas': 21000000000,
+        'maxPriorityFeePerGas': 1000000000
+    }
+    assert oracle.get_legacy_gas_price() == 11000000000
+
+def test_fees_cached_between_calls(legacy_web3):
+    """Repeated lookups within max_age hit the cache"""
+    oracle = FeeOracle(legacy_web3, max_age=60)
+
+    for _ in range(10):
+        oracle.get_fee_params()
+
+    assert legacy_web3.eth.get_block.call_count == 1
+    assert oracle.refreshes == 1
+
+def test_stale_fees_refreshed(legacy_web3):
+    """Fees older than max_age are refreshed on demand"""
+    oracle = FeeOracle(legacy_web3, max_age=0)
+
+    oracle.get_fee_params()
+    oracle.get_fee_params()
+
+    assert oracle.refreshes == 2
+
+def test_refresh_on_new_block(legacy_web3):
+    """The block watcher refreshes once per new block"""
+    heights = iter([10, 10, 11])
+    type(legacy_web3.eth).block_number = PropertyMock(side_effect=lambda: next(heights, 11))
+    legacy_web3.eth.get_block.side_effect = lambda number: {'number': number}
+    oracle = FeeOracle(legacy_web3, block_poll_interval=0.01)
+
+    async def watch():
+        oracle.start()
+        await asyncio.sleep(0.1)
+        await oracle.stop()
+
+    asyncio.run(watch())
+
+    assert oracle.refreshes == 2
+
+def test_oracles_keyed_per_provider():
+    """Providers without an endpoint URI get their own oracle; same URLs share one"""
+    ipc, other_ipc = MagicMock(), MagicMock()
+    del ipc.provider.endpoint_uri
+    del other_ipc.provider.endpoint_uri
+    http, same_http = MagicMock(), MagicMock()
+    http.provider.endpoint_uri = same_http.provider.endpoint_uri = "http://localhost:8545/oracle"
+
+    assert get_fee_oracle(ipc) is not get_fee_oracle(other_ipc)
+    assert get_fee_oracle(http) is get_fee_oracle(same_http)
+
+def test_concurrent_callers_refresh_once(legacy_web3):
+    """Callers racing on a stale cache trigger a single refresh"""
+    oracle = FeeOracle(legacy_web3)
+    barrier = threading.Barrier(8)
+
+    def call():
+        barrier.wait()
+        oracle.get_fee_params()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert oracle.refreshes == 1
+
+def test_block_without_base_fee_is_not_sticky(eip1559_web3):
+    """One block lacking a base fee does not switch the oracle to legacy for good"""
+    oracle = FeeOracle(eip1559_web3)
+    eip1559_web3.eth.gas_price = 20000000000
+
+    oracle.refresh({'number': 11})
+    assert oracle.get_fee_params() == {'gasPrice': 20000000000}
+
+    oracle.refresh({'number': 12, 'baseFeePerGas': 10000000000})
+    assert 'maxFeePerGas' in oracle.get_fee_params()
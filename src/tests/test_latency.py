@@ -0,0 +1,56 @@
+"""
+Tests for per-stage latency recording
+"""
+import time
+import pytest
+
+from ..utils.latency import LatencyHistogram, LatencyRecorder
+
+def test_span_records_stage_and_trace():
+    """Spans feed both the histogram and the per-request trace"""
+    recorder = LatencyRecorder()
+    trace = {}
+
+    with recorder.span('model', 'forward', trace):
+        time.sleep(0.01)
+
+    assert trace['forward'] >= 10
+    assert recorder.snapshot()['model']['forward']['count'] == 1
+
+def test_span_records_on_error():
+    """Failed stages are still timed"""
+    recorder = LatencyRecorder()
+
+    with pytest.raises(ValueError):
+        with recorder.span('model', 'proof'):
+            raise ValueError("boom")
+
+    assert recorder.snapshot('model')['model']['proof']['count'] == 1
+
+def test_percentiles():
+    """Percentiles come from the recent window"""
+    histogram = LatencyHistogram(window=100)
+    for value in range(1, 101):
+        histogram.add(float(value))
+
+    summary = histogram.summary()
+
+    assert summary['p50'] == 51.0
+    assert summary['p95'] == 96.0
+    assert summary['p99'] == 100.0
+    assert summary['avg'] == 50.5
+
+def test_prometheus_export():
+    """Recorder exposes quantile series through a registry"""
+    prometheus_client = pytest.importorskip('prometheus_client')
+    registry = prometheus_client.CollectorRegistry()
+    recorder = LatencyRecorder()
+    recorder.record('model', 'forward', 5.0)
+
+    recorder.register_prometheus(registry)
+
+    value = registry.get_sample_value(
+        'inference_stage_latency_ms',
+        {'model_id': 'model', 'stage': 'forward', 'quantile': '0.99'}
+    )
+    assert value == 5.0
@@ -0,0 +1,65 @@
+"""
+Tests for batched proof aggregation in ZKProver
+"""
+import json
+
+import pytest
+
+from ..zk_prover import InclusionProof, ProofAggregator, ZKProver, canonical_proof
+
+def make_proofs(count):
+    return [
+        json.dumps({"model_id": "m", "input_hash": f"{i:064x}", "output_hash": f"{i * 7:064x}", "timestamp": i}).encode()
+        for i in range(count)
+    ]
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 8, 33])
+def test_every_proof_verifies_against_root(count):
+    """Inclusion proofs verify for every index, including promoted odd nodes"""
+    prover = ZKProver("m")
+    proofs = make_proofs(count)
+
+    batch = prover.aggregate_proofs(iter(proofs))
+    commitment = batch.commitment()
+
+    assert commitment["count"] == count
+    for index, proof in enumerate(proofs):
+        inclusion = batch.inclusion_proof(index)
+        assert len(inclusion.siblings) <= max(1, count - 1).bit_length()
+        assert ZKProver.verify_inclusion(proof, inclusion, commitment)
+
+def test_tampered_proof_or_path_is_rejected():
+    """Changing the proof, the index or a sibling breaks verification"""
+    proofs = make_proofs(10)
+    batch = ZKProver("m").aggregate_proofs(proofs)
+    inclusion = batch.inclusion_proof(4)
+
+    assert not ZKProver.verify_inclusion(proofs[5], inclusion, batch.root)
+    moved = InclusionProof(5, inclusion.count, inclusion.siblings)
+    assert not ZKProver.verify_inclusion(proofs[4], moved, batch.root)
+    flipped = [bytes([inclusion.siblings[0][0] ^ 1]) + inclusion.siblings[0][1:]] + inclusion.siblings[1:]
+    assert not ZKProver.verify_inclusion(proofs[4], InclusionProof(4, 10, flipped), batch.root)
+
+def test_encoding_is_canonical():
+    """Key order and whitespace in JSON proofs do not change the leaf"""
+    a = b'{"b": 1, "a": 2}'
+    b = b'{"a":2,"b":1}'
+
+    assert canonical_proof(a) == canonical_proof(b) == canonical_proof({"b": 1, "a": 2})
+
+    batch = ZKProver("m").aggregate_proofs([a])
+    assert ZKProver.verify_inclusion(b, batch.inclusion_proof(0), batch.root.hex())
+
+def test_aggregator_streams_and_roundtrips_proofs():
+    """Incremental aggregation matches one-shot and proofs survive JSON"""
+    proofs = make_proofs(5)
+    aggregator = ProofAggregator()
+    indices = [aggregator.add(p) for p in proofs]
+    batch = aggregator.finalize()
+
+    assert indices == list(range(5))
+    assert batch.root == ZKProver("m").aggregate_proofs(proofs).root
+    inclusion = InclusionProof.from_dict(json.loads(json.dumps(batch.inclusion_proof(3).to_dict())))
+    assert ZKProver.verify_inclusion(proofs[3], inclusion, batch.commitment())
+    with pytest.raises(ValueError):
+        aggregator.finalize()
@@ -0,0 +1,98 @@
+"""
+Tests for persistent ZK setup artifacts
+"""
+import json
+
+import pytest
+
+from ..utils.setup_store import PackedPoints, SetupArtifactStore, params_key
+from ..zk_prover import ZKProver
+
+PARAMS = {"num_constraints": 64, "num_inputs": 4}
+
+def test_cached_setup_matches_fresh_setup(tmp_path):
+    """Keys mapped from disk equal the keys generated in memory"""
+    fresh_pk, fresh_vk = ZKProver("m").setup(PARAMS)
+    cached_pk, cached_vk = ZKProver("m", setup_cache_dir=tmp_path).setup(PARAMS)
+
+    assert cached_pk == fresh_pk
+    assert cached_vk == fresh_vk
+    assert list(fresh_pk["points"]) == ZKProver("m")._generate_points(PARAMS)
+    assert cached_vk["ic"].tolist() == ZKProver("m")._generate_ic(PARAMS)
+
+def test_setup_persists_across_stores(tmp_path):
+    """A new store instance maps what an earlier one wrote instead of regenerating"""
+    ZKProver("m", setup_cache_dir=tmp_path).setup(PARAMS)
+
+    store = SetupArtifactStore(tmp_path)
+    artifacts = store.load("m", PARAMS)
+
+    assert artifacts is not None
+    assert len(artifacts.points) == PARAMS["num_constraints"]
+    assert artifacts.points[-1] == ZKProver("m")._generate_points(PARAMS)[-1]
+    assert store.get_metrics()["disk_hits"] == 1
+    store.close()
+
+def test_key_depends_on_model_and_params(tmp_path):
+    """Different models or circuit parameters never share artifacts"""
+    keys = {
+        params_key("m", PARAMS),
+        params_key("other", PARAMS),
+        params_key("m", {**PARAMS, "num_constraints": 65})
+    }
+
+    assert len(keys) == 3
+    assert params_key("m", dict(reversed(list(PARAMS.items())))) == params_key("m", PARAMS)
+
+    store = SetupArtifactStore(tmp_path)
+    assert store.load("m", PARAMS) is None
+    assert store.get_metrics()["misses"] == 1
+
+def test_corrupt_file_is_treated_as_miss(tmp_path):
+    """Truncated or foreign files are regenerated rather than trusted"""
+    store = SetupArtifactStore(tmp_path)
+    store.path_for(params_key("m", PARAMS)).write_bytes(b"not a setup file at all, clearly")
+
+    assert store.load("m", PARAMS) is None
+
+def test_corrupt_header_is_treated_as_miss(tmp_path):
+    """A file with a valid preamble but a damaged header is a miss, not an error"""
+    ZKProver("m", setup_cache_dir=tmp_path).setup(PARAMS)
+    path = SetupArtifactStore(tmp_path).path_for(params_key("m", PARAMS))
+    data = bytearray(path.read_bytes())
+    data[data.index(b"{")] = ord("[")
+    path.write_bytes(bytes(data))
+
+    store = SetupArtifactStore(tmp_path)
+    assert store.load("m", PARAMS) is None
+    assert store.get_metrics()["misses"] == 1
+
+def test_failed_store_leaves_no_temp_file(tmp_path):
+    """Temporary files are removed when writing entries fails"""
+    store = SetupArtifactStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.store("m", PARAMS, {"alpha": 1}, [b"short"], [])
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_setup_without_store_is_serializable():
+    """Keys from a store-less prover stay JSON-serializable lists"""
+    proving_key, verification_key = ZKProver("m").setup(PARAMS)
+
+    assert isinstance(proving_key["points"], list)
+    assert json.loads(json.dumps(verification_key))["ic"] == verification_key["ic"]
+
+def test_packed_points_sequence():
+    """Packed entries decode lazily and index like a list"""
+    values = [1, 2**255 + 7, 0]
+    points = PackedPoints(b"".join(v.to_bytes(32, "big") for v in values))
+
+    assert len(points) == 3
+    assert points[1] == values[1]
+    assert points[-1] == 0
+    assert points[0:2] == values[:2]
+    with pytest.raises(IndexError):
+        points[3]
+    with pytest.raises(ValueError):
+        SetupArtifactStore._write_entries(None, [b"short"])
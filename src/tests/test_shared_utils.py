@@ -0,0 +1,22 @@
+"""
+Tests that utilities copied into the POI tree stay identical
+
+Both trees are packaged as `src` and cannot import each other, so the
+shared modules live in each tree's utils and are kept byte-for-byte equal.
+"""
+from pathlib import Path
+
+import pytest
+
+SRC_UTILS = Path(__file__).resolve().parents[1] / "utils"
+POI_UTILS = Path(__file__).resolve().parents[2] / "POI" / "src" / "utils"
+
+SHARED = ["latency.py", "tensor_hash.py", "weight_format.py"]
+
+@pytest.mark.skipif(not POI_UTILS.is_dir(), reason="POI tree not checked out")
+@pytest.mark.parametrize("name", SHARED)
+def test_copies_match(name):
+    """Each shared module is byte-for-byte the same in both trees"""
+    assert (SRC_UTILS / name).read_bytes() == (POI_UTILS / name).read_bytes(), (
+        f"src/utils/{name} and POI/src/utils/{name} have drifted; apply the change to both"
+    )
@@ -0,0 +1,98 @@
+"""
+Tests for the binary tensor container
+"""
+import numpy as np
+import pytest
+import torch
+
+from ..utils.tensor_codec import (
+    decode_payload,
+    decode_tensors,
+    encode_payload,
+    encode_tensors,
+    has_tensors,
+    is_tensor_payload,
+    to_torch
+)
+
+def test_roundtrip_preserves_dtype_and_shape():
+    """Tensors of mixed dtypes decode to equal arrays"""
+    tensors = {
+        'image': np.random.rand(2, 3, 8, 8).astype(np.float32),
+        'labels': np.arange(5, dtype=np.int64),
+        'mask': np.array([True, False, True])
+    }
+
+    decoded, metadata = decode_tensors(encode_tensors(tensors, {'model': 'cnn'}))
+
+    assert metadata == {'model': 'cnn'}
+    for name, array in tensors.items():
+        assert decoded[name].dtype == array.dtype
+        np.testing.assert_array_equal(decoded[name], array)
+
+def test_decode_is_zero_copy():
+    """Uncompressed arrays view the payload buffer"""
+    payload = bytearray(encode_tensors({'x': np.ones((4, 4), dtype=np.float32)}))
+
+    decoded, _ = decode_tensors(payload)
+    payload[-1] ^= 0xFF
+
+    assert decoded['x'].reshape(-1)[-1] != 1.0
+
+def test_compressed_roundtrip():
+    """zlib payloads are smaller for redundant data and decode the same"""
+    array = np.zeros((64, 64), dtype=np.float32)
+
+    plain = encode_tensors({'x': array})
+    compressed = encode_tensors({'x': array}, compression='zlib')
+    decoded, _ = decode_tensors(compressed)
+
+    assert len(compressed) < len(plain)
+    np.testing.assert_array_equal(decoded['x'], array)
+
+def test_big_endian_input_stored_little_endian():
+    """Non-native byte order is normalized on encode"""
+    array = np.arange(4, dtype='>i4')
+
+    decoded, _ = decode_tensors(encode_tensors({'x': array}))
+
+    assert decoded['x'].dtype.str == '<i4'
+    np.testing.assert_array_equal(decoded['x'], array)
+
+def test_payload_splits_tensors_and_metadata():
+    """Dict payloads keep tensors binary and other fields as metadata"""
+    payload = {'output': torch.ones(2, 3), 'proof': 'abcd'}
+    assert has_tensors(payload)
+
+    data = encode_payload(payload)
+    decoded = decode_payload(data)
+
+    assert is_tensor_payload(data)
+    assert decoded['proof'] == 'abcd'
+    assert torch.equal(to_torch(decoded['output']), torch.ones(2, 3))
+
+def test_payload_smaller_than_json():
+    """Binary float payloads are much smaller than JSON lists"""
+    import json
+    array = np.random.rand(3, 64, 64).astype(np.float32)
+
+    assert len(encode_payload({'output': array})) * 3 < len(json.dumps(array.tolist()))
+
+def test_rejects_other_data():
+    """Arbitrary bytes are not mistaken for payloads"""
+    assert not is_tensor_payload(b'{"test": 1}')
+    assert not has_tensors({'test': 1})
+    with pytest.raises(ValueError):
+        decode_tensors(b'NOPE' + b'\0' * 16)
+
+def test_bfloat16_roundtrip():
+    """Torch dtypes numpy lacks are stored as integer views and decode as tensors"""
+    tensor = torch.randn(3, 5).to(torch.bfloat16)
+    tensors, _ = decode_tensors(encode_tensors({'x': tensor}))
+
+    assert tensors['x'].dtype == torch.bfloat16
+    assert torch.equal(to_torch(tensors['x']), tensor)
+
+def test_to_torch_accepts_legacy_lists():
+    """Nested lists from JSON payloads become tensors"""
+    assert torch.equal(to_torch([[1.0, 2.0], [3.0, 4.0]]), torch.tensor([[1.0, 2.0], [3.0, 4.0]]))
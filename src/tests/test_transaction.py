@@ -0,0 +1,155 @@
+"""
+Tests for the shared transaction sender
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from web3 import Web3
+
+from ..utils.fee_oracle import FeeOracle
+from ..utils.transaction import (
+    NonceManager,
+    TransactionSender,
+    get_transaction_sender
+)
+
+@pytest.fixture
+def mock_web3():
+    web3 = MagicMock()
+    web3.provider.endpoint_uri = "http://localhost:8545"
+    web3.eth.gas_price = 20000000000
+    web3.eth.get_block.return_value = {'number': 1}
+    web3.eth.get_transaction_count.return_value = 7
+    web3.eth.account.sign_transaction.return_value.rawTransaction = b'signed_tx'
+    web3.eth.send_raw_transaction.return_value = b'tx_hash'
+    web3.eth.wait_for_transaction_receipt.return_value = {'status': 1}
+    return web3
+
+@pytest.fixture
+def account():
+    account = MagicMock()
+    account.address = '0x' + '1' * 40
+    account.key = b'key'
+    return account
+
+@pytest.fixture
+def contract_call():
+    call = MagicMock()
+    call.build_transaction.side_effect = lambda params: dict(params)
+    return call
+
+def test_nonces_assigned_locally(mock_web3, account):
+    """Only the first nonce is read from the chain"""
+    nonces = NonceManager(mock_web3, account.address)
+
+    assert [nonces.next_nonce() for _ in range(3)] == [7, 8, 9]
+    mock_web3.eth.get_transaction_count.assert_called_once_with(account.address, 'pending')
+
+def test_send_builds_transaction(mock_web3, account, contract_call):
+    """Sender fills in from, fee and nonce fields"""
+    sender = TransactionSender(mock_web3, account, fee_oracle=FeeOracle(mock_web3))
+
+    tx_hash = sender.send(contract_call, {'gas': 100000})
+
+    assert tx_hash == b'tx_hash'
+    params = contract_call.build_transaction.call_args[0][0]
+    assert params['from'] == account.address
+    assert params['gas'] == 100000
+    assert params['gasPrice'] == 20000000000
+    assert params['nonce'] == 7
+
+def test_nonce_too_low_resyncs(mock_web3, account, contract_call):
+    """A stale nonce triggers a resync and a retry"""
+    mock_web3.eth.send_raw_transaction.side_effect = [
+        ValueError("nonce too low"),
+        b'tx_hash'
+    ]
+    mock_web3.eth.get_transaction_count.side_effect = [7, 9]
+    sender = TransactionSender(mock_web3, account, fee_oracle=FeeOracle(mock_web3))
+
+    assert sender.send(contract_call, {'gas': 100000}) == b'tx_hash'
+    assert contract_call.build_transaction.call_args[0][0]['nonce'] == 9
+    assert sender.get_metrics()['nonce_resyncs'] == 1
+
+def test_send_failure_raises(mock_web3, account, contract_call):
+    """Other broadcast errors are raised and counted"""
+    mock_web3.eth.send_raw_transaction.side_effect = ValueError("insufficient funds")
+    sender = TransactionSender(mock_web3, account, fee_oracle=FeeOracle(mock_web3))
+
+    with pytest.raises(ValueError):
+        sender.send(contract_call, {'gas': 100000})
+    assert sender.get_metrics()['failed'] == 1
+
+def test_send_and_wait_records_latency(mock_web3, account, contract_call):
+    """Confirmed transactions update latency metrics"""
+    sender = TransactionSender(mock_web3, account, fee_oracle=FeeOracle(mock_web3))
+
+    receipt = sender.send_and_wait(contract_call, {'gas': 100000})
+
+    assert receipt['status'] == 1
+    metrics = sender.get_metrics()
+    assert metrics['sent'] == 1
+    assert metrics['confirmed'] == 1
+    assert metrics['in_flight'] == 0
+    assert metrics['queue_depth'] == 0
+
+def test_concurrent_sends_use_unique_nonces(mock_web3, account, contract_call):
+    """Concurrent async sends never reuse a nonce"""
+    sender = TransactionSender(mock_web3, account, max_in_flight=4, fee_oracle=FeeOracle(mock_web3))
+
+    async def send_all():
+        await asyncio.gather(*[
+            sender.send_async(contract_call, {'gas': 100000}) for _ in range(20)
+        ])
+
+    asyncio.run(send_all())
+
+    nonces = [c[0][0]['nonce'] for c in contract_call.build_transaction.call_args_list]
+    assert sorted(nonces) == list(range(7, 27))
+    mock_web3.eth.get_transaction_count.assert_called_once()
+
+def test_sender_shared_per_account(mock_web3, account):
+    """Components signing with the same account share a sender"""
+    assert get_transaction_sender(mock_web3, account) is get_transaction_sender(mock_web3, account)
+
+def test_build_failure_releases_nonce(mock_web3, account, contract_call):
+    """A transaction that fails gas estimation does not leave a nonce gap"""
+    contract_call.build_transaction.side_effect = [ValueError("execution reverted"), dict]
+    sender = TransactionSender(mock_web3, account, fee_oracle=FeeOracle(mock_web3))
+
+    with pytest.raises(ValueError):
+        sender.send(contract_call, {'gas': 100000})
+    contract_call.build_transaction.side_effect = lambda params: dict(params)
+    sender.send(contract_call, {'gas': 100000})
+
+    assert contract_call.build_transaction.call_args[0][0]['nonce'] == 7
+    assert sender.get_metrics()['failed'] == 1
+
+def test_release_resyncs_when_later_nonces_are_taken(mock_web3, account):
+    """Releasing a nonce behind later ones rereads the counter from the chain"""
+    manager = NonceManager(mock_web3, account.address)
+    first = manager.next_nonce()
+    manager.next_nonce()
+
+    manager.release(first)
+
+    assert manager.resyncs == 1
+    assert manager.next_nonce() == 7
+
+def test_senders_keyed_by_provider_identity(account):
+    """Providers without an endpoint URI do not share a sender"""
+    ipc, websocket = MagicMock(), MagicMock()
+    del ipc.provider.endpoint_uri
+    del websocket.provider.endpoint_uri
+
+    assert get_transaction_sender(ipc, account) is not get_transaction_sender(websocket, account)
+
+def test_senders_shared_per_endpoint(account):
+    """Separate Web3 instances on the same URL share a sender and its nonces"""
+    first = Web3(Web3.HTTPProvider("http://localhost:8545/shared"))
+    second = Web3(Web3.HTTPProvider("http://localhost:8545/shared"))
+    other = Web3(Web3.HTTPProvider("http://localhost:8546/shared"))
+
+    assert get_transaction_sender(first, account) is get_transaction_sender(second, account)
+    assert get_transaction_sender(first, account) is not get_transaction_sender(other, account)
@@ -0,0 +1,170 @@
+"""
+Tests for the memory-mapped model weight format
+"""
+import pytest
+import torch
+
+from ..utils.weight_format import (
+    MappedWeights,
+    convert_checkpoint,
+    describe_architecture,
+    is_weight_file,
+    load_model,
+    load_model_from_bytes,
+    read_header,
+    save_weights
+)
+
+@pytest.fixture
+def model():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(
+        torch.nn.Linear(10, 8),
+        torch.nn.BatchNorm1d(8),
+        torch.nn.Linear(8, 2)
+    )
+    model.eval()
+    return model
+
+@pytest.fixture
+def linear():
+    torch.manual_seed(0)
+    return torch.nn.Linear(10, 2)
+
+def test_round_trip_with_descriptor(linear, tmp_path):
+    """A model is rebuilt from its descriptor and produces identical output"""
+    path = tmp_path / "model.joyw"
+    save_weights(linear, path, describe_architecture(linear, {"in_features": 10, "out_features": 2}))
+
+    loaded = load_model(path)
+    x = torch.randn(4, 10)
+
+    assert isinstance(loaded, torch.nn.Linear)
+    assert torch.equal(loaded(x), linear(x))
+    assert not loaded.training
+
+def test_round_trip_into_instance(model, tmp_path):
+    """Weights and buffers load into a caller-supplied instance"""
+    path = tmp_path / "model.joyw"
+    save_weights(model.state_dict(), path)
+
+    target = torch.nn.Sequential(
+        torch.nn.Linear(10, 8),
+        torch.nn.BatchNorm1d(8),
+        torch.nn.Linear(8, 2)
+    )
+    loaded = load_model(path, target)
+    x = torch.randn(4, 10)
+
+    assert torch.equal(loaded(x), model(x))
+    assert torch.equal(loaded[1].running_mean, model[1].running_mean)
+
+def test_tensors_aligned(model, tmp_path):
+    """Every tensor starts on an aligned offset in the blob"""
+    path = tmp_path / "model.joyw"
+    save_weights(model, path)
+
+    header, blob_start = read_header(path)
+    assert blob_start % header["alignment"] == 0
+    for entry in header["tensors"]:
+        assert entry["offset"] % header["alignment"] == 0
+
+def test_mapped_tensors_match_state(model, tmp_path):
+    """Mapped tensors equal the saved state dict"""
+    path = tmp_path / "model.joyw"
+    save_weights(model, path)
+
+    mapped = MappedWeights(path).state_dict()
+    for name, tensor in model.state_dict().items():
+        assert mapped[name].dtype == tensor.dtype
+        assert torch.equal(mapped[name], tensor)
+
+def test_convert_checkpoint(linear, tmp_path):
+    """Pickled checkpoints convert to the weight format"""
+    checkpoint = tmp_path / "model.pt"
+    torch.save(linear, checkpoint)
+
+    output = convert_checkpoint(checkpoint, architecture_kwargs={"in_features": 10, "out_features": 2})
+
+    assert output == tmp_path / "model.joyw"
+    x = torch.randn(3, 10)
+    assert torch.equal(load_model(output)(x), linear(x))
+
+def test_load_from_bytes(linear, tmp_path):
+    """Downloaded bytes are cached to disk and mapped"""
+    path = tmp_path / "source.joyw"
+    save_weights(linear, path, describe_architecture(linear, {"in_features": 10, "out_features": 2}))
+    data = path.read_bytes()
+
+    assert is_weight_file(data)
+    assert not is_weight_file(b"PK\x03\x04")
+
+    cache_path = tmp_path / "cache" / "model.joyw"
+    loaded = load_model_from_bytes(data, cache_path)
+
+    assert cache_path.exists()
+    assert torch.equal(loaded.weight, linear.weight)
+
+def test_rejects_other_files(tmp_path):
+    """Files without the magic header are rejected"""
+    path = tmp_path / "model.pt"
+    path.write_bytes(b"not a weight file at all")
+
+    with pytest.raises(ValueError):
+        read_header(path)
+
+def test_metadata_stored_in_header(linear, tmp_path):
+    """Metadata round-trips through the header and is omitted when not given"""
+    path = tmp_path / "model.joyw"
+    save_weights(linear, path, metadata={"merkle": {"root": "ab"}})
+
+    assert MappedWeights(path).metadata == {"merkle": {"root": "ab"}}
+
+    save_weights(linear, path)
+    assert "metadata" not in read_header(path)[0]
+
+def test_check_sees_every_tensor_and_can_reject(model, tmp_path):
+    """Checks run on each mapped tensor and an exception aborts the load"""
+    path = tmp_path / "model.joyw"
+    save_weights(model.state_dict(), path)
+    seen = {}
+
+    def record(name, tensor):
+        seen[name] = tensor.clone()
+
+    loaded = load_model(path, torch.nn.Sequential(
+        torch.nn.Linear(10, 8),
+        torch.nn.BatchNorm1d(8),
+        torch.nn.Linear(8, 2)
+    ), check=record)
+
+    assert set(seen) == set(model.state_dict())
+    assert torch.equal(seen["0.weight"], loaded[0].weight)
+
+    def reject(name, tensor):
+        if name == "2.bias":
+            raise ValueError(name)
+
+    with pytest.raises(ValueError):
+        load_model(path, torch.nn.Sequential(torch.nn.Linear(10, 8)), check=reject)
+
+def test_trainable_parameters_listed(model, tmp_path):
+    """Files saved from a model list its trainable parameters but not its buffers"""
+    model[0].bias.requires_grad_(False)
+    path = tmp_path / "model.joyw"
+    save_weights(model, path)
+
+    header, _ = read_header(path)
+    assert header["parameters"] == ["0.weight", "1.weight", "1.bias", "2.weight", "2.bias"]
+
+    save_weights(model.state_dict(), path)
+    assert "parameters" not in read_header(path)[0]
+
+def test_converted_module_lists_parameters(model, tmp_path):
+    """Whole-module checkpoints keep their trainable parameter list when converted"""
+    checkpoint = tmp_path / "model.pt"
+    torch.save(model, checkpoint)
+
+    header, _ = read_header(convert_checkpoint(checkpoint))
+
+    assert header["parameters"] == [name for name, _ in model.named_parameters()]
@@ -17,6 +17,14 @@ import torch
 import requests
 from web3 import Web3
 
+from .weight_format import (
+    describe_architecture,
+    is_weight_file,
+    load_model as load_mapped_model,
+    load_model_from_bytes,
+    save_weights
+)
+
 class StorageDuration(Enum):
     SHORT_TERM = "short"  # IPFS - hours to days
     MID_TERM = "mid"      # Filecoin - months
@@ -156,8 +164,11 @@ class DecentralizedStorage:
                  filecoin_token: Optional[str] = None,
                  arweave_keyfile: Optional[str] = None,
                  web3_provider: Optional[str] = None,
-                 cdn_contract: Optional[str] = None):
+                 cdn_contract: Optional[str] = None,
+                 model_cache_dir: str = "./model_cache"):
         
+        self.model_cache_dir = Path(model_cache_dir)
+
         self.providers = {
             StorageDuration.SHORT_TERM: IPFSProvider(ipfs_host, ipfs_port)
         }
@@ -206,12 +217,26 @@ class DecentralizedStorage:
     def store_model(self,
                    model: torch.nn.Module,
                    metadata: Dict[str, Any],
-                   duration: StorageDuration) -> Tuple[str, str]:
-        """Store PyTorch model and metadata"""
+                   duration: StorageDuration,
+                   weight_format: str = "pt",
+                   architecture_kwargs: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """Store PyTorch model and metadata
+        
+        Pass weight_format="joyw" to write the memory-mapped weight format
+        instead of a pickled module. The module is rebuilt from its class on
+        load, so architecture_kwargs must then give its constructor arguments
+        ({} for a model constructed without any).
+        """
         
         # Save model to temp file
-        temp_path = Path("temp_model.pt")
-        torch.save(model, temp_path)
+        if weight_format == "joyw":
+            if architecture_kwargs is None:
+                raise ValueError("architecture_kwargs is required to store a model as joyw")
+            temp_path = Path("temp_model.joyw")
+            save_weights(model, temp_path, describe_architecture(model, architecture_kwargs))
+        else:
+            temp_path = Path("temp_model.pt")
+            torch.save(model, temp_path)
         
         try:
             # Store model file
@@ -220,6 +245,7 @@ class DecentralizedStorage:
                 
             # Add model ID to metadata
             metadata['model_id'] = model_id
+            metadata['weight_format'] = weight_format
             
             # Store metadata
             metadata_id = self.store(
@@ -242,10 +268,18 @@ class DecentralizedStorage:
         metadata_bytes = self.retrieve(metadata_id, duration)
         metadata = json.loads(metadata_bytes)
         
+        # Weight files are content-addressed, so a cached copy can be mapped directly
+        cache_path = self.model_cache_dir / f"{metadata['model_id']}.joyw"
+        if metadata.get('weight_format') == 'joyw' and cache_path.exists():
+            return load_mapped_model(cache_path), metadata
+        
         # Get model data
         model_bytes = self.retrieve(metadata['model_id'], duration)
         
-        # Save to temp file and load
+        if is_weight_file(model_bytes):
+            return load_model_from_bytes(model_bytes, cache_path), metadata
+        
+        # Legacy pickles: save to temp file and load
         temp_path = Path("temp_model.pt")
         try:
             with open(temp_path, 'wb') as f:
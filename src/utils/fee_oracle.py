@@ -0,0 +1,146 @@
+"""
+Cached gas price and EIP-1559 fee suggestions
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+from web3 import Web3
+
+def provider_key(web3: Web3) -> Union[str, int]:
+    """Key identifying the node a Web3 instance talks to.
+
+    Components each build their own provider for the same URL, so the
+    endpoint is what identifies a connection; providers without one (IPC,
+    WebSocket, test providers) are told apart by object identity.
+    """
+    provider = web3.provider
+    return getattr(provider, 'endpoint_uri', None) or id(provider)
+
+class FeeOracle:
+    """Serves cached fee fields, refreshed once per block or per interval."""
+
+    def __init__(
+        self,
+        web3: Web3,
+        max_age: float = 12.0,
+        block_poll_interval: float = 2.0,
+        base_fee_multiplier: float = 2.0,
+        use_eip1559: Optional[bool] = None
+    ):
+        """Initialize the oracle.
+
+        Args:
+            web3: Web3 instance
+            max_age: Seconds before cached fees are refreshed on demand
+            block_poll_interval: Seconds between block number checks when watching blocks
+            base_fee_multiplier: Headroom on the base fee for maxFeePerGas
+            use_eip1559: Force fee mode; detected from the latest block when None
+        """
+        self.web3 = web3
+        self.max_age = max_age
+        self.block_poll_interval = block_poll_interval
+        self.base_fee_multiplier = base_fee_multiplier
+        # Configured mode; use_eip1559 is what the latest refresh settled on
+        self.fee_mode = use_eip1559
+        self.use_eip1559 = use_eip1559
+
+        self._lock = threading.Lock()
+        # Serializes on-demand refreshes so concurrent callers share one
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.block_number: Optional[int] = None
+        self.updated_at = 0.0
+        self.refreshes = 0
+
+        self.gas_price: Optional[int] = None
+        self.base_fee: Optional[int] = None
+        self.max_priority_fee: Optional[int] = None
+        self.max_fee: Optional[int] = None
+
+    def refresh(self, block: Optional[Dict[str, Any]] = None):
+        """Recompute fee suggestions from a block header (latest if not given)."""
+        if block is None:
+            block = self.web3.eth.get_block('latest')
+        base_fee = block.get('baseFeePerGas')
+
+        # Detected afresh each time, so one block without a base fee is not sticky
+        eip1559 = self.fee_mode if self.fee_mode is not None else base_fee is not None
+        if eip1559 and base_fee is not None:
+            priority_fee = self.web3.eth.max_priority_fee
+            max_fee = int(base_fee * self.base_fee_multiplier) + priority_fee
+            gas_price = base_fee + priority_fee
+        else:
+            priority_fee = max_fee = None
+            gas_price = self.web3.eth.gas_price
+
+        with self._lock:
+            self.use_eip1559 = eip1559 and base_fee is not None
+            self.block_number = block.get('number')
+            self.base_fee = base_fee
+            self.max_priority_fee = priority_fee
+            self.max_fee = max_fee
+            self.gas_price = gas_price
+            self.updated_at = time.time()
+            self.refreshes += 1
+
+    def get_fee_params(self) -> Dict[str, int]:
+        """Get fee fields for a transaction, refreshing only if the cache is stale."""
+        self._refresh_if_stale()
+
+        with self._lock:
+            if self.use_eip1559:
+                return {
+                    'maxFeePerGas': self.max_fee,
+                    'maxPriorityFeePerGas': self.max_priority_fee
+                }
+            return {'gasPrice': self.gas_price}
+
+    def get_legacy_gas_price(self) -> int:
+        """Get the cached legacy gas price suggestion."""
+        self._refresh_if_stale()
+        return self.gas_price
+
+    def _refresh_if_stale(self):
+        with self._refresh_lock:
+            if self.gas_price is None or time.time() - self.updated_at > self.max_age:
+                self.refresh()
+
+    def start(self):
+        """Refresh on every new block in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch_blocks())
+
+    async def stop(self):
+        """Stop watching blocks."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch_blocks(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                block_number = await loop.run_in_executor(None, lambda: self.web3.eth.block_number)
+                if block_number != self.block_number:
+                    await loop.run_in_executor(
+                        None, lambda: self.refresh(self.web3.eth.get_block(block_number))
+                    )
+            except Exception as e:
+                logging.error(f"Fee refresh failed: {e}")
+
+            await asyncio.sleep(self.block_poll_interval)
+
+_oracles: Dict[Union[str, int], FeeOracle] = {}
+_oracles_lock = threading.Lock()
+
+def get_fee_oracle(web3: Web3) -> FeeOracle:
+    """Get the process-wide fee oracle for a provider, keyed like transaction senders."""
+    key = provider_key(web3)
+    with _oracles_lock:
+        if key not in _oracles:
+            _oracles[key] = FeeOracle(web3)
+        return _oracles[key]
@@ -0,0 +1,229 @@
+"""
+Persistent store for ZK setup artifacts
+
+Artifacts are keyed by model ID and a hash of the circuit parameters and
+kept one file per key:
+
+    MAGIC | version (u8) | reserved (3 bytes) | header length (u32) |
+    point count (u64) | IC count (u64) | header JSON | points | ic
+
+Points and IC entries are packed as 32-byte big-endian integers. Files are
+memory-mapped on load and entries are decoded only when accessed, so
+opening the artifacts of a large circuit costs a header parse.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+MAGIC = b"JOYZ"
+FORMAT_VERSION = 1
+POINT_SIZE = 32
+
+_PREAMBLE = struct.Struct("<4sB3xIQQ")
+
+class PackedPoints(Sequence):
+    """Read-only sequence of integers decoded on access from packed 32-byte entries."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self.buffer = memoryview(buffer)
+
+    def __len__(self) -> int:
+        return len(self.buffer) // POINT_SIZE
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("point index out of range")
+        return int.from_bytes(self.buffer[index * POINT_SIZE:(index + 1) * POINT_SIZE], "big")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedPoints):
+            return self.buffer == other.buffer
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def tolist(self):
+        return list(self)
+
+@dataclass
+class SetupArtifacts:
+    scalars: Dict[str, int]
+    points: PackedPoints
+    ic: PackedPoints
+
+def params_key(model_id: str, circuit_params: Dict[str, Any]) -> str:
+    """Key for a model's setup under the given circuit parameters."""
+    canonical = json.dumps({"model_id": model_id, "params": circuit_params}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class SetupArtifactStore:
+    def __init__(self, cache_dir: Union[str, Path]):
+        """Initialize the store.
+
+        Args:
+            cache_dir: Directory holding one artifact file per setup key
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._open: Dict[str, SetupArtifacts] = {}
+        self._maps: Dict[str, mmap.mmap] = {}
+        self.metrics = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stored': 0}
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.zks"
+
+    def load(self, model_id: str, circuit_params: Dict[str, Any]) -> Optional[SetupArtifacts]:
+        """Map stored artifacts, or return None if this setup was never stored."""
+        key = params_key(model_id, circuit_params)
+        with self._lock:
+            artifacts = self._open.get(key)
+            if artifacts is not None:
+                self.metrics['memory_hits'] += 1
+                return artifacts
+
+            path = self.path_for(key)
+            try:
+                with open(path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                self.metrics['misses'] += 1
+                return None
+
+            artifacts = self._parse(mapped)
+            if artifacts is None:
+                mapped.close()
+                self.metrics['misses'] += 1
+                return None
+
+            self._maps[key] = mapped
+            self._open[key] = artifacts
+            self.metrics['disk_hits'] += 1
+            return artifacts
+
+    def store(
+        self,
+        model_id: str,
+        circuit_params: Dict[str, Any],
+        scalars: Dict[str, int],
+        points: Iterable[bytes],
+        ic: Iterable[bytes]
+    ) -> SetupArtifacts:
+        """Write artifacts atomically and return them mapped from disk.
+
+        Args:
+            model_id: Model the setup belongs to
+            circuit_params: Circuit parameters the setup was run with
+            scalars: Named key scalars
+            points: 32-byte big-endian proving key points, streamed to disk
+            ic: 32-byte big-endian verification key IC entries
+        """
+        key = params_key(model_id, circuit_params)
+        path = self.path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        header = json.dumps({
+            "model_id": model_id,
+            "params": circuit_params,
+            "scalars": {name: format(value, "x") for name, value in scalars.items()}
+        }, sort_keys=True, default=str).encode()
+
+        # Entries are streamed to disk; counts are patched into the preamble after
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header), 0, 0))
+                f.write(header)
+                num_points = self._write_entries(f, points)
+                num_ic = self._write_entries(f, ic)
+                f.seek(0)
+                f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header), num_points, num_ic))
+            tmp_path.replace(path)
+        finally:
+            # Only left behind when writing failed
+            tmp_path.unlink(missing_ok=True)
+
+        with self._lock:
+            self.metrics['stored'] += 1
+            stale = self._maps.pop(key, None)
+            self._open.pop(key, None)
+        if stale is not None:
+            self._close_map(stale)
+        return self.load(model_id, circuit_params)
+
+    def close(self):
+        """Unmap every open artifact file."""
+        with self._lock:
+            self._open.clear()
+            for mapped in self._maps.values():
+                self._close_map(mapped)
+            self._maps.clear()
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {**self.metrics, 'open': len(self._open)}
+
+    @staticmethod
+    def _write_entries(f, entries: Iterable[bytes]) -> int:
+        count = 0
+        for entry in entries:
+            if len(entry) != POINT_SIZE:
+                raise ValueError(f"Setup entries must be {POINT_SIZE} bytes, got {len(entry)}")
+            f.write(entry)
+            count += 1
+        return count
+
+    @staticmethod
+    def _close_map(mapped: mmap.mmap):
+        try:
+            mapped.close()
+        except BufferError:
+            # Artifacts handed out still view the mapping; it is released with them
+            pass
+
+    def _parse(self, mapped: mmap.mmap) -> Optional[SetupArtifacts]:
+        if len(mapped) < _PREAMBLE.size:
+            return None
+        magic, version, header_len, num_points, num_ic = _PREAMBLE.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+
+        start = _PREAMBLE.size
+        offset = start + header_len
+        points_end = offset + num_points * POINT_SIZE
+        ic_end = points_end + num_ic * POINT_SIZE
+        if len(mapped) < ic_end:
+            return None
+
+        try:
+            header = json.loads(mapped[start:offset])
+            scalars = {name: int(value, 16) for name, value in header["scalars"].items()}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # A damaged header is a miss like any other unreadable file
+            return None
+
+        view = memoryview(mapped)
+        return SetupArtifacts(
+            scalars=scalars,
+            points=PackedPoints(view[offset:points_end]),
+            ic=PackedPoints(view[points_end:ic_end])
+        )
+
+_stores: Dict[Path, SetupArtifactStore] = {}
+_stores_lock = threading.Lock()
+
+def get_setup_store(cache_dir: Union[str, Path]) -> SetupArtifactStore:
+    """Get the process-wide store for a directory, so provers share open mappings."""
+    path = Path(cache_dir).resolve()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SetupArtifactStore(path)
+        return store
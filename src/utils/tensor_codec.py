@@ -0,0 +1,212 @@
+"""
+Binary tensor container for results and inputs exchanged over IPFS
+
+A payload holds a small JSON header followed by one blob of little-endian
+tensor data, each tensor aligned to ALIGNMENT bytes within the blob:
+
+    MAGIC | version (u8) | compression (u8) | reserved (u16) | header length (u32) | header JSON | blob
+
+The header lists name, dtype, shape and blob offset for every tensor plus
+any non-tensor fields of the payload. Torch dtypes numpy cannot represent
+(e.g. bfloat16) are stored as a same-width integer view and record their
+torch dtype, and decode back into torch tensors. Uncompressed payloads decode into
+numpy arrays that view the received buffer directly; compressed payloads
+are inflated once and then viewed the same way.
+"""
+import json
+import struct
+import warnings
+import zlib
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+MAGIC = b"JOYT"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+_COMPRESSION_CODES = {None: COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB}
+
+_PREAMBLE = struct.Struct("<4sBBHI")
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _is_tensor(value: Any) -> bool:
+    return isinstance(value, (np.ndarray, torch.Tensor))
+
+# Same-width integer views for torch dtypes numpy cannot represent (e.g. bfloat16)
+_TORCH_INT_VIEWS = {1: torch.uint8, 2: torch.int16, 4: torch.int32, 8: torch.int64}
+
+def _to_little_endian(value: Any) -> Tuple[np.ndarray, Optional[str]]:
+    """Get an encodable array, plus the torch dtype name when the array is an integer view."""
+    torch_dtype = None
+    if isinstance(value, torch.Tensor):
+        tensor = value.detach().cpu()
+        try:
+            value = tensor.numpy()
+        except TypeError:
+            if tensor.element_size() not in _TORCH_INT_VIEWS or tensor.is_complex() or tensor.is_quantized:
+                raise ValueError(f"Tensors of dtype {tensor.dtype} cannot be encoded")
+            torch_dtype = str(tensor.dtype).replace("torch.", "")
+            value = tensor.contiguous().view(_TORCH_INT_VIEWS[tensor.element_size()]).numpy()
+    array = np.ascontiguousarray(value)
+    if array.dtype.hasobject:
+        raise ValueError("Object arrays cannot be encoded as tensors")
+    if array.dtype.byteorder == ">":
+        array = array.astype(array.dtype.newbyteorder("<"))
+    return array, torch_dtype
+
+def _from_numpy(array: np.ndarray) -> torch.Tensor:
+    with warnings.catch_warnings():
+        # Decoded arrays view immutable buffers; inference only reads its inputs
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.from_numpy(array)
+
+def is_tensor_payload(data: Any) -> bool:
+    """Check whether raw bytes hold a tensor payload."""
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+def has_tensors(payload: Any) -> bool:
+    """Check whether a payload is, or directly contains, a tensor or array."""
+    if isinstance(payload, dict):
+        return any(_is_tensor(value) for value in payload.values())
+    return _is_tensor(payload)
+
+def encode_tensors(
+    tensors: Dict[str, Any],
+    metadata: Optional[Dict[str, Any]] = None,
+    compression: Optional[str] = None,
+    level: int = 1
+) -> bytes:
+    """Encode named tensors and JSON metadata into one payload.
+
+    Args:
+        tensors: Name to numpy array or torch tensor
+        metadata: JSON-serializable fields stored alongside the tensors
+        compression: None or "zlib"
+        level: Compression level
+
+    Returns:
+        Encoded payload
+    """
+    if compression not in _COMPRESSION_CODES:
+        raise ValueError(f"Unsupported compression {compression}")
+
+    arrays = {}
+    entries = []
+    offset = 0
+    for name, value in tensors.items():
+        array, torch_dtype = _to_little_endian(value)
+        arrays[name] = array
+        offset = _align(offset)
+        entry = {
+            "name": name,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset
+        }
+        if torch_dtype:
+            entry["torch_dtype"] = torch_dtype
+        entries.append(entry)
+        offset += array.nbytes
+
+    header_bytes = json.dumps({
+        "tensors": entries,
+        "metadata": metadata or {},
+        "blob_size": offset
+    }, sort_keys=True).encode()
+
+    # Collect views of the array buffers so the blob is copied exactly once
+    blob_parts = []
+    position = 0
+    for entry, array in zip(entries, arrays.values()):
+        blob_parts.append(b"\0" * (entry["offset"] - position))
+        blob_parts.append(array.reshape(-1).view(np.uint8).data)
+        position = entry["offset"] + array.nbytes
+
+    if compression:
+        compressor = zlib.compressobj(level)
+        blob_parts = [compressor.compress(part) for part in blob_parts] + [compressor.flush()]
+
+    preamble = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, _COMPRESSION_CODES[compression], 0, len(header_bytes))
+    padding = b"\0" * (_align(len(preamble) + len(header_bytes)) - len(preamble) - len(header_bytes))
+    return b"".join([preamble, header_bytes, padding, *blob_parts])
+
+def decode_tensors(data: BytesLike) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Decode a payload into arrays viewing the buffer, plus its metadata.
+
+    Arrays are read-only when the buffer is; copy them before writing.
+    Tensors of dtypes numpy lacks decode as torch tensors over the same memory.
+
+    Returns:
+        Tuple of (tensors, metadata)
+    """
+    view = memoryview(data)
+    magic, version, compression, _, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Data is not a tensor payload")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported tensor payload version {version}")
+
+    header_end = _PREAMBLE.size + header_len
+    header = json.loads(bytes(view[_PREAMBLE.size:header_end]))
+    blob = view[_align(header_end):]
+
+    if compression == COMPRESSION_ZLIB:
+        blob = memoryview(zlib.decompress(blob))
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"Unsupported compression code {compression}")
+
+    if len(blob) < header["blob_size"]:
+        raise ValueError("Tensor payload is truncated")
+
+    tensors = {}
+    for entry in header["tensors"]:
+        dtype = np.dtype(entry["dtype"])
+        count = 1
+        for dim in entry["shape"]:
+            count *= dim
+        if count == 0:
+            array = np.empty(entry["shape"], dtype=dtype)
+        else:
+            array = np.frombuffer(blob, dtype=dtype, count=count, offset=entry["offset"])
+            array = array.reshape(entry["shape"])
+        if "torch_dtype" in entry:
+            array = _from_numpy(array).view(getattr(torch, entry["torch_dtype"]))
+        tensors[entry["name"]] = array
+
+    return tensors, header["metadata"]
+
+def encode_payload(payload: Any, compression: Optional[str] = None) -> bytes:
+    """Encode a dict whose array and tensor values become tensors; other values become metadata.
+
+    A bare array or tensor is stored under the name "data".
+    """
+    if not isinstance(payload, dict):
+        payload = {"data": payload}
+    tensors = {key: value for key, value in payload.items() if _is_tensor(value)}
+    metadata = {key: value for key, value in payload.items() if not _is_tensor(value)}
+    return encode_tensors(tensors, metadata, compression)
+
+def decode_payload(data: BytesLike) -> Dict[str, Any]:
+    """Decode a payload back into one dict of arrays and metadata fields."""
+    tensors, metadata = decode_tensors(data)
+    return {**metadata, **tensors}
+
+def to_torch(value: Any) -> torch.Tensor:
+    """Wrap a decoded array as a torch tensor without copying.
+
+    Tensors pass through; other values, such as nested lists from legacy
+    JSON payloads, are converted with torch.tensor.
+    """
+    if isinstance(value, torch.Tensor):
+        return value
+    if isinstance(value, np.ndarray):
+        return _from_numpy(value)
+    return torch.tensor(value)
@@ -0,0 +1,154 @@
+"""
+Chunked, parallel Merkle hashing of tensor memory
+
+A tensor's raw bytes are viewed without copying, split into fixed-size
+chunks and hashed as the leaves of a binary Merkle tree. Large buffers hash
+their chunks on a shared thread pool; hashlib releases the GIL while
+hashing, so the chunks run on separate cores. The digest commits to:
+
+    H(0x02 | "dtype:shape:chunk_size" | H(...Merkle root over H(0x00 | chunk)...))
+
+with internal nodes H(0x01 | left | right) and an odd node promoted
+unchanged. Data is normalized to little-endian first and the dtype is
+recorded by name, so equal values give equal digests whether they come
+from torch or numpy, on any host byte order.
+"""
+import hashlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Below this many bytes thread hand-off costs more than it saves
+PARALLEL_THRESHOLD = 8 * 1024 * 1024
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+ROOT_PREFIX = b"\x02"
+
+# Same-width integer views for torch dtypes numpy cannot represent (e.g. bfloat16)
+_TORCH_INT_VIEWS = {1: torch.uint8, 2: torch.int16, 4: torch.int32, 8: torch.int64}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=min(8, os.cpu_count() or 1),
+                thread_name_prefix="tensor-hash"
+            )
+        return _executor
+
+def _hasher(algorithm: str) -> Callable[[bytes], Any]:
+    """Get a constructor for the named hash; keccak256 matches Ethereum's keccak."""
+    if algorithm == "keccak256":
+        from web3 import Web3
+        return lambda data=b"": _OneShot(lambda b: bytes(Web3.keccak(b)), data)
+    hashlib.new(algorithm)  # Raise early for unknown names
+    return lambda data=b"": hashlib.new(algorithm, data)
+
+class _OneShot:
+    """hashlib-style wrapper for one-shot hash functions."""
+
+    def __init__(self, fn: Callable[[bytes], bytes], data: bytes = b""):
+        self.fn = fn
+        self.parts = [bytes(data)] if data else []
+
+    def update(self, data: bytes):
+        self.parts.append(bytes(data))
+
+    def digest(self) -> bytes:
+        return self.fn(b"".join(self.parts))
+
+def as_little_endian(data: Any) -> Tuple[np.ndarray, str]:
+    """View a tensor, array or byte buffer as contiguous little-endian memory.
+
+    Returns:
+        Tuple of (array, dtype name); arrays are only copied when they are
+        not contiguous, not on the CPU or stored big-endian
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8), "uint8"
+
+    if isinstance(data, torch.Tensor):
+        tensor = data.detach().cpu().contiguous()
+        name = str(tensor.dtype).replace("torch.", "")
+        try:
+            array = tensor.numpy()
+        except TypeError:
+            array = tensor.view(_TORCH_INT_VIEWS[tensor.element_size()]).numpy()
+    else:
+        array = np.asarray(data)
+        name = array.dtype.name
+
+    if array.dtype.hasobject:
+        raise ValueError("Object arrays have no stable byte representation")
+    array = np.ascontiguousarray(array)
+    big_endian = array.dtype.byteorder == ">" or (array.dtype.byteorder == "=" and sys.byteorder == "big")
+    if big_endian and array.dtype.itemsize > 1:
+        array = array.astype(array.dtype.newbyteorder("<"))
+    return array, name
+
+def chunk_digests(
+    buffer: memoryview,
+    algorithm: str = "sha256",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: Optional[bool] = None
+) -> List[bytes]:
+    """Hash each chunk of a byte buffer as a Merkle leaf."""
+    new = _hasher(algorithm)
+    chunks = [buffer[i:i + chunk_size] for i in range(0, len(buffer), chunk_size)] or [buffer]
+
+    def leaf(chunk: memoryview) -> bytes:
+        h = new(LEAF_PREFIX)
+        h.update(chunk)
+        return h.digest()
+
+    if parallel is None:
+        parallel = len(buffer) >= PARALLEL_THRESHOLD
+    if parallel and len(chunks) > 1:
+        return list(_get_executor().map(leaf, chunks))
+    return [leaf(chunk) for chunk in chunks]
+
+def merkle_root(leaves: List[bytes], algorithm: str = "sha256") -> bytes:
+    """Combine leaf digests pairwise, promoting an odd node unchanged."""
+    new = _hasher(algorithm)
+    level = list(leaves)
+    while len(level) > 1:
+        paired = [new(NODE_PREFIX + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+def hash_tensor(
+    data: Any,
+    algorithm: str = "sha256",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel: Optional[bool] = None
+) -> bytes:
+    """Digest a tensor, array or byte buffer by dtype, shape and contents.
+
+    Args:
+        data: torch tensor, numpy array or bytes-like object
+        algorithm: Any hashlib algorithm name, or "keccak256"
+        chunk_size: Bytes per Merkle leaf; part of the digest
+        parallel: Hash chunks on the thread pool; by default only for large buffers
+
+    Returns:
+        Digest bytes
+    """
+    array, dtype_name = as_little_endian(data)
+    buffer = memoryview(array.reshape(-1).view(np.uint8))
+    root = merkle_root(chunk_digests(buffer, algorithm, chunk_size, parallel), algorithm)
+
+    header = f"{dtype_name}:{tuple(array.shape)}:{chunk_size}".encode()
+    return _hasher(algorithm)(ROOT_PREFIX + header + root).digest()
@@ -0,0 +1,234 @@
+"""
+Shared transaction sender with local nonce management
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple, Union
+
+from web3 import Web3
+
+from .fee_oracle import FeeOracle, get_fee_oracle, provider_key
+
+# Seconds to wait for a receipt before giving up
+TRANSACTION_TIMEOUT = 120
+
+# Attempts made when the node reports a stale nonce
+MAX_NONCE_RETRIES = 3
+
+class NonceManager:
+    """Assigns nonces locally so concurrent transactions never collide."""
+
+    def __init__(self, web3: Web3, address: str):
+        self.web3 = web3
+        self.address = address
+        self._next_nonce: Optional[int] = None
+        self._lock = threading.Lock()
+        self.resyncs = 0
+
+    def next_nonce(self) -> int:
+        """Reserve the next nonce, syncing from the chain on first use."""
+        with self._lock:
+            if self._next_nonce is None:
+                self._next_nonce = self.web3.eth.get_transaction_count(self.address, 'pending')
+            nonce = self._next_nonce
+            self._next_nonce += 1
+            return nonce
+
+    def release(self, nonce: int):
+        """Return a nonce that was never broadcast.
+
+        The counter steps back when it was the latest one handed out;
+        otherwise later nonces are already in use and the counter resyncs
+        so the gap is filled.
+        """
+        with self._lock:
+            if self._next_nonce == nonce + 1:
+                self._next_nonce = nonce
+            else:
+                self._next_nonce = None
+                self.resyncs += 1
+
+    def resync(self):
+        """Drop the local counter so the next nonce is read from the chain."""
+        with self._lock:
+            self._next_nonce = None
+            self.resyncs += 1
+
+class TransactionSender:
+    """Builds, signs and broadcasts transactions for a single account."""
+
+    def __init__(
+        self,
+        web3: Web3,
+        account: Any,
+        max_in_flight: int = 64,
+        fee_oracle: Optional[FeeOracle] = None
+    ):
+        """Initialize the sender.
+
+        Args:
+            web3: Web3 instance
+            account: Local account used for signing
+            max_in_flight: Maximum concurrent unconfirmed transactions from async callers
+            fee_oracle: Source of cached fee fields; the provider's shared oracle by default
+        """
+        self.web3 = web3
+        self.account = account
+        self.nonces = NonceManager(web3, account.address)
+        self.fee_oracle = fee_oracle or get_fee_oracle(web3)
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._metrics_lock = threading.Lock()
+
+        self.queued = 0
+        self.in_flight = 0
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.confirmation_ms: deque = deque(maxlen=1000)
+
+    def send(self, contract_call: Any, tx_params: Dict[str, Any]) -> bytes:
+        """Build, sign and broadcast a contract call without waiting for a receipt.
+
+        Args:
+            contract_call: Bound contract function, e.g. contract.functions.foo(1)
+            tx_params: Extra transaction fields such as 'gas' or 'value'
+
+        Returns:
+            Transaction hash
+        """
+        last_error = None
+
+        for _ in range(MAX_NONCE_RETRIES):
+            nonce = self.nonces.next_nonce()
+            try:
+                tx = contract_call.build_transaction({
+                    'from': self.account.address,
+                    **self._fee_params(),
+                    **tx_params,
+                    'nonce': nonce
+                })
+                signed_tx = self.web3.eth.account.sign_transaction(tx, self.account.key)
+            except Exception:
+                # Gas estimation or signing failed before broadcast; hand the nonce back
+                self.nonces.release(nonce)
+                with self._metrics_lock:
+                    self.failed += 1
+                raise
+
+            try:
+                tx_hash = self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+            except Exception as e:
+                # Any failed broadcast leaves a gap, so re-read the nonce from the chain
+                self.nonces.resync()
+                if "nonce too low" not in str(e).lower():
+                    with self._metrics_lock:
+                        self.failed += 1
+                    raise
+                last_error = e
+                logging.warning(f"Nonce {nonce} too low for {self.account.address}, resyncing")
+                continue
+
+            with self._metrics_lock:
+                self.sent += 1
+            return tx_hash
+
+        with self._metrics_lock:
+            self.failed += 1
+        raise last_error
+
+    def send_and_wait(
+        self,
+        contract_call: Any,
+        tx_params: Dict[str, Any],
+        timeout: int = TRANSACTION_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Send a transaction and block until it is mined.
+
+        Returns:
+            Transaction receipt
+        """
+        tx_hash = self.send(contract_call, tx_params)
+        return self.wait_for_receipt(tx_hash, timeout)
+
+    def wait_for_receipt(self, tx_hash: bytes, timeout: int = TRANSACTION_TIMEOUT) -> Dict[str, Any]:
+        """Wait for a receipt, recording confirmation latency."""
+        start_time = time.time()
+        with self._metrics_lock:
+            self.in_flight += 1
+        try:
+            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        finally:
+            with self._metrics_lock:
+                self.in_flight -= 1
+
+        with self._metrics_lock:
+            self.confirmed += 1
+            self.confirmation_ms.append((time.time() - start_time) * 1000)
+        return receipt
+
+    async def send_async(self, contract_call: Any, tx_params: Dict[str, Any]) -> bytes:
+        """Send a transaction from async code without blocking the event loop."""
+        return await self._run_in_slot(self.send, contract_call, tx_params)
+
+    async def send_and_wait_async(
+        self,
+        contract_call: Any,
+        tx_params: Dict[str, Any],
+        timeout: int = TRANSACTION_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Send a transaction from async code and wait for its receipt."""
+        return await self._run_in_slot(self.send_and_wait, contract_call, tx_params, timeout)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth, throughput and confirmation latency metrics."""
+        with self._metrics_lock:
+            latencies = sorted(self.confirmation_ms)
+            return {
+                'queue_depth': self.queued,
+                'in_flight': self.in_flight,
+                'sent': self.sent,
+                'confirmed': self.confirmed,
+                'failed': self.failed,
+                'nonce_resyncs': self.nonces.resyncs,
+                'confirmation_ms_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+                'confirmation_ms_p95': latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+            }
+
+    def _fee_params(self) -> Dict[str, Any]:
+        """Get fee fields for a new transaction."""
+        return self.fee_oracle.get_fee_params()
+
+    async def _run_in_slot(self, func, *args):
+        """Run a blocking send in the thread pool, bounded by max_in_flight."""
+        with self._metrics_lock:
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+
+        def run():
+            with self._slots:
+                with self._metrics_lock:
+                    self.queued -= 1
+                return func(*args)
+
+        return await loop.run_in_executor(None, run)
+
+_senders: Dict[Tuple[Union[str, int], str], TransactionSender] = {}
+_senders_lock = threading.Lock()
+
+def get_transaction_sender(web3: Web3, account: Any) -> TransactionSender:
+    """Get the process-wide sender for an account.
+
+    Components that sign with the same key against the same node share one
+    sender, and therefore one nonce sequence, even when each built its own
+    Web3 instance.
+    """
+    # The sender's reference to web3 keeps identity keys from being reused
+    key = (provider_key(web3), account.address)
+    with _senders_lock:
+        if key not in _senders:
+            _senders[key] = TransactionSender(web3, account)
+        return _senders[key]
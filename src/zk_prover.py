@@ -1,59 +1,237 @@
 """
 ZK-SNARK Proof Generation for AI Model Execution
 """
-from typing import Dict, Any, List, Tuple, Union
+from dataclasses import dataclass
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 import numpy as np
 import torch
 import hashlib
 import json
 import time
 
+from .utils.setup_store import PackedPoints, SetupArtifacts, get_setup_store
+from .utils.tensor_hash import hash_tensor
+
+DIGEST_SIZE = 32
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+ProofLike = Union[bytes, str, Dict[str, Any]]
+
+def canonical_proof(proof: ProofLike) -> bytes:
+    """Encode a proof canonically: JSON with sorted keys and no whitespace.
+
+    Proofs that are not JSON are used byte for byte.
+    """
+    if isinstance(proof, dict):
+        data = proof
+    else:
+        raw = proof.encode() if isinstance(proof, str) else bytes(proof)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return raw
+    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+def proof_leaf(proof: ProofLike) -> bytes:
+    """Merkle leaf of a proof's canonical encoding."""
+    return hashlib.sha256(LEAF_PREFIX + canonical_proof(proof)).digest()
+
+def _next_level(level: bytes) -> bytes:
+    """Hash adjacent pairs of a packed level; an odd last node is promoted."""
+    pair = 2 * DIGEST_SIZE
+    count = len(level) // DIGEST_SIZE
+    parents = bytearray()
+    for offset in range(0, (count - 1) * DIGEST_SIZE, pair):
+        parents += hashlib.sha256(NODE_PREFIX + level[offset:offset + pair]).digest()
+    if count % 2:
+        parents += level[-DIGEST_SIZE:]
+    return bytes(parents)
+
+@dataclass
+class InclusionProof:
+    """Sibling path from one execution's leaf to a batch root."""
+    index: int
+    count: int
+    siblings: List[bytes]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "count": self.count,
+            "siblings": [s.hex() for s in self.siblings]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InclusionProof":
+        return cls(data["index"], data["count"], [bytes.fromhex(s) for s in data["siblings"]])
+
+class ProofBatch:
+    """Merkle tree over a batch of proofs, stored as one packed digest string per level."""
+
+    def __init__(self, leaves: bytes):
+        if not leaves:
+            raise ValueError("Cannot commit to an empty proof batch")
+        self.levels = [leaves]
+        while len(self.levels[-1]) > DIGEST_SIZE:
+            self.levels.append(_next_level(self.levels[-1]))
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1]
+
+    @property
+    def count(self) -> int:
+        return len(self.levels[0]) // DIGEST_SIZE
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def commitment(self) -> Dict[str, Any]:
+        """Compact commitment to post on chain in place of the individual proofs."""
+        return {"root": self.root.hex(), "count": self.count, "hash": "sha256"}
+
+    def inclusion_proof(self, index: int) -> InclusionProof:
+        """Get the O(log n) sibling path for the proof at index."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"Proof index {index} outside batch of {self.count}")
+        siblings = []
+        position = index
+        for level in self.levels[:-1]:
+            sibling = position ^ 1
+            if sibling * DIGEST_SIZE < len(level):
+                siblings.append(level[sibling * DIGEST_SIZE:(sibling + 1) * DIGEST_SIZE])
+            position //= 2
+        return InclusionProof(index, self.count, siblings)
+
+    def inclusion_proofs(self) -> Iterator[InclusionProof]:
+        for index in range(self.count):
+            yield self.inclusion_proof(index)
+
+def verify_inclusion(
+    proof: ProofLike,
+    inclusion: InclusionProof,
+    root: Union[bytes, str, Dict[str, Any]]
+) -> bool:
+    """Check one execution proof against a committed batch root.
+
+    Args:
+        proof: The execution proof as generated
+        inclusion: Its sibling path from ProofBatch.inclusion_proof
+        root: Root bytes or hex, or a commitment dict from ProofBatch.commitment
+
+    Returns:
+        True if the proof is part of the committed batch
+    """
+    if isinstance(root, dict):
+        if root.get("count", inclusion.count) != inclusion.count:
+            return False
+        root = root["root"]
+    if isinstance(root, str):
+        root = bytes.fromhex(root)
+
+    index, width = inclusion.index, inclusion.count
+    if not 0 <= index < width:
+        return False
+
+    node = proof_leaf(proof)
+    siblings = iter(inclusion.siblings)
+    try:
+        while width > 1:
+            if index % 2:
+                node = hashlib.sha256(NODE_PREFIX + next(siblings) + node).digest()
+            elif index + 1 < width:
+                node = hashlib.sha256(NODE_PREFIX + node + next(siblings)).digest()
+            index //= 2
+            width = (width + 1) // 2
+    except StopIteration:
+        return False
+    return next(siblings, None) is None and node == root
+
+class ProofAggregator:
+    """Accumulates execution proofs one at a time into a batch."""
+
+    def __init__(self):
+        self._leaves = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._leaves) // DIGEST_SIZE
+
+    def add(self, proof: ProofLike) -> int:
+        """Add a proof and return its index in the batch."""
+        self._leaves += proof_leaf(proof)
+        return len(self) - 1
+
+    def finalize(self) -> ProofBatch:
+        """Build the batch and start a new, empty one."""
+        batch = ProofBatch(bytes(self._leaves))
+        self._leaves = bytearray()
+        return batch
+
 # Note: In a real implementation, we would use an actual ZK-SNARK library
 # This is a simplified implementation for demonstration purposes
 class ZKProver:
-    def __init__(self, model_id: str):
+    def __init__(self, model_id: str, setup_cache_dir: Optional[str] = None):
         """Initialize the ZK prover for a specific model.
         
         Args:
             model_id: Unique identifier for the model
+            setup_cache_dir: Directory persisting setup artifacts across restarts;
+                setup is recomputed on every call when omitted
         """
         self.model_id = model_id
         self.proving_key = None
+        self.setup_store = get_setup_store(setup_cache_dir) if setup_cache_dir else None
         
     def setup(self, circuit_params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Generate proving and verification keys.
         
+        With a setup store, stored artifacts for the same model and circuit
+        parameters are mapped from disk instead of regenerated, and points and
+        IC entries are PackedPoints sequences decoded only when accessed (call
+        tolist() before serializing them). Without a store they are plain lists.
+        
         Args:
             circuit_params: Parameters for the circuit
             
         Returns:
             Tuple of (proving_key, verification_key)
         """
+        artifacts = self.setup_store.load(self.model_id, circuit_params) if self.setup_store else None
+        if artifacts is None:
+            artifacts = self._run_setup(circuit_params)
+        scalars = artifacts.scalars
+        points, ic = artifacts.points, artifacts.ic
+        if not self.setup_store:
+            points, ic = points.tolist(), ic.tolist()
+        
+        proving_key = {**scalars, "points": points}
+        verification_key = {**scalars, "ic": ic}
+        
+        self.proving_key = proving_key
+        return proving_key, verification_key
+        
+    def _run_setup(self, circuit_params: Dict[str, Any]) -> SetupArtifacts:
+        """Generate setup artifacts, persisting them when a store is configured."""
         # This is a simplified example
         # In practice, this would generate actual zkSNARK parameters
         
         # Generate random values for keys
         r = int.from_bytes(hashlib.sha256(f"{self.model_id}_r".encode()).digest(), byteorder='big')
         s = int.from_bytes(hashlib.sha256(f"{self.model_id}_s".encode()).digest(), byteorder='big')
+        scalars = {"alpha": r, "beta": s, "gamma": r + s, "delta": r * s}
         
-        proving_key = {
-            "alpha": r,
-            "beta": s,
-            "gamma": r + s,
-            "delta": r * s,
-            "points": self._generate_points(circuit_params)
-        }
-        
-        verification_key = {
-            "alpha": r,
-            "beta": s,
-            "gamma": r + s,
-            "delta": r * s,
-            "ic": self._generate_ic(circuit_params)
-        }
+        points = self._point_digests("point", circuit_params.get("num_constraints", 10))
+        ic = self._point_digests("ic", circuit_params.get("num_inputs", 5))
+        if self.setup_store:
+            return self.setup_store.store(self.model_id, circuit_params, scalars, points, ic)
+        return SetupArtifacts(scalars, PackedPoints(b"".join(points)), PackedPoints(b"".join(ic)))
         
-        self.proving_key = proving_key
-        return proving_key, verification_key
+    def _point_digests(self, label: str, count: int) -> Iterator[bytes]:
+        """Derive packed 32-byte entries; their big-endian values are the points."""
+        prefix = f"{self.model_id}_{label}_"
+        return (hashlib.sha256(f"{prefix}{i}".encode()).digest() for i in range(count))
         
     def generate_proof(
         self,
@@ -100,6 +278,32 @@ class ZKProver:
         
         return proof_bytes, public_inputs
         
+    def aggregate_proofs(self, proofs: Iterable[ProofLike]) -> ProofBatch:
+        """Commit to a stream of execution proofs with one Merkle root.
+        
+        Only the 32-byte leaf of each proof is kept, so the stream can be
+        a generator over proofs that do not fit in memory together.
+        
+        Args:
+            proofs: Proof bytes (as returned by generate_proof), JSON strings or dicts
+        
+        Returns:
+            Batch exposing the commitment and per-proof inclusion proofs
+        """
+        aggregator = ProofAggregator()
+        for proof in proofs:
+            aggregator.add(proof)
+        return aggregator.finalize()
+        
+    @staticmethod
+    def verify_inclusion(
+        proof: ProofLike,
+        inclusion: InclusionProof,
+        commitment: Union[bytes, str, Dict[str, Any]]
+    ) -> bool:
+        """Check one execution proof against a batch commitment."""
+        return verify_inclusion(proof, inclusion, commitment)
+        
     def _generate_points(self, circuit_params: Dict[str, Any]) -> List[int]:
         """Generate points for the proving key.
         
@@ -109,15 +313,8 @@ class ZKProver:
         Returns:
             List of points
         """
-        points = []
         num_points = circuit_params.get("num_constraints", 10)
-        
-        for i in range(num_points):
-            seed = f"{self.model_id}_point_{i}"
-            point = int.from_bytes(hashlib.sha256(seed.encode()).digest(), byteorder='big')
-            points.append(point)
-            
-        return points
+        return [int.from_bytes(d, byteorder='big') for d in self._point_digests("point", num_points)]
         
     def _generate_ic(self, circuit_params: Dict[str, Any]) -> List[int]:
         """Generate IC points for the verification key.
@@ -128,15 +325,8 @@ class ZKProver:
         Returns:
             List of IC points
         """
-        points = []
         num_points = circuit_params.get("num_inputs", 5)
-        
-        for i in range(num_points):
-            seed = f"{self.model_id}_ic_{i}"
-            point = int.from_bytes(hashlib.sha256(seed.encode()).digest(), byteorder='big')
-            points.append(point)
-            
-        return points
+        return [int.from_bytes(d, byteorder='big') for d in self._point_digests("ic", num_points)]
         
     def _hash_data(self, data: Any) -> bytes:
         """Convert input/output data to hash.
@@ -147,11 +337,8 @@ class ZKProver:
         Returns:
             Hash bytes
         """
-        if isinstance(data, torch.Tensor):
-            data = data.detach().cpu().numpy()
-            return hashlib.sha256(data.tobytes()).digest()
-        elif isinstance(data, np.ndarray):
-            return hashlib.sha256(data.tobytes()).digest()
+        if isinstance(data, (torch.Tensor, np.ndarray)):
+            return hash_tensor(data)
         elif isinstance(data, (str, bytes)):
             data_bytes = data.encode() if isinstance(data, str) else data
             return hashlib.sha256(data_bytes).digest()